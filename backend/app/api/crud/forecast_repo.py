@@ -6,7 +6,7 @@ import numpy as np
 import logging
 import time
 import hashlib
-import json
+import orjson
 
 # Try to import statsmodels for Holt-Winters only
 try:
@@ -53,7 +53,7 @@ def _safe_round(value: float, digits: int = 0) -> int:
 def _data_hash(data: List[float]) -> str:
     """Create a hash of the data for caching"""
     rounded = [round(x, 2) for x in data]
-    return hashlib.md5(json.dumps(rounded).encode()).hexdigest()[:10]
+    return hashlib.md5(orjson.dumps(rounded, option=orjson.OPT_SERIALIZE_NUMPY)).hexdigest()[:10]
 
 
 class ForecastRepo:
@@ -23,6 +23,16 @@ class HomeRepo:
         self.db = db
         self.col = db["bls_oews"]
 
+    @classmethod
+    def clear_caches(cls):
+        """Forget all cached aggregates (called after bls_oews is re-ingested)."""
+        cls._overview_cache.clear()
+        cls._overview_cache_time.clear()
+        cls._market_ticker_cache.clear()
+        cls._market_ticker_cache_time.clear()
+        cls._total_employment_cache.clear()
+        cls._total_employment_cache_time.clear()
+
     @staticmethod
     def _to_float(v: Any) -> float:
         if v is None:
@@ -34,6 +44,14 @@ class HomeRepo:
         except Exception:
             return 0.0
 
+    @staticmethod
+    def _keep_fields_stage(*fields: str) -> Dict[str, Any]:
+        """
+        Narrow documents to the given raw fields right after $match so later
+        stages (and $convert in particular) only touch what the pipeline reads.
+        """
+        return {"$project": {"_id": 0, **{f: 1 for f in fields}}}
+
     @staticmethod
     def _add_numeric_fields_stage() -> Dict[str, Any]:
         """
@@ -85,6 +103,7 @@ class HomeRepo:
         
         pipeline = [
             {"$match": {"year": year}},
+            self._keep_fields_stage("tot_emp"),
             self._add_numeric_fields_stage(),
             {"$group": {"_id": None, "total": {"$sum": "$tot_emp_num"}}},
             {"$project": {"_id": 0, "total": 1}},
@@ -99,7 +118,7 @@ class HomeRepo:
         return result
 
     async def latest_year(self) -> int:
-        doc = await self.col.find_one(sort=[("year", -1)], projection={"year": 1})
+        doc = await self.col.find_one(sort=[("year", -1)], projection={"year": 1, "_id": 0})
         return int(doc.get("year", 2024)) if doc else 2024
 
     async def _year_has_data(self, year: int) -> bool:
@@ -142,6 +161,7 @@ class HomeRepo:
         }
         pipeline = [
             match_stage,
+            self._keep_fields_stage("naics", "naics_title", "year", "tot_emp"),
             self._add_numeric_fields_stage(),
             {
                 "$group": {
@@ -215,6 +235,8 @@ class HomeRepo:
             },
             {"$sort": {"trend_pct": -1}},
             {"$limit": 1},
+            # The ticker only reads these two
+            {"$project": {"name": 1, "trend_pct": 1}},
         ]
         r = await self.col.aggregate(pipeline).to_list(length=1)
         return r[0] if r else None
@@ -225,6 +247,7 @@ class HomeRepo:
             return None
         pipeline = [
             {"$match": {"year": {"$in": [year, year - 1]}}},
+            self._keep_fields_stage("occ_code", "occ_title", "year", "tot_emp"),
             self._add_numeric_fields_stage(),
             {
                 "$group": {
@@ -298,6 +321,8 @@ class HomeRepo:
             },
             {"$sort": {"trend_pct": -1}},
             {"$limit": 1},
+            # The ticker only reads these two
+            {"$project": {"name": 1, "trend_pct": 1}},
         ]
         r = await self.col.aggregate(pipeline).to_list(length=1)
         return r[0] if r else None
@@ -305,6 +330,7 @@ class HomeRepo:
     async def _highest_paying_occupation(self, year: int) -> Optional[Dict[str, Any]]:
         pipeline = [
             {"$match": {"year": year}},
+            self._keep_fields_stage("occ_code", "occ_title", "a_median"),
             self._add_numeric_fields_stage(),
             {
                 "$group": {
@@ -323,6 +349,7 @@ class HomeRepo:
     async def _largest_occupation(self, year: int) -> Optional[Dict[str, Any]]:
         pipeline = [
             {"$match": {"year": year}},
+            self._keep_fields_stage("occ_code", "occ_title", "tot_emp"),
             self._add_numeric_fields_stage(),
             {
                 "$group": {
@@ -333,7 +360,7 @@ class HomeRepo:
             },
             {"$sort": {"max_emp": -1}},
             {"$limit": 1},
-            {"$project": {"_id": 0, "occ_code": "$_id", "name": 1, "employment": "$max_emp"}},
+            {"$project": {"_id": 0, "name": 1, "employment": "$max_emp"}},
         ]
         r = await self.col.aggregate(pipeline).to_list(length=1)
         return r[0] if r else None
@@ -353,7 +380,7 @@ class HomeRepo:
             },
             {"$sort": {"hot_count": -1, "count": -1}},
             {"$limit": 1},
-            {"$project": {"_id": 0, "name": "$_id", "count": 1, "hot_count": 1}},
+            {"$project": {"_id": 0, "name": "$_id"}},
         ]
         r = await tech_col.aggregate(pipeline).to_list(length=1)
         return r[0] if r else None
@@ -430,6 +457,7 @@ class HomeRepo:
 
         pipeline = [
             {"$match": {"year": year}},
+            self._keep_fields_stage("naics", "occ_code", "tot_emp"),
             add_nums,
             {
                 "$facet": {
@@ -455,17 +483,20 @@ class HomeRepo:
             },
         ]
 
-        agg = await self.col.aggregate(pipeline).to_list(length=1)
+        # The facet, the cross-industry median and last year's total are independent
+        agg, median_annual_salary, prev_total = await asyncio.gather(
+            self.col.aggregate(pipeline).to_list(length=1),
+            self._median_salary(year),
+            self._total_employment(year - 1),
+        )
         out = agg[0] if agg else {}
 
         totals = (out.get("totals") or [{}])[0]
         total_employment = float(totals.get("total_employment", 0.0) or 0.0)
         unique_industries = int(totals.get("unique_industries", 0) or 0)
         unique_job_titles = int(totals.get("unique_job_titles", 0) or 0)
-        median_annual_salary = await self._median_salary(year)
 
         # YoY trend: compare current year total employment to previous year
-        prev_total = await self._total_employment(year - 1)
         trend_pct = 0.0
         if prev_total > 0:
             trend_pct = ((total_employment - prev_total) / prev_total) * 100.0
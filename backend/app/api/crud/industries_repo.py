@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 import asyncio
+import re
 import time
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING, Literal
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, TYPE_CHECKING, Literal
 
 if TYPE_CHECKING:
     from motor.core import AgnosticDatabase
@@ -65,6 +66,20 @@ def _quantile(sorted_vals: List[float], q: float) -> float:
     return float(sorted_vals[lo] * (1 - frac) + sorted_vals[hi] * frac)
 
 
+def _coerce_item(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape a bls_oews job row exactly like JobDetail.
+    Routers pass these dicts straight into the response, so keys/types must match.
+    """
+    sal = _to_float(doc.get("a_median"))
+    return {
+        "occ_code": str(doc.get("occ_code", "")).strip(),
+        "occ_title": str(doc.get("occ_title", "")).strip(),
+        "employment": _to_float(doc.get("tot_emp")),
+        "median_salary": sal if sal > 0 else None,
+    }
+
+
 # -------------------------
 # repo
 # -------------------------
@@ -184,6 +199,51 @@ class IndustryRepo:
         industries.sort(key=lambda x: x["naics_title"].lower())
         return int(year), industries
 
+    async def search_industries(self, year: int, q: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Industries whose title contains q (case-insensitive) or whose NAICS
+        code contains q, filtered and limited server-side. Same order as
+        list_industries (title, case-insensitive).
+        """
+        pattern = re.escape(q)
+        match: Dict[str, Any] = {
+            "year": int(year),
+            "$or": [
+                {"naics_title": {"$regex": pattern, "$options": "i"}},
+                {"naics": {"$regex": pattern}},
+            ],
+        }
+
+        async def _run(occ_code: Optional[str]) -> List[Dict[str, str]]:
+            stage = dict(match, occ_code=occ_code) if occ_code else match
+            # Default collation so occ_year_naics_title_code serves the match;
+            # the case-insensitive order is applied to the grouped rows instead
+            pipeline = [
+                {"$match": stage},
+                {"$group": {"_id": {"naics": "$naics", "naics_title": "$naics_title"}}},
+                {"$addFields": {"title_key": {"$toLower": "$_id.naics_title"}}},
+                {"$sort": {"title_key": 1}},
+                {"$limit": limit},
+                {"$project": {"_id": 0, "naics": "$_id.naics", "naics_title": "$_id.naics_title"}},
+            ]
+            rows = []
+            async for row in self.db["bls_oews"].aggregate(pipeline):
+                naics = str(row.get("naics", "")).strip()
+                title = str(row.get("naics_title", "")).strip()
+                if naics and title:
+                    rows.append({"naics": naics, "naics_title": title})
+            return rows
+
+        # Prefer All-Occupations rows; fall back like list_industries does, but
+        # only when the year has none (not merely when nothing matched q)
+        rows = await _run("00-0000")
+        if rows:
+            return rows
+        has_all_occ = await self.db["bls_oews"].find_one(
+            {"occ_code": "00-0000", "year": int(year)}, {"_id": 1}
+        )
+        return [] if has_all_occ else await _run(None)
+
     async def get_naics_title(self, naics: str, year: Optional[int] = None) -> str:
         q: Dict[str, Any] = {"naics": naics}
         if year is not None:
@@ -199,23 +259,27 @@ class IndustryRepo:
         naics: str, 
         year: int, 
         limit: Optional[int] = None, 
-        skip: Optional[int] = None
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        skip: Optional[int] = None,
+        with_total: bool = True,
+    ) -> Tuple[str, List[Dict[str, Any]], int]:
         """
         Get jobs in an industry with pagination support.
-        Returns (jobs, total_count)
+        Returns (naics_title, jobs, total_count); jobs are JobDetail-shaped dicts.
+        With with_total=False the count query is skipped and total is len(jobs).
         """
         onet_codes = await self._get_onet_bls_codes()
         if not onet_codes:
-            return [], 0
+            return await self.get_naics_title(naics, year), [], 0
 
         # First, get total count
-        count_query = {
-            "year": int(year), 
-            "naics": naics, 
-            "occ_code": {"$in": list(onet_codes)}
-        }
-        total = await self.db["bls_oews"].count_documents(count_query)
+        total = 0
+        if with_total:
+            count_query = {
+                "year": int(year), 
+                "naics": naics, 
+                "occ_code": {"$in": list(onet_codes)}
+            }
+            total = await self.db["bls_oews"].count_documents(count_query)
 
         # Build query for jobs
         query = {
@@ -235,30 +299,46 @@ class IndustryRepo:
         if limit is not None:
             cursor = cursor.limit(limit)
 
+        naics_title = ""
         rows: List[Dict[str, Any]] = []
         async for doc in cursor:
-            emp = _to_float(doc.get("tot_emp"))
-            sal = _to_float(doc.get("a_median"))
-            rows.append(
-                {
-                    "occ_code": str(doc.get("occ_code", "")).strip(),
-                    "occ_title": str(doc.get("occ_title", "")).strip(),
-                    "employment": emp,
-                    "median_salary": sal if sal > 0 else None,
-                    "naics_title": str(doc.get("naics_title", "")).strip(),
-                }
-            )
+            if not naics_title:
+                naics_title = str(doc.get("naics_title", "")).strip()
+            rows.append(_coerce_item(doc))
+
+        if not naics_title:
+            naics_title = await self.get_naics_title(naics, year)
+
+        return naics_title, rows, (total if with_total else len(rows))
+
+    async def iter_jobs_in_industry(
+        self, naics: str, year: int, limit: int
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Same rows as jobs_in_industry(..., with_total=False), yielded straight off
+        the Motor cursor as (naics_title, job) so large responses can be streamed.
+        """
+        onet_codes = await self._get_onet_bls_codes()
+        if not onet_codes:
+            return
 
-        return rows, total
+        cursor = self.db["bls_oews"].find(
+            {"year": int(year), "naics": naics, "occ_code": {"$in": list(onet_codes)}},
+            {"occ_code": 1, "occ_title": 1, "tot_emp": 1, "a_median": 1, "naics_title": 1, "_id": 0},
+        ).sort([("tot_emp", -1)]).limit(max(1, int(limit)))
+
+        async for doc in cursor:
+            yield str(doc.get("naics_title", "")).strip(), _coerce_item(doc)
 
     async def top_jobs_in_industry(self, naics: str, year: int, limit: int) -> Tuple[str, List[Dict[str, Any]]]:
         """
         Get top jobs in an industry.
-        Now handles the tuple return from jobs_in_industry.
+        The limit is applied by Mongo (sort + limit on the naics/year/tot_emp index).
         """
-        rows, total = await self.jobs_in_industry(naics, year)  # Get both rows and total
-        naics_title = rows[0]["naics_title"] if rows else await self.get_naics_title(naics, year)
-        return naics_title, rows[: max(1, int(limit))]
+        naics_title, rows, _ = await self.jobs_in_industry(
+            naics, year, limit=max(1, int(limit)), with_total=False
+        )
+        return naics_title, rows
 
     async def top_job_in_industry(self, naics: str, year: int) -> Tuple[str, Optional[Dict[str, Any]]]:
         """
@@ -306,8 +386,10 @@ class IndustryRepo:
         naics_title = ""
         series: List[Dict[str, Any]] = []
 
-        for y in range(int(year_from), int(year_to) + 1):
-            title, total_emp, med_sal = await self.industry_metrics(naics, y)
+        years = range(int(year_from), int(year_to) + 1)
+        per_year = await asyncio.gather(*(self.industry_metrics(naics, y) for y in years))
+
+        for y, (title, total_emp, med_sal) in zip(years, per_year):
             if not naics_title and title:
                 naics_title = title
             series.append({"year": y, "total_employment": total_emp, "median_salary": med_sal})
@@ -325,30 +407,44 @@ class IndustryRepo:
         Uses each industry's All Occupations row (occ_code=00-0000)
         If o_group exists, prefers o_group=total.
         """
-        # Cross-industry totals drive overall employment + median salary.
-        cross_doc = await self.db["bls_oews"].find_one(
-            {
-                "year": int(year),
-                "naics": "000000",
-                "occ_code": "00-0000",
-                "occ_title": "All Occupations",
-                "naics_title": {"$regex": "^Cross-industry$", "$options": "i"},
-            },
-            {"_id": 0, "tot_emp": 1, "a_median": 1},
-        ) or {}
-        cross_total_employment = _to_float(cross_doc.get("tot_emp"))
-        cross_median_salary = _to_float(cross_doc.get("a_median"))
+        prev_year = int(year) - 1
+        has_prev = int(year) > 2011
 
-        cursor = self.db["bls_oews"].find(
-            {"year": int(year), "occ_code": "00-0000"},
-            {"naics": 1, "naics_title": 1, "tot_emp": 1, "a_median": 1, "o_group": 1, "_id": 0},
+        async def _no_rows() -> List[Dict[str, Any]]:
+            return []
+
+        # Cross-industry row, this year's and last year's industry totals are
+        # independent reads, so issue them together.
+        cross_doc, cur_docs, prev_docs = await asyncio.gather(
+            # Cross-industry totals drive overall employment + median salary.
+            self.db["bls_oews"].find_one(
+                {
+                    "year": int(year),
+                    "naics": "000000",
+                    "occ_code": "00-0000",
+                    "occ_title": "All Occupations",
+                    "naics_title": {"$regex": "^Cross-industry$", "$options": "i"},
+                },
+                {"_id": 0, "tot_emp": 1, "a_median": 1},
+            ),
+            self.db["bls_oews"].find(
+                {"year": int(year), "occ_code": "00-0000"},
+                {"naics": 1, "naics_title": 1, "tot_emp": 1, "a_median": 1, "o_group": 1, "_id": 0},
+            ).to_list(length=None),
+            self.db["bls_oews"].find(
+                {"year": prev_year, "occ_code": "00-0000"},
+                {"naics": 1, "tot_emp": 1, "o_group": 1, "naics_title": 1, "_id": 0},
+            ).to_list(length=None) if has_prev else _no_rows(),
         )
+        cross_doc = cross_doc or {}
+        cross_total_employment = _to_float(cross_doc.get("tot_emp"))
+        cross_median_salary = _to_float(cross_doc.get("a_median"))
 
         emp_by_naics: Dict[str, float] = defaultdict(float)
         title_by_naics: Dict[str, str] = {}
         med_sal_by_naics: Dict[str, float] = {}
 
-        async for doc in cursor:
+        for doc in cur_docs:
             # prefer only total rows if o_group exists
             if "o_group" in doc and str(doc.get("o_group", "")).strip().lower() not in ("", "total"):
                 continue
@@ -381,17 +477,11 @@ class IndustryRepo:
         avg_growth = 0.0
         top_growing = None
 
-        if int(year) > 2011:
-            prev_year = int(year) - 1
-            prev_cursor = self.db["bls_oews"].find(
-                {"year": prev_year, "occ_code": "00-0000"},
-                {"naics": 1, "tot_emp": 1, "o_group": 1, "naics_title": 1, "_id": 0},
-            )
-
+        if has_prev:
             prev_emp: Dict[str, float] = {}
             prev_title: Dict[str, str] = {}
 
-            async for doc in prev_cursor:
+            for doc in prev_docs:
                 if "o_group" in doc and str(doc.get("o_group", "")).strip().lower() not in ("", "total"):
                     continue
 
@@ -650,9 +740,8 @@ class IndustryRepo:
         }
 
     # For each industry, fetch occupations and pick top N by parsed employment.
-     per_naics_top: Dict[str, List[Dict[str, Any]]] = {}
-
-     for naics in naics_list:
+    # The per-industry queries are independent, so they run concurrently.
+     async def _top_occs(naics: str) -> List[Dict[str, Any]]:
         cur = self.db["bls_oews"].find(
             {"year": int(year), "naics": naics, "occ_code": {"$ne": "00-0000"}},
             {"_id": 0, "occ_title": 1, "tot_emp": 1},
@@ -671,7 +760,11 @@ class IndustryRepo:
             )
 
         occs.sort(key=lambda x: x["emp"], reverse=True)
-        per_naics_top[naics] = occs[: max(1, int(top_n_occ))]
+        return occs[: max(1, int(top_n_occ))]
+
+     per_naics_top: Dict[str, List[Dict[str, Any]]] = dict(
+        zip(naics_list, await asyncio.gather(*(_top_occs(n) for n in naics_list)))
+     )
 
     # legend: “Top Occupation #1/#2/#3” (stable across industries)
      legend = [{"key": f"occ{i}_emp", "name": f"Top Occupation #{i}"} for i in range(1, int(top_n_occ) + 1)]
@@ -2,13 +2,35 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 from collections import defaultdict
+from functools import lru_cache
 import asyncio
+import re
 import time
 
+from app.services.cache import cache, make_key
+from app.services.invalidation import BLS_OEWS_TAG
+
 if TYPE_CHECKING:
     from motor.core import AgnosticDatabase
 
 
+# BLS "15-1252" or O*NET "15-1252.00"
+_OCC_CODE_RE = re.compile(r"^\d{2}-\d{4}(\.\d{2})?$")
+
+
+def is_valid_occ_code(occ_code: str) -> bool:
+    return bool(occ_code) and _OCC_CODE_RE.match(occ_code) is not None
+
+
+@lru_cache(maxsize=4096)
+def _to_onet_soc(occ_code: str) -> Optional[str]:
+    """BLS occ_code -> O*NET SOC ("15-1252" -> "15-1252.00"); pure string mapping."""
+    occ_code = (occ_code or "").strip()
+    if not is_valid_occ_code(occ_code):
+        return None
+    return occ_code if "." in occ_code else f"{occ_code}.00"
+
+
 def _to_float(v: Any) -> float:
     """Robust numeric parser for O*NET fields"""
     if v is None:
@@ -91,80 +113,60 @@ class JobDetailRepo:
         Get basic job info using MAX tot_emp approach - with 3-hour cache.
         Year is required to match specific year data.
         """
-        cache_key = f"job_{occ_code}_{year}"
-        now = time.time()
-        
-        # Check cache
-        if cache_key in self._job_detail_cache:
-            if now - self._job_detail_cache_time.get(cache_key, 0) < 10800:  # 3 hours
-                print(f"✅ Job detail cache HIT for {occ_code} {year}")
-                return self._job_detail_cache[cache_key]
-        
+        return (await self.get_jobs_by_occ_codes([occ_code], year)).get(occ_code)
+
+    async def get_jobs_by_occ_codes(self, occ_codes: List[str], year: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Batched get_job_by_occ_code: one $in aggregation for every code not
+        already in the shared (Redis-backed) cache. Returns {occ_code: job_data};
+        codes with no BLS row for the year are left out.
+        """
+        codes = list(dict.fromkeys(occ_codes))
+        keys = [make_key("bls_job", occ_code=c, year=year) for c in codes]
+        out: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for occ_code, job_data in zip(codes, await cache.mget(keys)):
+            if job_data is not None:
+                out[occ_code] = job_data
+            else:
+                missing.append(occ_code)
+
+        if not missing:
+            return out
+
+        # MAX tot_emp row per occ_code
         pipeline = [
-            {
-                "$match": {
-                    "occ_code": occ_code,
-                    "year": year
-                }
-            },
+            {"$match": {"occ_code": {"$in": missing}, "year": year}},
+            {"$sort": {"tot_emp": -1}},
             {
                 "$group": {
-                    "_id": None,
+                    "_id": "$occ_code",
                     "occ_title": {"$first": "$occ_title"},
                     "group": {"$first": "$group"},
-                    "max_emp": {"$max": "$tot_emp"},
-                    "all_docs": {"$push": {
-                        "tot_emp": "$tot_emp",
-                        "a_median": "$a_median"
-                    }}
+                    "tot_emp": {"$first": "$tot_emp"},
+                    "a_median": {"$first": "$a_median"},
                 }
             },
-            {
-                "$addFields": {
-                    "selected_doc": {
-                        "$arrayElemAt": [
-                            {
-                                "$filter": {
-                                    "input": "$all_docs",
-                                    "as": "doc",
-                                    "cond": {"$eq": ["$$doc.tot_emp", "$max_emp"]}
-                                }
-                            },
-                            0
-                        ]
-                    }
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "occ_code": occ_code,
-                    "occ_title": 1,
-                    "group": 1,
-                    "tot_emp": "$max_emp",
-                    "a_median": "$selected_doc.a_median"
-                }
-            }
         ]
-        
-        result = await self.db["bls_oews"].aggregate(pipeline).to_list(length=1)
-        
-        if result:
-            doc = result[0]
-            job_data = {
+
+        fetched: Dict[str, Dict[str, Any]] = {}
+        async for doc in self.db["bls_oews"].aggregate(pipeline):
+            occ_code = doc["_id"]
+            fetched[occ_code] = {
                 "occ_code": occ_code,
                 "occ_title": str(doc.get("occ_title", "")),
                 "tot_emp": _to_float(doc.get("tot_emp", 0)),
                 "a_median": _to_float(doc.get("a_median", 0)),
                 "group": doc.get("group")
             }
-            
-            # Update cache
-            self._job_detail_cache[cache_key] = job_data
-            self._job_detail_cache_time[cache_key] = now
-            
-            return job_data
-        return None
+
+        await cache.put_many(
+            {make_key("bls_job", occ_code=c, year=year): job_data for c, job_data in fetched.items()},
+            ttl=10800,
+            tags=(BLS_OEWS_TAG,),
+        )
+        out.update(fetched)
+        return out
     
     async def get_job_growth_trend(self, occ_code: str) -> float:
         """
@@ -422,33 +424,8 @@ class JobDetailRepo:
         return result
     
     async def get_onet_soc(self, occ_code: str) -> Optional[str]:
-        """Map BLS OCC code to O*NET SOC code format - with 3-hour cache."""
-        cache_key = f"onet_{occ_code}"
-        now = time.time()
-        
-        # Check cache
-        if cache_key in self._onet_soc_cache:
-            if now - self._onet_soc_cache_time.get(cache_key, 0) < 10800:  # 3 hours
-                print(f"✅ ONET SOC cache HIT for {occ_code}")
-                return self._onet_soc_cache[cache_key]
-        
-        if not occ_code:
-            result = None
-        else:
-            occ_code = occ_code.strip()
-            
-            if ".00" in occ_code:
-                result = occ_code
-            elif "-" in occ_code and len(occ_code) >= 6:
-                result = f"{occ_code}.00"
-            else:
-                result = None
-        
-        # Update cache
-        self._onet_soc_cache[cache_key] = result
-        self._onet_soc_cache_time[cache_key] = now
-        
-        return result
+        """Map BLS OCC code to O*NET SOC code format (no DB access, LRU-cached)."""
+        return _to_onet_soc(occ_code)
     
     async def find_onet_soc_by_title(self, title: str) -> Optional[str]:
         """Find O*NET SOC code by job title - with 3-hour cache."""
@@ -690,6 +667,22 @@ class JobDetailRepo:
     # COMPLETE JOB DETAIL - OPTIMIZED PARALLEL FETCHING WITH ALL ITEMS
     # -------------------------
     
+    def _detail_tasks(self, occ_code: str, onet_soc: str, year: int) -> List[Any]:
+        """O*NET data followed by trend data and top industry, in unpacking order."""
+        return [
+            self.get_skills(onet_soc),
+            self.get_technology_skills(onet_soc),
+            self.get_tools(onet_soc),
+            self.get_abilities(onet_soc),
+            self.get_knowledge(onet_soc),
+            self.get_education(onet_soc),
+            self.get_work_activities(onet_soc),
+            self.get_job_growth_trend(occ_code),
+            self.get_job_salary_trend(occ_code),
+            self.get_experience_required(onet_soc),
+            self.get_top_industry(occ_code, year),
+        ]
+
     async def get_complete_job_detail(self, occ_code: str, year: int = 2024) -> Dict[str, Any]:
         """Get complete job details - optimized with parallel fetching and 3-hour cache."""
         
@@ -702,16 +695,25 @@ class JobDetailRepo:
                 print(f"✅ Complete job detail cache HIT for {occ_code} {year}")
                 return self._job_detail_cache[cache_key]
         
-        # Get basic job info using optimized method (matches JobsRepo)
-        basic_info = await self.get_job_by_occ_code(occ_code, year)
-        
-        # Get O*NET SOC code
+        # Get O*NET SOC code (pure mapping, no round-trip)
         onet_soc = await self.get_onet_soc(occ_code)
-        
-        # If no matching SOC, try to find by title
-        if not onet_soc and basic_info:
-            title = basic_info.get("occ_title", "")
-            onet_soc = await self.find_onet_soc_by_title(title)
+        detail = None
+
+        if onet_soc:
+            # Everything below only needs occ_code/onet_soc, so fetch the BLS
+            # basic info together with all O*NET + trend data in one gather.
+            basic_info, *detail = await asyncio.gather(
+                self.get_job_by_occ_code(occ_code, year),
+                *self._detail_tasks(occ_code, onet_soc, year),
+            )
+        else:
+            # Get basic job info using optimized method (matches JobsRepo)
+            basic_info = await self.get_job_by_occ_code(occ_code, year)
+
+            # If no matching SOC, try to find by title
+            if basic_info:
+                title = basic_info.get("occ_title", "")
+                onet_soc = await self.find_onet_soc_by_title(title)
         
         # Initialize result
         result = {
@@ -738,32 +740,13 @@ class JobDetailRepo:
         if not onet_soc or not basic_info:
             return result
         
-        # Fetch all O*NET data in parallel
-        tasks = [
-            self.get_skills(onet_soc),
-            self.get_technology_skills(onet_soc),
-            self.get_tools(onet_soc),
-            self.get_abilities(onet_soc),
-            self.get_knowledge(onet_soc),
-            self.get_education(onet_soc),
-            self.get_work_activities(onet_soc),
-        ]
-        
-        # Fetch trend data and industry in parallel
-        trend_tasks = [
-            self.get_job_growth_trend(occ_code),
-            self.get_job_salary_trend(occ_code),
-            self.get_experience_required(onet_soc),
-            self.get_top_industry(occ_code, year)  # Added industry
-        ]
-        
-        # Wait for all data
-        onet_results = await asyncio.gather(*tasks)
-        trend_results = await asyncio.gather(*trend_tasks)
+        if detail is None:
+            detail = await asyncio.gather(*self._detail_tasks(occ_code, onet_soc, year))
         
-        skills, tech_skills, tools, abilities, knowledge, education, activities = onet_results
-        # Unpack trend_results - now includes industry
-        growth_trend, salary_trend, experience, industry = trend_results
+        (
+            skills, tech_skills, tools, abilities, knowledge, education, activities,
+            growth_trend, salary_trend, experience, industry,
+        ) = detail
         
         # Categorize skills - soft skills should come from the top skills list
         all_skills = skills
@@ -31,6 +31,179 @@ def _to_float(v: Any) -> float:
         return 0.0
 
 
+# Precomputed /top-trends + /top-salary-trends series, one doc per (group, sort_by)
+MV_TOP_JOBS_TRENDS = "mv_top_jobs_trends"
+# Routers cap top-trends limit at 20, so this covers every request
+MV_TOP_JOBS_LIMIT = 20
+MV_YEAR_FROM = 2011
+
+
+def _trend_match(occ_codes: List[str], years: List[int]) -> Dict[str, Any]:
+    return {
+        "$match": {
+            "occ_code": {"$in": occ_codes},
+            "year": {"$in": years},
+            "naics": "000000",
+        }
+    }
+
+
+def _employment_trend_stages(years: List[int]) -> List[Dict[str, Any]]:
+    """Per-occupation yearly max tot_emp, one point per year (0 when missing)."""
+    return [
+        {
+            "$group": {
+                "_id": {
+                    "occ_code": "$occ_code",
+                    "year": "$year"
+                },
+                "max_emp": {"$max": "$tot_emp"}
+            }
+        },
+        {
+            "$group": {
+                "_id": "$_id.occ_code",
+                "points": {
+                    "$push": {
+                        "year": "$_id.year",
+                        "employment": "$max_emp"
+                    }
+                }
+            }
+        },
+        {
+            "$project": {
+                "points": {
+                    "$map": {
+                        "input": years,
+                        "as": "y",
+                        "in": {
+                            "$let": {
+                                "vars": {
+                                    "match": {
+                                        "$filter": {
+                                            "input": "$points",
+                                            "as": "p",
+                                            "cond": {"$eq": ["$$p.year", "$$y"]}
+                                        }
+                                    }
+                                },
+                                "in": {
+                                    "$cond": {
+                                        "if": {"$gt": [{"$size": "$$match"}, 0]},
+                                        "then": {"$arrayElemAt": ["$$match", 0]},
+                                        "else": {"year": "$$y", "employment": 0}
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    ]
+
+
+def _salary_trend_stages(years: List[int]) -> List[Dict[str, Any]]:
+    """Per-occupation yearly max a_median, one point per year (0 when missing)."""
+    return [
+        {
+            "$group": {
+                "_id": {
+                    "occ_code": "$occ_code",
+                    "year": "$year"
+                },
+                "salary": {"$max": "$a_median"},  # Take max salary for the year
+                "occ_title": {"$first": "$occ_title"}
+            }
+        },
+        {
+            "$group": {
+                "_id": "$_id.occ_code",
+                "occ_title": {"$first": "$occ_title"},
+                "points": {
+                    "$push": {
+                        "year": "$_id.year",
+                        "salary": "$salary"
+                    }
+                }
+            }
+        },
+        {
+            "$project": {
+                "occ_title": 1,
+                "points": {
+                    "$map": {
+                        "input": years,
+                        "as": "y",
+                        "in": {
+                            "$let": {
+                                "vars": {
+                                    "match": {
+                                        "$filter": {
+                                            "input": "$points",
+                                            "as": "p",
+                                            "cond": {"$eq": ["$$p.year", "$$y"]}
+                                        }
+                                    }
+                                },
+                                "in": {
+                                    "$cond": {
+                                        "if": {"$gt": [{"$size": "$$match"}, 0]},
+                                        "then": {
+                                            "year": "$$y",
+                                            "salary": {"$arrayElemAt": ["$$match.salary", 0]}
+                                        },
+                                        "else": {
+                                            "year": "$$y",
+                                            "salary": 0
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    ]
+
+
+def _employment_series(doc: Dict[str, Any], title_map: Dict[str, str]) -> Dict[str, Any]:
+    code = doc["_id"]
+    return {
+        "occ_code": code,
+        "occ_title": title_map.get(code, ""),
+        "points": sorted(doc["points"], key=lambda x: x["year"])
+    }
+
+
+def _salary_series(doc: Dict[str, Any], title_map: Dict[str, str]) -> Dict[str, Any]:
+    code = doc["_id"]
+
+    # Sort points by year and carry forward last valid salary
+    points = sorted(doc["points"], key=lambda x: x["year"])
+
+    # Carry forward last valid salary for missing years
+    last_valid = 0
+    cleaned_points = []
+    for point in points:
+        if point["salary"] > 0:
+            last_valid = point["salary"]
+            cleaned_points.append(point)
+        else:
+            cleaned_points.append({
+                "year": point["year"],
+                "salary": last_valid  # Use last valid salary instead of 0
+            })
+
+    return {
+        "occ_code": code,
+        "occ_title": title_map.get(code, doc.get("occ_title", "")),
+        "points": cleaned_points
+    }
+
+
 class JobsRepo:
     """
     Jobs/Occupations repository.
@@ -409,11 +582,17 @@ class JobsRepo:
         limit: int = 10,
         group: Optional[str] = None,
         sort_by: Literal["employment", "salary"] = "employment",
-        only_with_details: bool = True
+        only_with_details: bool = True,
+        use_materialized: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Get employment trends for top jobs over time - single aggregation
         """
+        if use_materialized and only_with_details:
+            mv = await self._materialized_trends(year_from, year_to, limit, group, sort_by)
+            if mv is not None:
+                return mv["series"][:limit]
+
         # First, get top jobs at the end year
         top_jobs_end = await self.top_jobs(
             year=year_to,
@@ -430,79 +609,15 @@ class JobsRepo:
         years = list(range(min(year_from, year_to), max(year_from, year_to) + 1))
         
         # Single aggregation for all occupations
-        pipeline = [
-            {
-                "$match": {
-                    "occ_code": {"$in": occ_codes},
-                    "year": {"$in": years},
-                    "naics": "000000",
-                }
-            },
-            {
-                "$group": {
-                    "_id": {
-                        "occ_code": "$occ_code",
-                        "year": "$year"
-                    },
-                    "max_emp": {"$max": "$tot_emp"}
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$_id.occ_code",
-                    "points": {
-                        "$push": {
-                            "year": "$_id.year",
-                            "employment": "$max_emp"
-                        }
-                    }
-                }
-            },
-            {
-                "$project": {
-                    "points": {
-                        "$map": {
-                            "input": years,
-                            "as": "y",
-                            "in": {
-                                "$let": {
-                                    "vars": {
-                                        "match": {
-                                            "$filter": {
-                                                "input": "$points",
-                                                "as": "p",
-                                                "cond": {"$eq": ["$$p.year", "$$y"]}
-                                            }
-                                        }
-                                    },
-                                    "in": {
-                                        "$cond": {
-                                            "if": {"$gt": [{"$size": "$$match"}, 0]},
-                                            "then": {"$arrayElemAt": ["$$match", 0]},
-                                            "else": {"year": "$$y", "employment": 0}
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        ]
+        pipeline = [_trend_match(occ_codes, years), *_employment_trend_stages(years)]
         
         # Create lookup map for job titles
         title_map = {job["occ_code"]: job["occ_title"] for job in top_jobs_end}
         
-        series = []
-        async for doc in self.db["bls_oews"].aggregate(pipeline):
-            code = doc["_id"]
-            series.append({
-                "occ_code": code,
-                "occ_title": title_map.get(code, ""),
-                "points": sorted(doc["points"], key=lambda x: x["year"])
-            })
-        
-        return series
+        return [
+            _employment_series(doc, title_map)
+            async for doc in self.db["bls_oews"].aggregate(pipeline)
+        ]
     
     # -------------------------
     # Top jobs salary trends - OPTIMIZED (SINGLE QUERY)
@@ -514,11 +629,17 @@ class JobsRepo:
         limit: int = 10,
         group: Optional[str] = None,
         sort_by: Literal["employment", "salary"] = "employment",
-        only_with_details: bool = True
+        only_with_details: bool = True,
+        use_materialized: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Get salary trends for top jobs over time - returns raw salary values
         """
+        if use_materialized and only_with_details:
+            mv = await self._materialized_trends(year_from, year_to, limit, group, sort_by)
+            if mv is not None:
+                return mv["salary_series"][:limit]
+
         # First, get top jobs at the end year
         top_jobs_end = await self.top_jobs(
             year=year_to,
@@ -538,102 +659,131 @@ class JobsRepo:
         title_map = {job["occ_code"]: job["occ_title"] for job in top_jobs_end}
         
         # Single aggregation for all occupations
-        pipeline = [
-            {
-                "$match": {
-                    "occ_code": {"$in": occ_codes},
-                    "year": {"$in": years},
-                    "naics": "000000",
-                }
-            },
+        pipeline = [_trend_match(occ_codes, years), *_salary_trend_stages(years)]
+        
+        return [
+            _salary_series(doc, title_map)
+            async for doc in self.db["bls_oews"].aggregate(pipeline)
+        ]
+    
+    # -------------------------
+    # Materialized top jobs trends
+    # -------------------------
+    async def _materialized_trends(
+        self,
+        year_from: int,
+        year_to: int,
+        limit: int,
+        group: Optional[str],
+        sort_by: str
+    ) -> Optional[Dict[str, Any]]:
+        """Precomputed trends doc covering this request, or None to aggregate live."""
+        if limit > MV_TOP_JOBS_LIMIT:
+            return None
+        return await self.db[MV_TOP_JOBS_TRENDS].find_one(
             {
-                "$group": {
-                    "_id": {
-                        "occ_code": "$occ_code",
-                        "year": "$year"
-                    },
-                    "salary": {"$max": "$a_median"},  # Take max salary for the year
-                    "occ_title": {"$first": "$occ_title"}
-                }
+                "group": group,
+                "sort_by": sort_by,
+                "year_from": min(year_from, year_to),
+                "year_to": max(year_from, year_to),
             },
+            {"_id": 0, "series": 1, "salary_series": 1}
+        )
+
+    async def _materialize_top_jobs_trends(self, group: Optional[str], year_to: int) -> None:
+        """Recompute and upsert the top-20 trend series for one group, both sort orders."""
+        for sort_by in ("employment", "salary"):
+            top = await self.top_jobs(
+                year=year_to, limit=MV_TOP_JOBS_LIMIT, by=sort_by, group=group
+            )
+            # Series come back in $group order; keep them in rank order so
+            # the read path can slice [:limit]
+            rank = {job["occ_code"]: i for i, job in enumerate(top)}
+            emp, sal = await asyncio.gather(
+                self.top_jobs_trends(
+                    year_from=MV_YEAR_FROM, year_to=year_to, limit=MV_TOP_JOBS_LIMIT,
+                    group=group, sort_by=sort_by, use_materialized=False
+                ),
+                self.top_jobs_salary_trends(
+                    year_from=MV_YEAR_FROM, year_to=year_to, limit=MV_TOP_JOBS_LIMIT,
+                    group=group, sort_by=sort_by, use_materialized=False
+                ),
+            )
+            await self.db[MV_TOP_JOBS_TRENDS].replace_one(
+                {"group": group, "sort_by": sort_by},
+                {
+                    "group": group,
+                    "sort_by": sort_by,
+                    "year_from": min(MV_YEAR_FROM, year_to),
+                    "year_to": max(MV_YEAR_FROM, year_to),
+                    "series": sorted(emp, key=lambda s: rank.get(s["occ_code"], len(rank))),
+                    "salary_series": sorted(sal, key=lambda s: rank.get(s["occ_code"], len(rank))),
+                },
+                upsert=True
+            )
+
+    async def refresh_materialized_trends(self) -> int:
+        """Rebuild mv_top_jobs_trends for the latest year: all groups plus no group."""
+        year_to = await self._latest_year()
+        if year_to is None:
+            return 0
+        groups = [None] + [g["group"] for g in await self.job_groups(year_to)]
+        for group in groups:
+            await self._materialize_top_jobs_trends(group, year_to)
+        return len(groups)
+    
+    # -------------------------
+    # Top jobs + both trend series - ONE TREND AGGREGATION
+    # -------------------------
+    async def top_jobs_combined(
+        self,
+        year: int,
+        limit: int = 10,
+        by: Literal["employment", "salary"] = "employment",
+        group: Optional[str] = None,
+        year_from: int = 2011,
+        only_with_details: bool = True
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Top jobs at `year` plus their employment and salary trends.
+
+        Ranks once, then builds both series from a single $facet over the
+        shared occ_code/year slice instead of three separate scans.
+        """
+        top = await self.top_jobs(
+            year=year,
+            limit=limit,
+            by=by,
+            group=group,
+            only_with_details=only_with_details
+        )
+        if not top:
+            return {"top_jobs": [], "employment_trends": [], "salary_trends": []}
+
+        occ_codes = [job["occ_code"] for job in top]
+        years = list(range(min(year_from, year), max(year_from, year) + 1))
+        title_map = {job["occ_code"]: job["occ_title"] for job in top}
+
+        pipeline = [
+            _trend_match(occ_codes, years),
             {
-                "$group": {
-                    "_id": "$_id.occ_code",
-                    "occ_title": {"$first": "$occ_title"},
-                    "points": {
-                        "$push": {
-                            "year": "$_id.year",
-                            "salary": "$salary"
-                        }
-                    }
+                "$facet": {
+                    "emp_trends": _employment_trend_stages(years),
+                    "sal_trends": _salary_trend_stages(years),
                 }
             },
-            {
-                "$project": {
-                    "occ_title": 1,
-                    "points": {
-                        "$map": {
-                            "input": years,
-                            "as": "y",
-                            "in": {
-                                "$let": {
-                                    "vars": {
-                                        "match": {
-                                            "$filter": {
-                                                "input": "$points",
-                                                "as": "p",
-                                                "cond": {"$eq": ["$$p.year", "$$y"]}
-                                            }
-                                        }
-                                    },
-                                    "in": {
-                                        "$cond": {
-                                            "if": {"$gt": [{"$size": "$$match"}, 0]},
-                                            "then": {
-                                                "year": "$$y",
-                                                "salary": {"$arrayElemAt": ["$$match.salary", 0]}
-                                            },
-                                            "else": {
-                                                "year": "$$y",
-                                                "salary": 0
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
         ]
-        
-        series = []
-        async for doc in self.db["bls_oews"].aggregate(pipeline):
-            code = doc["_id"]
-            
-            # Sort points by year and carry forward last valid salary
-            points = sorted(doc["points"], key=lambda x: x["year"])
-            
-            # Carry forward last valid salary for missing years
-            last_valid = 0
-            cleaned_points = []
-            for point in points:
-                if point["salary"] > 0:
-                    last_valid = point["salary"]
-                    cleaned_points.append(point)
-                else:
-                    cleaned_points.append({
-                        "year": point["year"],
-                        "salary": last_valid  # Use last valid salary instead of 0
-                    })
-            
-            series.append({
-                "occ_code": code,
-                "occ_title": title_map.get(code, doc.get("occ_title", "")),
-                "points": cleaned_points
-            })
-        
-        return series
+        facets = await self.db["bls_oews"].aggregate(pipeline).to_list(length=1)
+        facets = facets[0] if facets else {}
+
+        return {
+            "top_jobs": top,
+            "employment_trends": [
+                _employment_series(doc, title_map) for doc in facets.get("emp_trends", [])
+            ],
+            "salary_trends": [
+                _salary_series(doc, title_map) for doc in facets.get("sal_trends", [])
+            ],
+        }
     
     # -------------------------
     # Dashboard metrics - OPTIMIZED (SINGLE AGGREGATION)
@@ -732,6 +882,14 @@ class JobsRepo:
         
         return naics_title, rows
     
+    async def naics_title(self, naics: str, year: int) -> Optional[str]:
+        """Industry title for a NAICS code; index-only via naics_year_title."""
+        doc = await self.db["bls_oews"].find_one(
+            {"naics": naics, "year": int(year)},
+            {"naics_title": 1, "_id": 0}
+        )
+        return str(doc.get("naics_title", "")).strip() if doc else None
+    
     # -------------------------
     # Job groups - OPTIMIZED (SINGLE AGGREGATION)
     # -------------------------
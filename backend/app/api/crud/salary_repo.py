@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import os
 from typing import Any, Dict, List, Optional, Tuple
 
 from motor.core import AgnosticDatabase
 from app.api.crud.jobs_repo import JobsRepo
 
+# Server-side cap for the salary/employment aggregations; a runaway pipeline
+# fails fast instead of tying up a pool connection
+SALARY_AGG_MAX_TIME_MS = int(os.getenv("SALARY_AGG_MAX_TIME_MS", "5000"))
+
 
 class SalaryRepo:
     def __init__(self, db: AgnosticDatabase):
@@ -12,7 +17,7 @@ class SalaryRepo:
         self.col = db["bls_oews"]
 
     async def latest_year(self) -> int:
-        doc = await self.col.find({}, {"year": 1}).sort("year", -1).limit(1).to_list(1)
+        doc = await self.col.find({}, {"year": 1, "_id": 0}).sort("year", -1).limit(1).to_list(1)
         if not doc:
             raise ValueError("bls_oews is empty")
         return int(doc[0]["year"])
@@ -20,6 +25,10 @@ class SalaryRepo:
     # ---------------------------
     # Helpers
     # ---------------------------
+    def _aggregate(self, pipeline: List[Dict[str, Any]], op: str):
+        """bls_oews aggregate with a time cap, tagged "salary.<op>" for the profiler / currentOp."""
+        return self.col.aggregate(pipeline, maxTimeMS=SALARY_AGG_MAX_TIME_MS, comment=f"salary.{op}")
+
     @staticmethod
     def _num(field: str) -> Dict[str, Any]:
         """
@@ -101,7 +110,7 @@ class SalaryRepo:
             {"$sort": {"medianSalary": -1}},
             {"$limit": 1},
         ]
-        top_pay = await self.col.aggregate(top_pay_pipeline).to_list(1)
+        top_pay = await self._aggregate(top_pay_pipeline, "dashboard_metrics").to_list(1)
         top_industry = top_pay[0]["name"] if top_pay else "N/A"
 
         return {
@@ -147,7 +156,7 @@ class SalaryRepo:
             {"$limit": min(limit, 50)},
         ]
 
-        rows = await self.col.aggregate(pipeline).to_list(length=min(limit, 50))
+        rows = await self._aggregate(pipeline, "industry_bar").to_list(length=min(limit, 50))
         out: List[dict] = []
         for r in rows:
             name = str(r.get("name") or "").strip()
@@ -168,13 +177,14 @@ class SalaryRepo:
     async def top_cross_industry_jobs(self, year: int, limit: int = 10) -> List[dict]:
         """
         Returns top N job titles from Cross-industry, sorted by median salary DESC.
-        Uses Cross-industry rows in bls_oews (naics_title == 'Cross-industry').
+        Uses Cross-industry rows in bls_oews (naics 000000, titled 'Cross-industry';
+        matched on naics so the (naics, year) index applies).
         """
         pipeline = [
             {
                 "$match": {
                     "year": year,
-                    "naics_title": {"$regex": "^Cross-industry$", "$options": "i"},
+                    "naics": "000000",
                     "occ_title": {"$nin": ["All Occupations", "Industry Total"]},
                 }
             },
@@ -197,7 +207,7 @@ class SalaryRepo:
             {"$limit": min(max(limit, 1), 50)},
         ]
 
-        rows = await self.col.aggregate(pipeline).to_list(length=min(max(limit, 1), 50))
+        rows = await self._aggregate(pipeline, "top_cross_industry_jobs").to_list(length=min(max(limit, 1), 50))
         out: List[dict] = []
         for r in rows:
             nm = str(r.get("name") or "").strip()
@@ -254,17 +264,18 @@ class SalaryRepo:
             },
         ]
 
-        total_doc = await self.col.aggregate(base_pipeline + [{"$count": "total"}]).to_list(1)
+        total_doc = await self._aggregate(base_pipeline + [{"$count": "total"}], "industries_paged").to_list(1)
         total = int(total_doc[0]["total"]) if total_doc else 0
 
         skip = max(page - 1, 0) * page_size
-        items = await self.col.aggregate(
+        items = await self._aggregate(
             base_pipeline
             + [
                 {"$sort": {sort_field: sort_dir}},
                 {"$skip": skip},
                 {"$limit": page_size},
-            ]
+            ],
+            "industries_paged",
         ).to_list(page_size)
 
         for it in items:
@@ -299,7 +310,7 @@ class SalaryRepo:
             {"$group": {"_id": "$naics", "employment": {"$max": self._num("tot_emp")}}},
             {"$project": {"_id": 0, "id": "$_id", "employment": 1}},
         ]
-        rows = await self.col.aggregate(pipeline).to_list(length=max(10, len(naics_ids)))
+        rows = await self._aggregate(pipeline, "industry_employment_map").to_list(length=max(10, len(naics_ids)))
         return {r["id"]: int(r.get("employment") or 0) for r in rows}
 
     # ---------------------------
@@ -351,17 +362,18 @@ class SalaryRepo:
             },
         ]
 
-        total_doc = await self.col.aggregate(base_pipeline + [{"$count": "total"}]).to_list(1)
+        total_doc = await self._aggregate(base_pipeline + [{"$count": "total"}], "jobs_paged").to_list(1)
         total = int(total_doc[0]["total"]) if total_doc else 0
 
         skip = max(page - 1, 0) * page_size
-        items = await self.col.aggregate(
+        items = await self._aggregate(
             base_pipeline
             + [
                 {"$sort": {sort_field: sort_dir}},
                 {"$skip": skip},
                 {"$limit": page_size},
-            ]
+            ],
+            "jobs_paged",
         ).to_list(page_size)
 
         for it in items:
@@ -388,7 +400,7 @@ class SalaryRepo:
             {"$group": {"_id": "$occ_code", "employment": {"$max": self._num("tot_emp")}}},
             {"$project": {"_id": 0, "occ_code": "$_id", "employment": 1}},
         ]
-        rows = await self.col.aggregate(pipeline).to_list(length=max(10, len(occ_codes)))
+        rows = await self._aggregate(pipeline, "job_employment_map").to_list(length=max(10, len(occ_codes)))
         return {r["occ_code"]: int(r.get("employment") or 0) for r in rows}
 
     # ---------------------------
@@ -426,7 +438,7 @@ class SalaryRepo:
             {"$sort": {"name": 1, "year": 1}},
         ]
 
-        rows = await self.col.aggregate(pipeline).to_list(length=5000)
+        rows = await self._aggregate(pipeline, "industry_salary_timeseries").to_list(length=5000)
         for r in rows:
             r["year"] = int(r["year"])
             r["value"] = int(r.get("value") or 0)
@@ -4,9 +4,65 @@ from typing import Any, Dict, List, Optional, TYPE_CHECKING
 import re
 import asyncio
 
+from neo4j import RoutingControl
+from neo4j.exceptions import ClientError
+
+from app.database.neo4j import NEO4J_DATABASE
+
 if TYPE_CHECKING:
     from neo4j import AsyncDriver
 
+# Skill search ids: spaces and slashes become "_", commas are dropped
+_SEARCH_ID_TRANS = str.maketrans({" ": "_", "/": "_", ",": None})
+
+
+def search_skill_id(name: str) -> str:
+    """Id the skill search endpoints return for a skill name."""
+    return name.lower().translate(_SEARCH_ID_TRANS)
+
+
+def detail_skill_id(name: str) -> str:
+    """Id get_complete_skill_detail reports in basic_info.skill_id."""
+    return re.sub(r'_+', '_', re.sub(r'[^a-zA-Z0-9]', '_', name.lower())).strip('_')
+
+
+# skill id (either form above) -> exact Skill.name; filled by load_skill_ids()
+_SKILL_IDS: Dict[str, str] = {}
+
+
+def skill_name_for_id(skill_id: str) -> Optional[str]:
+    skill_id = skill_id.lower()
+    return _SKILL_IDS.get(skill_id) or _SKILL_IDS.get(skill_id.replace("-", "_"))
+
+
+async def load_skill_ids(driver: AsyncDriver) -> int:
+    """Build the skill id -> name map from every Skill node; returns its size."""
+    records, _, _ = await driver.execute_query(
+        "MATCH (s:Skill) RETURN s.name AS name",
+        routing_=RoutingControl.READ,
+        database_=NEO4J_DATABASE,
+    )
+    names = [r["name"] for r in records if r["name"]]
+
+    ids: Dict[str, str] = {}
+    for name in names:
+        ids.setdefault(search_skill_id(name), name)
+        ids.setdefault(detail_skill_id(name), name)
+
+    global _SKILL_IDS
+    _SKILL_IDS = ids
+    return len(ids)
+
+
+_LUCENE_SPECIAL_RE = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def _fulltext_query(q: str) -> str:
+    """Lucene query for skill_name_ft: every word must match, the last as a prefix."""
+    terms = [_LUCENE_SPECIAL_RE.sub(r"\\\1", t) for t in q.split() if any(c.isalnum() for c in t)]
+    return " AND ".join(terms) + "*" if terms else ""
+
+
 class SkillRepo:
     """
     Repository for skill details using Neo4j graph database.
@@ -57,26 +113,18 @@ class SkillRepo:
             
         clean_name = self._clean_skill_name(skill_name)
         
-        async with self.driver.session() as session:
-            result = await session.run(
-                """
-                MATCH (s:Skill)
-                WHERE toLower(s.name) CONTAINS toLower($skill_name)
-                RETURN s.name AS name,
-                       s.classification AS classification
-                ORDER BY size(s.name) ASC
-                LIMIT 1
-                """,
-                skill_name=clean_name
-            )
-            record = await result.single()
-            
-            if record:
-                return {
-                    "name": record["name"],
-                    "classification": record.get("classification", [])
-                }
-        return None
+        rows = await self._skill_rows(
+            """
+            MATCH (s:Skill)
+            WHERE toLower(s.name) CONTAINS toLower($skill_name)
+            RETURN s.name AS name,
+                   s.classification AS classification
+            ORDER BY size(s.name) ASC
+            LIMIT 1
+            """,
+            skill_name=clean_name
+        )
+        return self._skill_match(rows)
     
     async def get_skill_by_exact_name(self, skill_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -85,26 +133,105 @@ class SkillRepo:
         if not skill_name:
             return None
             
-        async with self.driver.session() as session:
-            result = await session.run(
+        rows = await self._skill_rows(
+            """
+            MATCH (s:Skill)
+            WHERE toLower(s.name) = toLower($skill_name)
+            RETURN s.name AS name,
+                   s.classification AS classification
+            LIMIT 1
+            """,
+            skill_name=skill_name
+        )
+        return self._skill_match(rows)
+    
+    async def _skill_rows(self, cypher: str, **params: Any) -> List[Dict[str, Any]]:
+        """Read-only query through the driver's managed execute_query."""
+        records, _, _ = await self.driver.execute_query(
+            cypher, params, routing_=RoutingControl.READ, database_=NEO4J_DATABASE
+        )
+        return [r.data() for r in records]
+
+    @staticmethod
+    def _skill_match(rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not rows:
+            return None
+        return {
+            "name": rows[0]["name"],
+            "classification": rows[0].get("classification", [])
+        }
+
+    async def search_skills(self, q: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Skill search rows (id, name, type, job_count), most-required first.
+        Uses the skill_name_ft full-text index; falls back to a CONTAINS scan
+        if the index is missing.
+        """
+        query = _fulltext_query(q)
+        if not query:
+            return []
+
+        try:
+            rows = await self._skill_rows(
+                """
+                CALL db.index.fulltext.queryNodes('skill_name_ft', $query) YIELD node AS s
+                RETURN s.name AS name,
+                       s.classification AS classification,
+                       COUNT { (j:Job)-[:REQUIRES]->(s) } AS job_count
+                ORDER BY job_count DESC
+                LIMIT $limit
+                """,
+                query=query,
+                limit=limit
+            )
+        except ClientError as e:
+            print(f"⚠️ Full-text skill search unavailable, scanning instead: {e.code}")
+            rows = await self._skill_rows(
                 """
                 MATCH (s:Skill)
-                WHERE toLower(s.name) = toLower($skill_name)
+                WHERE toLower(s.name) CONTAINS toLower($search_term)
                 RETURN s.name AS name,
-                       s.classification AS classification
-                LIMIT 1
+                       s.classification AS classification,
+                       COUNT { (j:Job)-[:REQUIRES]->(s) } AS job_count
+                ORDER BY job_count DESC
+                LIMIT $limit
                 """,
-                skill_name=skill_name
+                search_term=q,
+                limit=limit
             )
-            record = await result.single()
-            
-            if record:
-                return {
-                    "name": record["name"],
-                    "classification": record.get("classification", [])
-                }
-        return None
-    
+
+        return [
+            {
+                "id": search_skill_id(r["name"]),
+                "name": r["name"],
+                "type": "tech" if "TechnologySkill" in (r.get("classification") or []) else "skill",
+                "job_count": r.get("job_count", 0),
+            }
+            for r in rows
+        ]
+
+    async def resolve_skill(self, skill_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Exact (case-insensitive) match, else the shortest partial match, in one
+        query; same result as get_skill_by_exact_name -> get_skill_by_name.
+        """
+        clean_name = self._clean_skill_name(skill_name)
+        if not clean_name:
+            return None
+
+        rows = await self._skill_rows(
+            """
+            MATCH (s:Skill)
+            WHERE toLower(s.name) CONTAINS $skill_name
+            RETURN s.name AS name,
+                   s.classification AS classification
+            ORDER BY toLower(s.name) = $skill_name DESC, size(s.name) ASC
+            LIMIT 1
+            """,
+            skill_name=clean_name
+        )
+        return self._skill_match(rows)
+
     # -------------------------
     # Get Tech Skill Flags
     # -------------------------
@@ -115,7 +242,7 @@ class SkillRepo:
         if not skill_name:
             return {"hot_technology": False, "in_demand": False}
         
-        async with self.driver.session() as session:
+        async with self.driver.session(database=NEO4J_DATABASE) as session:
             result = await session.run(
                 """
                 MATCH (j:Job)-[r:REQUIRES]->(s:Skill {name: $skill_name})
@@ -154,7 +281,7 @@ class SkillRepo:
                 "level_percentile": 50
             }
             
-        async with self.driver.session() as session:
+        async with self.driver.session(database=NEO4J_DATABASE) as session:
             result = await session.run(
                 """
                 MATCH (j:Job)-[r:REQUIRES]->(s:Skill {name: $skill_name})
@@ -223,7 +350,7 @@ class SkillRepo:
                 "jobs_not_requiring": 0
             }
             
-        async with self.driver.session() as session:
+        async with self.driver.session(database=NEO4J_DATABASE) as session:
             # Get total jobs count
             total_result = await session.run(
                 """
@@ -273,7 +400,7 @@ class SkillRepo:
         if not skill_name:
             return []
             
-        async with self.driver.session() as session:
+        async with self.driver.session(database=NEO4J_DATABASE) as session:
             # First, get the total number of jobs that require the target skill
             total_jobs_result = await session.run(
                 """
@@ -366,7 +493,7 @@ class SkillRepo:
             )
             
             skills = []
-            async for record in result:
+            for record in await result.data():
                 classifications = record.get("classification", []) or []
                 skill_type = self._determine_skill_type(classifications)
                 
@@ -464,30 +591,24 @@ class SkillRepo:
         if not skill_name:
             return []
             
-        async with self.driver.session() as session:
-            # First, get the total number of jobs that require the target skill
-            total_jobs_result = await session.run(
+        async with self.driver.session(database=NEO4J_DATABASE) as session:
+            # Jobs requiring the target skill and total jobs overall, in one round trip
+            totals_result = await session.run(
                 """
                 MATCH (j:Job)-[:REQUIRES]->(s:Skill {name: $skill_name})
-                RETURN count(DISTINCT j) AS total_target_jobs
+                WITH count(DISTINCT j) AS total_target_jobs
+                RETURN total_target_jobs,
+                       COUNT { (:Job) } AS total_all_jobs
                 """,
                 skill_name=skill_name
             )
-            total_jobs_record = await total_jobs_result.single()
-            total_target_jobs = total_jobs_record["total_target_jobs"] if total_jobs_record else 0
+            totals_record = await totals_result.single()
+            total_target_jobs = totals_record["total_target_jobs"] if totals_record else 0
             
             if total_target_jobs == 0:
                 return []
             
-            # Also get total jobs overall
-            total_all_jobs_result = await session.run(
-                """
-                MATCH (j:Job)
-                RETURN count(j) AS total_all_jobs
-                """
-            )
-            total_all_jobs_record = await total_all_jobs_result.single()
-            total_all_jobs = total_all_jobs_record["total_all_jobs"] if total_all_jobs_record else 1
+            total_all_jobs = totals_record["total_all_jobs"] or 1
             
             # Use a very high limit to effectively get all skills
             query_limit = 1000
@@ -685,7 +806,7 @@ class SkillRepo:
             )
             
             skills = []
-            async for record in result:
+            for record in await result.data():
                 classifications = record.get("classification", []) or []
                 skill_type = self._determine_skill_type(classifications)
                 
@@ -878,7 +999,7 @@ class SkillRepo:
         # Use a very high limit to get all jobs (assuming max jobs per skill is under 1000)
         query_limit = 1000  # Get up to 1000 jobs (should be enough for all)
             
-        async with self.driver.session() as session:
+        async with self.driver.session(database=NEO4J_DATABASE) as session:
             # First, check if the skill exists and has any jobs
             check_result = await session.run(
                 """
@@ -912,7 +1033,7 @@ class SkillRepo:
             )
             
             jobs = []
-            async for record in result:
+            for record in await result.data():
                 # Scale importance (0-5) to percentage (0-100)
                 importance = record.get("importance")
                 if importance is not None:
@@ -952,7 +1073,8 @@ class SkillRepo:
         self,
         skill_name: str,
         limit: int = 10,
-        include_correlation: bool = False
+        include_correlation: bool = False,
+        co_occurring: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, List]:
         """
         Get data formatted for undirected network graph visualization.
@@ -962,12 +1084,17 @@ class SkillRepo:
             skill_name: Name of the skill
             limit: Maximum number of co-occurring skills to include
             include_correlation: Whether to include correlation data (lift, significance)
+            co_occurring: Already-fetched co-occurring skills (full list, in
+                query order); skips re-running the co-occurrence query
         """
         if not skill_name:
             return {"nodes": [], "links": []}
         
         # Get co-occurring skills - use correlation version if requested
-        if include_correlation:
+        if co_occurring is not None:
+            # Both queries always fetch the full list and slice, so this matches
+            co_occurring = co_occurring[:limit]
+        elif include_correlation:
             co_occurring = await self.get_co_occurring_skills_with_correlation(skill_name, limit)
         else:
             co_occurring = await self.get_co_occurring_skills(skill_name, limit)
@@ -1054,13 +1181,9 @@ class SkillRepo:
         if not skill_name:
             return None
             
-        # First, get skill by exact name
-        skill = await self.get_skill_by_exact_name(skill_name)
-        
-        if not skill:
-            # Try partial match as fallback
-            skill = await self.get_skill_by_name(skill_name)
-            
+        # Exact name first, partial match as fallback (one round-trip)
+        skill = await self.resolve_skill(skill_name)
+
         if not skill:
             return None
         
@@ -1082,14 +1205,11 @@ class SkillRepo:
                 co_occurring_task = self.get_co_occurring_skills(skill_name, limit=None)
                 correlations_task = None
             
-            network_graph_task = self.get_skill_network_graph(
-                skill_name, 10, include_correlation=include_correlations
-            )
             # Get ALL jobs from Neo4j
             top_jobs_task = self.get_top_jobs_for_skill(skill_name, limit=1000)
             
-            # Gather tasks
-            tasks = [metrics_task, usage_task, tech_flags_task, co_occurring_task, network_graph_task, top_jobs_task]
+            # Gather tasks (the network graph is built from co_occurring below)
+            tasks = [metrics_task, usage_task, tech_flags_task, co_occurring_task, top_jobs_task]
             if correlations_task:
                 tasks.append(correlations_task)
             
@@ -1099,9 +1219,8 @@ class SkillRepo:
             usage = results[1]
             tech_flags = results[2]
             co_occurring = results[3]
-            network_graph = results[4]
-            top_jobs = results[5]
-            correlations = results[6] if len(results) > 6 else None
+            top_jobs = results[4]
+            correlations = results[5] if len(results) > 5 else None
             
             # Handle any exceptions
             if isinstance(metrics, Exception):
@@ -1131,9 +1250,9 @@ class SkillRepo:
                 print(f"Error getting co-occurring: {co_occurring}")
                 co_occurring = []
             
-            if isinstance(network_graph, Exception):
-                print(f"Error getting network graph: {network_graph}")
-                network_graph = {"nodes": [], "links": []}
+            network_graph = await self.get_skill_network_graph(
+                skill_name, 10, include_correlation=include_correlations, co_occurring=co_occurring
+            )
             
             if isinstance(top_jobs, Exception):
                 print(f"Error getting top jobs: {top_jobs}")
@@ -1208,8 +1327,7 @@ class SkillRepo:
             ]
             
             # Generate skill ID
-            skill_id = re.sub(r'[^a-zA-Z0-9]', '_', skill_name.lower())
-            skill_id = re.sub(r'_+', '_', skill_id).strip('_')
+            skill_id = detail_skill_id(skill_name)
             
             # Build response
             response = {
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, AsyncGenerator
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, Tuple
+from fastapi import Depends
+
 from app.database.mongodb import get_mongo_db
 from app.database.neo4j import get_neo4j_driver as _get_neo4j_driver
+from app.api.crud.home_repo import HomeRepo
+from app.api.crud.industries_repo import IndustryRepo
+from app.api.crud.jobs_repo import JobsRepo
+from app.api.crud.job_detail_repo import JobDetailRepo
+from app.api.crud.skill_repo import SkillRepo
 
 if TYPE_CHECKING:
     from motor.core import AgnosticDatabase
@@ -25,7 +32,49 @@ async def get_neo4j_driver() -> "AsyncDriver":
     FastAPI dependency: returns the Neo4j driver instance.
     The driver is managed by the app lifespan.
     """
-    driver = _get_neo4j_driver()
+    driver = await _get_neo4j_driver()
     if driver is None:
         raise RuntimeError("Neo4j driver is not initialized. It may not have been set up in the app lifespan.")
-    return driver
\ No newline at end of file
+    return driver
+
+
+# (repo class, id(db)) -> repo instance. The Motor database object lives for
+# the whole process, so one repo per class is reused across requests.
+_repos: Dict[Tuple[type, int], Any] = {}
+
+
+def _repo_for(cls: type, db: "AgnosticDatabase") -> Any:
+    key = (cls, id(db))
+    repo = _repos.get(key)
+    if repo is None or repo.db is not db:
+        repo = _repos[key] = cls(db)
+    return repo
+
+
+def get_home_repo(db: "AgnosticDatabase" = Depends(get_db)) -> HomeRepo:
+    """FastAPI dependency: shared HomeRepo bound to the app database."""
+    return _repo_for(HomeRepo, db)
+
+
+def get_industry_repo(db: "AgnosticDatabase" = Depends(get_db)) -> IndustryRepo:
+    """FastAPI dependency: shared IndustryRepo bound to the app database."""
+    return _repo_for(IndustryRepo, db)
+
+
+def get_jobs_repo(db: "AgnosticDatabase" = Depends(get_db)) -> JobsRepo:
+    """FastAPI dependency: shared JobsRepo bound to the app database."""
+    return _repo_for(JobsRepo, db)
+
+
+def get_job_detail_repo(db: "AgnosticDatabase" = Depends(get_db)) -> JobDetailRepo:
+    """FastAPI dependency: shared JobDetailRepo bound to the app database."""
+    return _repo_for(JobDetailRepo, db)
+
+
+async def get_skill_repo(driver: "AsyncDriver" = Depends(get_neo4j_driver)) -> SkillRepo:
+    """FastAPI dependency: shared SkillRepo bound to the Neo4j driver."""
+    key = (SkillRepo, id(driver))
+    repo = _repos.get(key)
+    if repo is None or repo.driver is not driver:
+        repo = _repos[key] = SkillRepo(driver)
+    return repo
@@ -8,6 +8,7 @@ from app.api.routers.forecast import router as forecast_router  # Add this
 from app.api.routers.home import router as home_router
 from app.api.routers.salary_employment import router as salary_employment_router
 from app.api.routers.search import router as search_router
+from app.api.routers.admin import router as admin_router
 
 
 print("✅ Imported industries router")
@@ -25,6 +26,7 @@ router.include_router(forecast_router)  # Add this
 router.include_router(home_router)
 router.include_router(salary_employment_router)
 router.include_router(search_router)
+router.include_router(admin_router)
 
 
 print(f"✅ Total routes after including: {len(router.routes)}")  # Debug line
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, Header, HTTPException, Query
+
+from app.services.invalidation import invalidate_tag
+
+load_dotenv()
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+# Admin endpoints are disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def _check_token(token: Optional[str]):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if token != ADMIN_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.post("/cache/invalidate")
+async def invalidate_cache(
+    tag: str = Query(..., min_length=1, description='e.g. "bls_oews", "bls_oews:2024", "onet:15-1252"'),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """Drop every cached response registered under `tag` (for ETL reloads)."""
+    _check_token(x_admin_token)
+    count = await invalidate_tag(tag)
+    return {"tag": tag, "invalidated": count}
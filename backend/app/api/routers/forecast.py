@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from typing import Optional, TYPE_CHECKING
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 
 from app.api.dependencies import get_db
 from app.api.crud.forecast_repo import ForecastRepo
 from app.models.forecast_models import ForecastResponse
-from app.services.cache import cache
+from app.services.http_cache import cached_json_response
+from app.services.invalidation import BLS_OEWS_TAG
 
 if TYPE_CHECKING:
     from motor.core import AgnosticDatabase
@@ -17,9 +18,10 @@ router = APIRouter(prefix="/forecast", tags=["forecast"])
 
 @router.get("/", response_model=ForecastResponse)
 async def get_forecast(
+    request: Request,
     year: int = Query(2025, description="Forecast year (2025-2028)"),
     db: "AgnosticDatabase" = Depends(get_db),
-) -> ForecastResponse:
+) -> Response:
     """Get complete forecast dashboard for specified year"""
     
     if year < 2025 or year > 2028:
@@ -28,61 +30,57 @@ async def get_forecast(
             detail="Forecast year must be between 2025 and 2028"
         )
     
-    # Check cache
     cache_key = f"forecast_complete_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return ForecastResponse(**cached)
-    
-    repo = ForecastRepo(db)
-    forecast_data = await repo.get_complete_forecast(year)
-    
-    response = ForecastResponse(**forecast_data)
-    cache.set(cache_key, response.dict())
-    
-    return response
+
+    async def build():
+        repo = ForecastRepo(db)
+        forecast_data = await repo.get_complete_forecast(year)
+
+        response = ForecastResponse(**forecast_data)
+        return response.model_dump(mode="json")
+
+    return await cached_json_response(request, cache_key, build, tags=(BLS_OEWS_TAG,))
 
 
 @router.get("/industries")
 async def forecast_industries(
+    request: Request,
     limit: int = Query(6, ge=1, le=20),
     forecast_years: int = Query(4, ge=1, le=5),
     db: "AgnosticDatabase" = Depends(get_db),
 ):
     """Get forecasts for top industries"""
     cache_key = f"forecast_industries_{limit}_{forecast_years}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = ForecastRepo(db)
-    forecasts = await repo.forecast_top_industries(limit, forecast_years)
-    
-    cache.set(cache_key, forecasts)
-    return forecasts
+
+    async def build():
+        repo = ForecastRepo(db)
+        forecasts = await repo.forecast_top_industries(limit, forecast_years)
+        return forecasts
+
+    return await cached_json_response(request, cache_key, build, tags=(BLS_OEWS_TAG,))
 
 
 @router.get("/jobs")
 async def forecast_jobs(
+    request: Request,
     limit: int = Query(8, ge=1, le=20),
     forecast_years: int = Query(4, ge=1, le=5),
     db: "AgnosticDatabase" = Depends(get_db),
 ):
     """Get forecasts for top jobs"""
     cache_key = f"forecast_jobs_{limit}_{forecast_years}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = ForecastRepo(db)
-    forecasts = await repo.forecast_top_jobs(limit, forecast_years)
-    
-    cache.set(cache_key, forecasts)
-    return forecasts
+
+    async def build():
+        repo = ForecastRepo(db)
+        forecasts = await repo.forecast_top_jobs(limit, forecast_years)
+        return forecasts
+
+    return await cached_json_response(request, cache_key, build, tags=(BLS_OEWS_TAG,))
 
 
 @router.get("/industry/{naics}")
 async def forecast_single_industry(
+    request: Request,
     naics: str,
     industry_title: Optional[str] = None,
     forecast_years: int = Query(4, ge=1, le=5),
@@ -90,26 +88,26 @@ async def forecast_single_industry(
 ):
     """Get forecast for a specific industry"""
     cache_key = f"forecast_industry_{naics}_{forecast_years}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = ForecastRepo(db)
-    
-    if not industry_title:
-        # Get title from industries repo
-        from app.api.crud.industries_repo import IndustryRepo
-        ind_repo = IndustryRepo(db)
-        industry_title = await ind_repo.get_naics_title(naics, 2024)
-    
-    forecast = await repo.forecast_industry(naics, industry_title, forecast_years)
-    
-    cache.set(cache_key, forecast)
-    return forecast
+
+    async def build():
+        repo = ForecastRepo(db)
+
+        title = industry_title
+        if not title:
+            # Get title from industries repo
+            from app.api.crud.industries_repo import IndustryRepo
+            ind_repo = IndustryRepo(db)
+            title = await ind_repo.get_naics_title(naics, 2024)
+
+        forecast = await repo.forecast_industry(naics, title, forecast_years)
+        return forecast
+
+    return await cached_json_response(request, cache_key, build, tags=(BLS_OEWS_TAG,))
 
 
 @router.get("/job/{occ_code}")
 async def forecast_single_job(
+    request: Request,
     occ_code: str,
     job_title: Optional[str] = None,
     forecast_years: int = Query(4, ge=1, le=5),
@@ -117,19 +115,18 @@ async def forecast_single_job(
 ):
     """Get forecast for a specific job"""
     cache_key = f"forecast_job_{occ_code}_{forecast_years}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = ForecastRepo(db)
-    
-    if not job_title:
-        # Get title from jobs repo
-        from app.api.crud.jobs_repo import JobsRepo
-        job_repo = JobsRepo(db)
-        job_title = await job_repo.get_job_title(occ_code, 2024)
-    
-    forecast = await repo.forecast_job(occ_code, job_title, forecast_years)
-    
-    cache.set(cache_key, forecast)
-    return forecast
\ No newline at end of file
+
+    async def build():
+        repo = ForecastRepo(db)
+
+        title = job_title
+        if not title:
+            # Get title from jobs repo
+            from app.api.crud.jobs_repo import JobsRepo
+            job_repo = JobsRepo(db)
+            title = await job_repo.get_job_title(occ_code, 2024)
+
+        forecast = await repo.forecast_job(occ_code, title, forecast_years)
+        return forecast
+
+    return await cached_json_response(request, cache_key, build, tags=(BLS_OEWS_TAG,))
@@ -1,135 +1,168 @@
 # app/api/routers/home.py
 from __future__ import annotations
 
-from typing import Optional, TYPE_CHECKING
-from fastapi import APIRouter, Depends, Query, HTTPException
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 
-from app.api.dependencies import get_db
+from app.api.dependencies import get_home_repo, get_industry_repo, get_jobs_repo
 from app.api.crud.home_repo import HomeRepo
+from app.api.crud.industries_repo import IndustryRepo
+from app.api.crud.jobs_repo import JobsRepo
 from app.models.home_models import (
+    HomeDashboardResponse,
     HomeOverviewResponse,
     MarketTickerResponse,
-    MarketTickerItem,
 )
-from app.services.cache import cache
-
-if TYPE_CHECKING:
-    from motor.core import AgnosticDatabase
+from app.models.industry_models import industry_dashboard_metrics
+from app.services.http_cache import cached_json_response
+from app.services.invalidation import BLS_OEWS_TAG, bls_oews_tags
 
 router = APIRouter(prefix="/home", tags=["Home"])
 
 
+def _trend_dir(v: float, _lut=("down", "neutral", "up")) -> str:
+    return _lut[(v > 0) - (v < 0) + 1]
+
+
+def _sub(data: dict, key: str) -> dict:
+    return data.get(key) or {}
+
+
+# Pre-bound formatters used by the ticker spec
+_PCT = "{:+.1f}%".format
+_USD = "${:d}".format
+_INT = "{:d}".format
+
+
+# (name, value, trend) per ticker item, each read from HomeRepo.market_ticker()
+_TICKER_SPEC = (
+    (
+        lambda d: "Median Salary",
+        lambda d: _USD(int(round(d["median_salary"]))),
+        lambda d: _trend_dir(d["salary_trend_pct"]),
+    ),
+    (
+        lambda d: "Salary YoY",
+        lambda d: _PCT(d["salary_trend_pct"]),
+        lambda d: _trend_dir(d["salary_trend_pct"]),
+    ),
+    (
+        lambda d: _sub(d, "top_growing_industry").get("name", "Top Growing Industry"),
+        lambda d: _PCT(_sub(d, "top_growing_industry").get("trend_pct", 0)),
+        lambda d: _trend_dir(_sub(d, "top_growing_industry").get("trend_pct", 0)),
+    ),
+    (
+        lambda d: _sub(d, "top_growing_occupation").get("name", "Top Growing Occupation"),
+        lambda d: _PCT(_sub(d, "top_growing_occupation").get("trend_pct", 0)),
+        lambda d: _trend_dir(_sub(d, "top_growing_occupation").get("trend_pct", 0)),
+    ),
+    (
+        lambda d: "Top Tech Skill",
+        lambda d: str(_sub(d, "top_tech_skill").get("name", "")) if d.get("top_tech_skill") else "N/A",
+        lambda d: "neutral",
+    ),
+    (
+        lambda d: _sub(d, "largest_occupation").get("name", "Highest Employment Occupation"),
+        lambda d: _INT(int(round(_sub(d, "largest_occupation").get("employment", 0)))),
+        lambda d: "neutral",
+    ),
+    (
+        lambda d: "Hot Tech Count",
+        lambda d: _INT(int(d.get("hot_tech_count", 0))),
+        lambda d: "neutral",
+    ),
+)
+
+
 @router.get("/overview", response_model=HomeOverviewResponse)
 async def home_overview(
+    request: Request,
     year: Optional[int] = Query(None),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> HomeOverviewResponse:
-    # Check cache
-    cache_key = f"home_overview_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return HomeOverviewResponse(**cached)
-    
-    repo = HomeRepo(db)
-    
-    # If year is None, get the latest year
-    if year is None:
-        year = await repo.latest_year()
-    
-    data = await repo.overview(year)
-    
-    response = HomeOverviewResponse(**data)
-    cache.set(cache_key, response.dict())
-    return response
+    repo: HomeRepo = Depends(get_home_repo),
+) -> Response:
+    cache_key = f"home_overview_v2_{year}"
+
+    async def build():
+        # If year is None, get the latest year
+        y = year if year is not None else await repo.latest_year()
+        data = await repo.overview(y)
+        return HomeOverviewResponse(**data).model_dump(mode="json")
+
+    return await cached_json_response(request, cache_key, build, tags=bls_oews_tags(year))
 
 
 @router.get("/market-ticker", response_model=MarketTickerResponse)
 async def market_ticker(
+    request: Request,
     year: Optional[int] = Query(None),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> MarketTickerResponse:
+    repo: HomeRepo = Depends(get_home_repo),
+) -> Response:
     cache_key = f"home_market_ticker_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return MarketTickerResponse(**cached)
-
-    repo = HomeRepo(db)
-    data = await repo.market_ticker(year)
-
-    def trend_dir(v: float) -> str:
-        if v > 0:
-            return "up"
-        if v < 0:
-            return "down"
-        return "neutral"
-
-    items = []
-    items.append(
-        MarketTickerItem(
-            name="Median Salary",
-            value=f"${int(round(data['median_salary']))}",
-            trend=trend_dir(data["salary_trend_pct"]),
-        )
-    )
-    items.append(
-        MarketTickerItem(
-            name="Salary YoY",
-            value=f"{data['salary_trend_pct']:+.1f}%",
-            trend=trend_dir(data["salary_trend_pct"]),
-        )
-    )
-
-    top_ind = data.get("top_growing_industry") or {}
-    items.append(
-        MarketTickerItem(
-            name=top_ind.get("name", "Top Growing Industry"),
-            value=f"{top_ind.get('trend_pct', 0):+.1f}%",
-            trend=trend_dir(top_ind.get("trend_pct", 0)),
-        )
-    )
-
-    top_occ = data.get("top_growing_occupation") or {}
-    items.append(
-        MarketTickerItem(
-            name=top_occ.get("name", "Top Growing Occupation"),
-            value=f"{top_occ.get('trend_pct', 0):+.1f}%",
-            trend=trend_dir(top_occ.get("trend_pct", 0)),
-        )
-    )
-
-    top_skill = data.get("top_tech_skill") or {}
-    if top_skill:
-        items.append(
-            MarketTickerItem(
-                name="Top Tech Skill",
-                value=f"{top_skill.get('name', '')}",
-                trend="neutral",
-            )
-        )
-    else:
-        items.append(MarketTickerItem(name="Top Tech Skill", value="N/A", trend="neutral"))
-
-    large_occ = data.get("largest_occupation") or {}
-    items.append(
-        MarketTickerItem(
-            name=large_occ.get("name", "Highest Employment Occupation"),
-            value=str(int(round(large_occ.get("employment", 0)))),
-            trend="neutral",
-        )
-    )
 
-    items.append(
-        MarketTickerItem(
-            name="Hot Tech Count",
-            value=str(int(data.get("hot_tech_count", 0))),
-            trend="neutral",
+    async def build():
+        data = await repo.market_ticker(year)
+        items = [
+            {"name": name(data), "value": value(data), "trend": trend(data)}
+            for name, value, trend in _TICKER_SPEC
+        ]
+        return {"year": data["year"], "items": items}
+
+    return await cached_json_response(request, cache_key, build, tags=bls_oews_tags(year))
+
+
+@router.get("/dashboard", response_model=HomeDashboardResponse)
+async def home_dashboard(
+    request: Request,
+    year: int = Query(...),
+    trends_from: int = Query(2011),
+    ind_repo: IndustryRepo = Depends(get_industry_repo),
+    jobs_repo: JobsRepo = Depends(get_jobs_repo),
+) -> Response:
+    """
+    Aggregate of the six requests the home page used to make separately
+    (industry metrics/list/top/top-trends, jobs top/metrics). Each part is
+    validated against its standalone endpoint's response model before caching.
+    """
+    cache_key = f"home_dashboard_v2_{year}_{trends_from}"
+
+    async def build():
+        (
+            ind_metrics,
+            (list_year, industries),
+            top_inds,
+            trends,
+            top_jobs,
+            job_metrics,
+        ) = await asyncio.gather(
+            ind_repo.dashboard_metrics(year),
+            ind_repo.list_industries(year),
+            ind_repo.top_industries_with_growth(year=year, limit=20),
+            ind_repo.top_industries_trends(year_from=trends_from, year_to=year, limit=10),
+            jobs_repo.top_jobs_with_growth(year=year, limit=10),
+            jobs_repo.dashboard_metrics(year),
         )
-    )
-
-    response = MarketTickerResponse(year=data["year"], items=items)
-    cache.set(cache_key, response.dict())
-    return response
-
 
-# Remove or comment out endpoints that don't exist in HomeRepo
-# The employment_trends endpoint doesn't exist in HomeRepo
\ No newline at end of file
+        payload = {
+            "year": year,
+            "industry_metrics": industry_dashboard_metrics(ind_metrics),
+            "industries": {"year": list_year, "count": len(industries), "industries": industries},
+            "top_industries": {"year": year, "by": "employment", "limit": 20, "industries": top_inds},
+            "industry_trends": {
+                "year_from": min(trends_from, year),
+                "year_to": max(trends_from, year),
+                "limit": 10,
+                "series": trends,
+            },
+            "top_jobs": {
+                "year": year,
+                "by": "employment",
+                "limit": 10,
+                "group": None,
+                "jobs": top_jobs,
+            },
+            "job_metrics": job_metrics,
+        }
+        return HomeDashboardResponse.model_validate(payload).model_dump(mode="json")
+
+    return await cached_json_response(request, cache_key, build, tags=(BLS_OEWS_TAG,))
@@ -1,352 +1,349 @@
 from __future__ import annotations
 
-from typing import Optional, TYPE_CHECKING, Literal
+from typing import Optional, Literal, Tuple
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+import orjson
 
-from app.api.dependencies import get_db
+from app.api.dependencies import get_industry_repo
 from app.api.crud.industries_repo import IndustryRepo
 from app.models.industry_models import (
-    IndustryCard,
     IndustryListResponse,
-    IndustryItem,
     IndustryDashboardMetrics,
     IndustryTopJobsResponse,
     IndustryTopJobResponse,
     IndustryJobsResponse,
+    page_count,
     IndustryDetailMetrics,
     IndustrySummaryResponse,
     IndustryTopResponse,
-    IndustryYearPoint,
     JobDetail,
-    TopGrowingIndustry,
+    industry_dashboard_metrics,
     IndustryTopTrendsResponse,
-    IndustryTrendSeries,
     IndustryCompositionResponse,
-    IndustryTrendPoint,
-    IndustryCompositionRow,
     IndustryTopOccCompositionResponse,
 )
-from app.services.cache import cache
-
-if TYPE_CHECKING:
-    from motor.core import AgnosticDatabase
+from app.services.cache import cache, make_key
+from app.services.http_cache import CACHE_CONTROL, cached_json_response
+from app.services.invalidation import BLS_OEWS_TAG, bls_oews_tags
 
 router = APIRouter(prefix="/industries", tags=["industries"])
 
+# Endpoints below serve the cached payload bytes as-is (with ETag/Cache-Control).
+# The repo layer guarantees the row shape, so per-row Pydantic construction
+# is skipped; response_model stays only to document the schema in OpenAPI.
+
+# Above this many rows a cold /{naics}/top-jobs streams its body from the
+# cursor instead of building the whole list first; the result is then cached.
+_STREAM_THRESHOLD = 200
+
 
 @router.get("/", response_model=IndustryListResponse)
 async def list_industries(
+    request: Request,
     year: Optional[int] = Query(None, description="If omitted, uses latest year in bls_oews"),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustryListResponse:
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
     cache_key = f"industries_list_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryListResponse(**cached)
-    
-    repo = IndustryRepo(db)
-    y, industries = await repo.list_industries(year)
-
-    if not industries:
-        raise HTTPException(status_code=404, detail="No industries found")
-
-    response = IndustryListResponse(
-        year=y,
-        count=len(industries),
-        industries=[IndustryItem(**i) for i in industries],
-    )
-    
-    cache.set(cache_key, response.dict())
-    return response
+
+    async def build():
+        y, industries = await repo.list_industries(year)
+
+        if not industries:
+            raise HTTPException(status_code=404, detail="No industries found")
+
+        response = {
+            "year": y,
+            "count": len(industries),
+            "industries": industries,
+        }
+        return response
+
+    return await cached_json_response(request, cache_key, build, tags=bls_oews_tags(year))
 
 
 @router.get("/metrics/{year}", response_model=IndustryDashboardMetrics)
 async def dashboard_metrics(
+    request: Request,
     year: int,
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustryDashboardMetrics:
-    cache_key = f"industry_metrics_v3_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryDashboardMetrics(**cached)
-    
-    repo = IndustryRepo(db)
-    data = await repo.dashboard_metrics(year)
-
-    top = data.get("top_growing_industry")
-    top_obj = TopGrowingIndustry(**top) if top else None
-
-    response = IndustryDashboardMetrics(
-        year=data["year"],
-        total_industries=data["total_industries"],
-        total_employment=data["total_employment"],
-        avg_industry_growth_pct=data["avg_industry_growth_pct"],
-        top_growing_industry=top_obj,
-        median_industry_salary=data["median_industry_salary"],
-    )
-    
-    cache.set(cache_key, response.dict())
-    return response
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
+    cache_key = f"industry_metrics_v4_{year}"
+
+    async def build():
+        data = await repo.dashboard_metrics(year)
+        return industry_dashboard_metrics(data).model_dump(mode="json")
+
+    return await cached_json_response(request, cache_key, build, tags=bls_oews_tags(year))
 
 
 @router.get("/top", response_model=IndustryTopResponse)
 async def top_industries(
+    request: Request,
     year: int = Query(...),
     limit: int = Query(6, ge=1, le=1000),
     by: str = Query("employment", pattern="^(employment|salary)$"),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustryTopResponse:
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
     cache_key = f"industries_top_{year}_{limit}_{by}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryTopResponse(**cached)
-    
-    repo = IndustryRepo(db)
-
-    if by == "salary":
-        rows = await repo.top_industries(year=year, limit=limit, by="salary")
-        response = IndustryTopResponse(year=year, by=by, limit=limit, industries=[IndustryCard(**r) for r in rows])
-    else:
-        rows = await repo.top_industries_with_growth(year=year, limit=limit)
-        response = IndustryTopResponse(year=year, by=by, limit=limit, industries=[IndustryCard(**r) for r in rows])
-    
-    cache.set(cache_key, response.dict())
-    return response
+
+    async def build():
+
+        if by == "salary":
+            rows = await repo.top_industries(year=year, limit=limit, by="salary")
+            for r in rows:
+                r.setdefault("growth_pct", None)
+        else:
+            rows = await repo.top_industries_with_growth(year=year, limit=limit)
+
+        response = {"year": year, "by": by, "limit": limit, "industries": rows}
+        return response
+
+    return await cached_json_response(request, cache_key, build, tags=bls_oews_tags(year))
 
 
 @router.get("/top-trends", response_model=IndustryTopTrendsResponse)
 async def top_industries_trends(
+    request: Request,
     year_from: int = Query(2019),
     year_to: int = Query(2024),
     limit: int = Query(10, ge=1, le=20),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustryTopTrendsResponse:
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
     cache_key = f"industries_trends_{year_from}_{year_to}_{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryTopTrendsResponse(**cached)
-    
-    repo = IndustryRepo(db)
-    series = await repo.top_industries_trends(year_from=year_from, year_to=year_to, limit=limit)
-
-    response = IndustryTopTrendsResponse(
-        year_from=min(year_from, year_to),
-        year_to=max(year_from, year_to),
-        limit=limit,
-        series=[
-            IndustryTrendSeries(
-                naics=s["naics"],
-                naics_title=s["naics_title"],
-                points=[IndustryTrendPoint(**p) for p in s["points"]],
-            )
-            for s in series
-        ],
-    )
-    
-    cache.set(cache_key, response.dict())
-    return response
+
+    async def build():
+        series = await repo.top_industries_trends(year_from=year_from, year_to=year_to, limit=limit)
+
+        response = {
+            "year_from": min(year_from, year_to),
+            "year_to": max(year_from, year_to),
+            "limit": limit,
+            "series": series,
+        }
+        return response
+
+    return await cached_json_response(request, cache_key, build, tags=(BLS_OEWS_TAG,))
 
 
 @router.get("/composition", response_model=IndustryCompositionResponse)
 async def industry_composition(
+    request: Request,
     year: int = Query(...),
     limit: int = Query(6, ge=1, le=20),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustryCompositionResponse:
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
     cache_key = f"industries_composition_{year}_{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryCompositionResponse(**cached)
-    
-    repo = IndustryRepo(db)
-    rows = await repo.composition_by_industry(year=year, limit=limit)
-
-    response = IndustryCompositionResponse(
-        year=year,
-        limit=limit,
-        rows=[IndustryCompositionRow(**r) for r in rows],
-    )
-    
-    cache.set(cache_key, response.dict())
-    return response
+
+    async def build():
+        rows = await repo.composition_by_industry(year=year, limit=limit)
+
+        response = {"year": year, "limit": limit, "rows": rows}
+        return response
+
+    return await cached_json_response(request, cache_key, build, tags=bls_oews_tags(year))
 
 
 @router.get("/composition-top-occupations", response_model=IndustryTopOccCompositionResponse)
 async def composition_top_occupations(
+    request: Request,
     year: int = Query(...),
     industries_limit: int = Query(6, ge=1, le=50),
     top_n_occ: int = Query(3, ge=1, le=10),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustryTopOccCompositionResponse:
-    cache_key = f"industries_top_occ_{year}_{industries_limit}_{top_n_occ}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryTopOccCompositionResponse(**cached)
-    
-    repo = IndustryRepo(db)
-
-    data = await repo.top_occupations_composition(
-        year=year,
-        industries_limit=industries_limit,
-        top_n_occ=top_n_occ,
-    )
-
-    response = IndustryTopOccCompositionResponse(
-        year=year,
-        industries_limit=industries_limit,
-        top_n_occ=top_n_occ,
-        rows=data.get("rows", []),
-        legend=data.get("legend", []),
-    )
-    
-    cache.set(cache_key, response.dict())
-    return response
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
+    cache_key = f"industries_top_occ_v2_{year}_{industries_limit}_{top_n_occ}"
+
+    async def build():
+
+        data = await repo.top_occupations_composition(
+            year=year,
+            industries_limit=industries_limit,
+            top_n_occ=top_n_occ,
+        )
+
+        response = IndustryTopOccCompositionResponse(
+            year=year,
+            industries_limit=industries_limit,
+            top_n_occ=top_n_occ,
+            rows=data.get("rows", []),
+            legend=data.get("legend", []),
+        )
+        return response.model_dump(mode="json")
+
+    return await cached_json_response(request, cache_key, build, tags=bls_oews_tags(year))
+
+
+async def _stream_top_jobs(
+    repo: IndustryRepo, naics: str, year: int, limit: int, cache_key: str, tags: Tuple[str, ...]
+) -> StreamingResponse:
+    """
+    Stream the top-jobs JSON object row by row straight from the Motor cursor.
+    Once fully sent, the payload is cached under cache_key so later calls get
+    the cached path (with ETag) instead of another cursor walk.
+    """
+    rows = repo.iter_jobs_in_industry(naics, year, limit)
+    first = await anext(rows, None)
+    if first is None:
+        raise HTTPException(status_code=404, detail=f"No jobs found for naics={naics} in {year}")
+
+    naics_title, first_job = first
+    if not naics_title:
+        naics_title = await repo.get_naics_title(naics, year)
+
+    head = orjson.dumps({"naics": naics, "naics_title": naics_title, "year": year, "limit": limit})
+
+    async def body():
+        # Same object the cached path returns, with "jobs" emitted incrementally
+        jobs = [first_job]
+        yield head[:-1] + b',"jobs":[' + orjson.dumps(first_job)
+        async for _, job in rows:
+            jobs.append(job)
+            yield b"," + orjson.dumps(job)
+        yield b"]}"
+        payload = {"naics": naics, "naics_title": naics_title, "year": year, "limit": limit, "jobs": jobs}
+        await cache.put(cache_key, payload, tags=tags)
+
+    return StreamingResponse(body(), media_type="application/json", headers={"Cache-Control": CACHE_CONTROL})
 
 
 @router.get("/{naics}/top-jobs", response_model=IndustryTopJobsResponse)
 async def top_jobs(
+    request: Request,
     naics: str,
     year: int = Query(...),
     limit: int = Query(6, ge=1, le=2000),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustryTopJobsResponse:
-    cache_key = f"industries_onet_v2_{naics}_top_jobs_{year}_{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryTopJobsResponse(**cached)
-    
-    repo = IndustryRepo(db)
-    naics_title, rows = await repo.top_jobs_in_industry(naics, year, limit)
-
-    if not rows:
-        raise HTTPException(status_code=404, detail=f"No jobs found for naics={naics} in {year}")
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
+    cache_key = make_key("industries_top_jobs", naics=naics, year=year, limit=limit)
+    tags = bls_oews_tags(year)
+    if limit > _STREAM_THRESHOLD and (await cache.mget([cache_key]))[0] is None:
+        return await _stream_top_jobs(repo, naics, year, limit, cache_key, tags)
+
+    async def build():
+        naics_title, rows = await repo.top_jobs_in_industry(naics, year, limit)
+
+        if not rows:
+            raise HTTPException(status_code=404, detail=f"No jobs found for naics={naics} in {year}")
+
+        response = {
+            "naics": naics,
+            "naics_title": naics_title,
+            "year": year,
+            "limit": limit,
+            "jobs": rows,
+        }
+        return response
 
-    response = IndustryTopJobsResponse(
-        naics=naics,
-        naics_title=naics_title,
-        year=year,
-        limit=limit,
-        jobs=[JobDetail(**r) for r in rows],
-    )
-    
-    cache.set(cache_key, response.dict())
-    return response
+    return await cached_json_response(request, cache_key, build, tags=tags)
 
 
 @router.get("/{naics}/top-job", response_model=IndustryTopJobResponse)
 async def top_job(
+    request: Request,
     naics: str,
     year: int = Query(...),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustryTopJobResponse:
-    cache_key = f"industries_onet_v2_{naics}_top_job_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryTopJobResponse(**cached)
-    
-    repo = IndustryRepo(db)
-    naics_title, row = await repo.top_job_in_industry(naics, year)
-
-    job = JobDetail(**row) if row else None
-
-    response = IndustryTopJobResponse(
-        naics=naics,
-        naics_title=naics_title,
-        year=year,
-        job=job,
-    )
-    
-    cache.set(cache_key, response.dict())
-    return response
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
+    cache_key = f"industries_onet_v3_{naics}_top_job_{year}"
+
+    async def build():
+        naics_title, row = await repo.top_job_in_industry(naics, year)
+
+        job = JobDetail(**row) if row else None
+
+        response = IndustryTopJobResponse(
+            naics=naics,
+            naics_title=naics_title,
+            year=year,
+            job=job,
+        )
+        return response.model_dump(mode="json")
+
+    return await cached_json_response(request, cache_key, build, tags=bls_oews_tags(year))
 
 
 @router.get("/{naics}/jobs", response_model=IndustryJobsResponse)
 async def jobs(
+    request: Request,
     naics: str,
     year: int = Query(...),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=200),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustryJobsResponse:
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
     cache_key = f"industries_onet_v2_{naics}_jobs_{year}_{page}_{page_size}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryJobsResponse(**cached)
-    
-    repo = IndustryRepo(db)
-    
-    # Calculate skip for pagination
-    skip = (page - 1) * page_size
-    
-    rows, total = await repo.jobs_in_industry(naics, year, limit=page_size, skip=skip)
-    naics_title = rows[0]["naics_title"] if rows else await repo.get_naics_title(naics, year)
-
-    response = IndustryJobsResponse(
-        naics=naics,
-        naics_title=naics_title,
-        year=year,
-        page=page,
-        page_size=page_size,
-        total=total,
-        jobs=[JobDetail(**r) for r in rows],
-    )
-    
-    cache.set(cache_key, response.dict())
-    return response
+
+    async def build():
+
+        # Calculate skip for pagination
+        skip = (page - 1) * page_size
+
+        naics_title, rows, total = await repo.jobs_in_industry(naics, year, limit=page_size, skip=skip)
+
+        response = {
+            "naics": naics,
+            "naics_title": naics_title,
+            "year": year,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "jobs": rows,
+            "total_pages": page_count(total, page_size),
+        }
+        return response
+
+    return await cached_json_response(request, cache_key, build, tags=bls_oews_tags(year))
 
 
 @router.get("/{naics}/metrics", response_model=IndustryDetailMetrics)
 async def industry_metrics(
+    request: Request,
     naics: str,
     year: int = Query(...),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustryDetailMetrics:
-    cache_key = f"industries_{naics}_metrics_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryDetailMetrics(**cached)
-    
-    repo = IndustryRepo(db)
-    naics_title, total_emp, med_sal = await repo.industry_metrics(naics, year)
-
-    if total_emp == 0:
-        raise HTTPException(status_code=404, detail=f"No data for naics={naics} in {year}")
-
-    response = IndustryDetailMetrics(
-        naics=naics,
-        naics_title=naics_title,
-        year=year,
-        total_employment=total_emp,
-        median_salary=med_sal,
-    )
-    
-    cache.set(cache_key, response.dict())
-    return response
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
+    cache_key = f"industries_{naics}_metrics_v2_{year}"
+
+    async def build():
+        naics_title, total_emp, med_sal = await repo.industry_metrics(naics, year)
+
+        if total_emp == 0:
+            raise HTTPException(status_code=404, detail=f"No data for naics={naics} in {year}")
+
+        response = IndustryDetailMetrics(
+            naics=naics,
+            naics_title=naics_title,
+            year=year,
+            total_employment=total_emp,
+            median_salary=med_sal,
+        )
+        return response.model_dump(mode="json")
+
+    return await cached_json_response(request, cache_key, build, tags=bls_oews_tags(year))
 
 
 @router.get("/{naics}/summary", response_model=IndustrySummaryResponse)
 async def industry_summary(
+    request: Request,
     naics: str,
     year_from: int = Query(2011),
     year_to: int = Query(2024),
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> IndustrySummaryResponse:
+    repo: IndustryRepo = Depends(get_industry_repo),
+) -> Response:
     cache_key = f"industries_{naics}_summary_{year_from}_{year_to}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustrySummaryResponse(**cached)
-    
-    repo = IndustryRepo(db)
-    naics_title, series = await repo.industry_summary(naics, year_from, year_to)
-
-    response = IndustrySummaryResponse(
-        naics=naics,
-        naics_title=naics_title,
-        year_from=min(year_from, year_to),
-        year_to=max(year_from, year_to),
-        series=[IndustryYearPoint(**p) for p in series],
-    )
-    
-    cache.set(cache_key, response.dict())
-    return response
+
+    async def build():
+        naics_title, series = await repo.industry_summary(naics, year_from, year_to)
+
+        response = {
+            "naics": naics,
+            "naics_title": naics_title,
+            "year_from": min(year_from, year_to),
+            "year_to": max(year_from, year_to),
+            "series": series,
+        }
+        return response
+
+    return await cached_json_response(request, cache_key, build, tags=(BLS_OEWS_TAG,))
@@ -1,142 +1,113 @@
 from __future__ import annotations
 
-from typing import Optional, TYPE_CHECKING, List, Dict, Any
+from functools import partial
+from typing import Optional, List, Dict, Any
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 
-from app.api.dependencies import get_db
-from app.api.crud.job_detail_repo import JobDetailRepo
+from app.api.dependencies import get_job_detail_repo
+from app.api.crud.job_detail_repo import JobDetailRepo, is_valid_occ_code
 from app.models.job_detail_models import JobDetailResponse
-from app.services.cache import cache
+from app.services.cache import cache, make_key
+from app.services.http_cache import cached_json_response
+from app.services.invalidation import BLS_OEWS_TAG, onet_tags
 
-if TYPE_CHECKING:
-    from motor.core import AgnosticDatabase
+router = APIRouter(prefix="/job-detail", tags=["job-detail"], default_response_class=ORJSONResponse)
 
-router = APIRouter(prefix="/job-detail", tags=["job-detail"])
+
+async def _job_detail_payload(occ_code: str, repo: JobDetailRepo, fetch=cache.get_or_set):
+    """
+    Cached JobDetailResponse payload for occ_code; 404 if the job is unknown.
+    `fetch` picks the form: the dict (get_or_set) or a ready HTTP response.
+    """
+    # Reject malformed codes before touching cache or Mongo
+    if not is_valid_occ_code(occ_code):
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Job not found for occ_code={occ_code}"
+        )
+
+    cache_key = make_key("job_detail", occ_code=occ_code)
+
+    async def build():
+        data = await repo.get_complete_job_detail(occ_code)
+
+        if not data.get("basic_info", {}).get("occ_title"):
+            raise HTTPException(
+                status_code=404, 
+                detail=f"Job not found for occ_code={occ_code}"
+            )
+
+        return JobDetailResponse(**data).model_dump(mode="json")
+
+    # Salary/growth/industry sections come from bls_oews, the rest from O*NET
+    return await fetch(cache_key, build, tags=(BLS_OEWS_TAG, *onet_tags(occ_code)))
+
+
+async def _job_detail_section(occ_code: str, section: str, repo: JobDetailRepo) -> List[Dict[str, Any]]:
+    """
+    One list from the complete job detail. The sub-endpoints slice the same
+    cached payload instead of re-resolving the O*NET code and querying again.
+    """
+    try:
+        payload = await _job_detail_payload(occ_code.strip(), repo)
+    except HTTPException:
+        return []
+    return payload.get(section) or []
 
 
 @router.get("/{occ_code}", response_model=JobDetailResponse)
 async def get_job_detail(
+    request: Request,
     occ_code: str,
-    db: "AgnosticDatabase" = Depends(get_db),
-) -> JobDetailResponse:
+    repo: JobDetailRepo = Depends(get_job_detail_repo),
+) -> Response:
     """Get complete job details from O*NET collections"""
     # URL decode if needed
     occ_code = occ_code.strip()
-    
-    # Check cache
-    cache_key = f"job_detail_{occ_code}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobDetailResponse(**cached)
-    
-    repo = JobDetailRepo(db)
-    
-    data = await repo.get_complete_job_detail(occ_code)
-    
-    if not data.get("basic_info", {}).get("occ_title"):
-        raise HTTPException(
-            status_code=404, 
-            detail=f"Job not found for occ_code={occ_code}"
-        )
-    
-    response = JobDetailResponse(**data)
-    cache.set(cache_key, response.dict())
-    return response
+
+    # Hits go out as the cached bytes; only the miss path builds the model
+    return await _job_detail_payload(occ_code, repo, partial(cached_json_response, request))
 
 
 @router.get("/{occ_code}/skills", response_model=List[Dict[str, Any]])
 async def get_job_skills(
     occ_code: str,
     limit: int = Query(20, ge=1, le=100),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobDetailRepo = Depends(get_job_detail_repo),
 ) -> List[Dict[str, Any]]:
     """Get skills for a specific job"""
-    cache_key = f"job_skills_{occ_code}_{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = JobDetailRepo(db)
-    onet_soc = await repo.get_onet_soc(occ_code)
-    
-    if not onet_soc:
-        return []
-    
-    skills = await repo.get_skills(onet_soc)
-    result = skills[:limit]
-    
-    cache.set(cache_key, result)
-    return result
+    skills = await _job_detail_section(occ_code, "skills", repo)
+    return skills[:limit]
 
 
 @router.get("/{occ_code}/technology-skills", response_model=List[Dict[str, Any]])
 async def get_job_technology_skills(
     occ_code: str,
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobDetailRepo = Depends(get_job_detail_repo),
 ) -> List[Dict[str, Any]]:
     """Get technology skills for a specific job"""
-    cache_key = f"job_tech_skills_{occ_code}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = JobDetailRepo(db)
-    onet_soc = await repo.get_onet_soc(occ_code)
-    
-    if not onet_soc:
-        return []
-    
-    result = await repo.get_technology_skills(onet_soc)
-    cache.set(cache_key, result)
-    return result
+    return await _job_detail_section(occ_code, "tech_skills", repo)
 
 
 @router.get("/{occ_code}/abilities", response_model=List[Dict[str, Any]])
 async def get_job_abilities(
     occ_code: str,
     limit: int = Query(10, ge=1, le=50),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobDetailRepo = Depends(get_job_detail_repo),
 ) -> List[Dict[str, Any]]:
     """Get abilities for a specific job"""
-    cache_key = f"job_abilities_{occ_code}_{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = JobDetailRepo(db)
-    onet_soc = await repo.get_onet_soc(occ_code)
-    
-    if not onet_soc:
-        return []
-    
-    abilities = await repo.get_abilities(onet_soc)
-    result = abilities[:limit]
-    
-    cache.set(cache_key, result)
-    return result
+    abilities = await _job_detail_section(occ_code, "abilities", repo)
+    return abilities[:limit]
 
 
 @router.get("/{occ_code}/knowledge", response_model=List[Dict[str, Any]])
 async def get_job_knowledge(
     occ_code: str,
     limit: int = Query(10, ge=1, le=50),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobDetailRepo = Depends(get_job_detail_repo),
 ) -> List[Dict[str, Any]]:
     """Get knowledge areas for a specific job"""
-    cache_key = f"job_knowledge_{occ_code}_{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = JobDetailRepo(db)
-    onet_soc = await repo.get_onet_soc(occ_code)
-    
-    if not onet_soc:
-        return []
-    
-    knowledge = await repo.get_knowledge(onet_soc)
-    result = knowledge[:limit]
-    
-    cache.set(cache_key, result)
-    return result
\ No newline at end of file
+    knowledge = await _job_detail_section(occ_code, "knowledge", repo)
+    return knowledge[:limit]
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from typing import Optional, TYPE_CHECKING, Literal, List
+import asyncio
+from typing import Optional, Literal, List
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
-from app.api.dependencies import get_db
+from app.api.dependencies import get_jobs_repo
 from app.api.crud.jobs_repo import JobsRepo
 from app.models.job_models import (
     JobListResponse,
     JobItem,
+    JobItemList,
     JobDetailMetrics,
     JobSummaryResponse,
     JobDashboardMetrics,
@@ -29,31 +32,26 @@ from app.models.job_models import (
     TopGrowingJob,
     JobYearPoint,
 )
-from app.services.cache import cache
+from app.services.cache import cache, make_key
+from app.services.http_cache import cached
+from app.services.invalidation import BLS_OEWS_TAG, BLS_OEWS_YEAR_TAGS
 
-if TYPE_CHECKING:
-    from motor.core import AgnosticDatabase
-
-router = APIRouter(prefix="/jobs", tags=["jobs"])
+router = APIRouter(prefix="/jobs", tags=["jobs"], default_response_class=ORJSONResponse)
 
 
 @router.get("/", response_model=JobListResponse)
+@cached("jobs_list", tags=BLS_OEWS_YEAR_TAGS)
 async def list_jobs(
+    request: Request,
     year: Optional[int] = Query(None, description="If omitted, uses latest year"),
     group: Optional[str] = Query(None, description="Filter by SOC group"),
     search: Optional[str] = Query(None, description="Search by job title"),
     limit: int = Query(1000, ge=1, le=10000),
     offset: int = Query(0, ge=0),
     only_with_details: bool = Query(True, description="Only show jobs with O*NET data"),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobListResponse:
     """List all jobs/occupations - only those with O*NET data by default"""
-    cache_key = f"jobs_list_crosspref_v2_{year}_{group}_{search}_{limit}_{offset}_{only_with_details}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobListResponse(**cached)
-    
-    repo = JobsRepo(db)
     y, jobs = await repo.list_jobs(
         year=year, 
         group=group, 
@@ -62,50 +60,44 @@ async def list_jobs(
         offset=offset,
         only_with_details=only_with_details
     )
-    
+
     if not jobs:
         raise HTTPException(status_code=404, detail="No jobs found")
-    
+
     response = JobListResponse(
         year=y,
         count=len(jobs),
         jobs=[JobItem(**j) for j in jobs]
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/search", response_model=List[JobItem])
+@cached("jobs_search", store=False)
 async def search_jobs(
     q: str = Query(..., min_length=2, description="Search query"),
     year: Optional[int] = Query(None),
     limit: int = Query(20, ge=1, le=100),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> List[JobItem]:
     """Quick search for job autocomplete - don't cache search results"""
-    repo = JobsRepo(db)
     jobs = await repo.search_jobs(query=q, year=year, limit=limit)
-    return [JobItem(**j) for j in jobs]
+    return JobItemList.validate_python(jobs)
 
 
 @router.get("/metrics/{year}", response_model=JobDashboardMetrics)
+@cached("jobs_metrics", tags=BLS_OEWS_YEAR_TAGS)
 async def dashboard_metrics(
+    request: Request,
     year: int,
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobDashboardMetrics:
     """Dashboard metrics for jobs overview"""
-    cache_key = f"jobs_metrics_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobDashboardMetrics(**cached)
-    
-    repo = JobsRepo(db)
     data = await repo.dashboard_metrics(year)
-    
+
     top = data.get("top_growing_job")
     top_obj = TopGrowingJob(**top) if top else None
-    
+
     response = JobDashboardMetrics(
         year=data["year"],
         total_jobs=data["total_jobs"],
@@ -115,57 +107,45 @@ async def dashboard_metrics(
         a_median=data["a_median"],
         mean_salary=data.get("mean_salary", 0.0),
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/groups/{year}", response_model=JobGroupsResponse)
+@cached("jobs_groups", tags=BLS_OEWS_YEAR_TAGS)
 async def job_groups(
+    request: Request,
     year: int,
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobGroupsResponse:
     """Get distinct occupation groups (SOC major groups)"""
-    cache_key = f"jobs_groups_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobGroupsResponse(**cached)
-    
-    repo = JobsRepo(db)
     groups = await repo.job_groups(year)
-    
+
     # Filter out None or empty string groups and ensure they're strings
     valid_groups = []
     for g in groups:
         group_value = g.get("group")
         if group_value and isinstance(group_value, str) and group_value.strip():
             valid_groups.append(JobGroupItem(group=group_value))
-    
+
     response = JobGroupsResponse(
         year=year,
         groups=valid_groups
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/top", response_model=JobTopResponse)
+@cached("jobs_top", tags=BLS_OEWS_YEAR_TAGS)
 async def top_jobs(
+    request: Request,
     year: int = Query(...),
     limit: int = Query(10, ge=1, le=50),
     by: Literal["employment", "salary"] = Query("employment"),
     group: Optional[str] = Query(None, description="Filter by SOC group"),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobTopResponse:
     """Top jobs by employment or salary"""
-    cache_key = f"jobs_top_cross_v2_{year}_{limit}_{by}_{group}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobTopResponse(**cached)
-    
-    repo = JobsRepo(db)
-    
+
     if by == "salary":
         rows = await repo.top_jobs(year=year, limit=limit, by="salary", group=group)
         response = JobTopResponse(
@@ -184,28 +164,22 @@ async def top_jobs(
             group=group,
             jobs=[JobCard(**r) for r in rows]
         )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/top-trends", response_model=JobTopTrendsResponse)
+@cached("jobs_top_trends", tags=(BLS_OEWS_TAG,))
 async def top_jobs_trends(
+    request: Request,
     year_from: int = Query(2011, description="Start year"),
     year_to: int = Query(2024, description="End year"),
     limit: int = Query(10, ge=1, le=20),
     group: Optional[str] = Query(None),
     sort_by: Literal["employment", "salary"] = Query("employment", description="Sort top jobs by this criteria"),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobTopTrendsResponse:
     """Employment trends for top jobs over time"""
-    cache_key = f"jobs_trends_cross_v2_{year_from}_{year_to}_{limit}_{group}_{sort_by}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobTopTrendsResponse(**cached)
-    
-    repo = JobsRepo(db)
-    
+
     series = await repo.top_jobs_trends(
         year_from=year_from,
         year_to=year_to,
@@ -213,35 +187,29 @@ async def top_jobs_trends(
         group=group,
         sort_by=sort_by
     )
-    
+
     response = JobTopTrendsResponse(
         year_from=min(year_from, year_to),
         year_to=max(year_from, year_to),
         limit=limit,
         series=series
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/top-salary-trends", response_model=JobTopSalaryTrendsResponse)
+@cached("jobs_top_salary_trends", tags=(BLS_OEWS_TAG,))
 async def top_jobs_salary_trends(
+    request: Request,
     year_from: int = Query(2011, description="Start year"),
     year_to: int = Query(2024, description="End year"),
     limit: int = Query(10, ge=1, le=20),
     group: Optional[str] = Query(None),
     sort_by: Literal["employment", "salary"] = Query("employment", description="Sort top jobs by this criteria"),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobTopSalaryTrendsResponse:
     """Salary trends for top jobs over time"""
-    cache_key = f"jobs_salary_trends_cross_v2_{year_from}_{year_to}_{limit}_{group}_{sort_by}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobTopSalaryTrendsResponse(**cached)
-    
-    repo = JobsRepo(db)
-    
+
     series = await repo.top_jobs_salary_trends(
         year_from=year_from,
         year_to=year_to,
@@ -249,60 +217,62 @@ async def top_jobs_salary_trends(
         group=group,
         sort_by=sort_by
     )
-    
+
     response = JobTopSalaryTrendsResponse(
         year_from=min(year_from, year_to),
         year_to=max(year_from, year_to),
         limit=limit,
         series=series
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/top-combined", response_model=JobTopCombinedResponse)
+@cached("jobs_top_combined", tags=BLS_OEWS_YEAR_TAGS)
 async def top_jobs_combined(
+    request: Request,
     year: int = Query(...),
     limit: int = Query(10, ge=1, le=20),
     by: Literal["employment", "salary"] = Query("employment"),
     group: Optional[str] = Query(None),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobTopCombinedResponse:
     """Get combined data for top jobs - employment and salary trends"""
-    cache_key = f"jobs_combined_cross_v2_{year}_{limit}_{by}_{group}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobTopCombinedResponse(**cached)
-    
-    repo = JobsRepo(db)
-    
-    # Get top jobs list
-    top_jobs_list = await repo.top_jobs(
-        year=year,
-        limit=limit,
-        by=by,
-        group=group
-    )
-    
-    # Get employment trends for these jobs
-    employment_trends = await repo.top_jobs_trends(
-        year_from=2011,
-        year_to=year,
-        limit=limit,
-        group=group,
-        sort_by=by
+
+    # The trend pieces share keys with /top-trends and /top-salary-trends,
+    # so one MGET can pick up whatever those endpoints already cached.
+    top_key = make_key("jobs_top_rows", year=year, limit=limit, by=by, group=group)
+    emp_key = make_key(
+        "jobs_top_trends", year_from=2011, year_to=year, limit=limit, group=group, sort_by=by
     )
-    
-    # Get salary trends for these jobs
-    salary_trends = await repo.top_jobs_salary_trends(
-        year_from=2011,
-        year_to=year,
-        limit=limit,
-        group=group,
-        sort_by=by
+    sal_key = make_key(
+        "jobs_top_salary_trends", year_from=2011, year_to=year, limit=limit, group=group, sort_by=by
     )
-    
+    cached_top, cached_emp, cached_sal = await cache.mget([top_key, emp_key, sal_key])
+
+    if cached_top is not None and cached_emp is not None and cached_sal is not None:
+        top_jobs_list = cached_top
+        employment_trends = cached_emp["series"]
+        salary_trends = cached_sal["series"]
+    else:
+        # One ranking query plus one $facet for both trend series
+        combined = await repo.top_jobs_combined(year=year, limit=limit, by=by, group=group)
+        top_jobs_list = combined["top_jobs"]
+        employment_trends = combined["employment_trends"]
+        salary_trends = combined["salary_trends"]
+
+        emp = JobTopTrendsResponse(
+            year_from=min(2011, year), year_to=max(2011, year), limit=limit, series=employment_trends
+        )
+        sal = JobTopSalaryTrendsResponse(
+            year_from=min(2011, year), year_to=max(2011, year), limit=limit, series=salary_trends
+        )
+        await asyncio.gather(
+            cache.put(top_key, top_jobs_list, tags=(BLS_OEWS_TAG,)),
+            cache.put(emp_key, emp.model_dump(mode="json"), tags=(BLS_OEWS_TAG,)),
+            cache.put(sal_key, sal.model_dump(mode="json"), tags=(BLS_OEWS_TAG,)),
+        )
+
     response = JobTopCombinedResponse(
         year=year,
         by=by,
@@ -312,104 +282,81 @@ async def top_jobs_combined(
         employment_trends=employment_trends,
         salary_trends=salary_trends
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/composition/{year}", response_model=JobCompositionResponse)
+@cached("jobs_composition", tags=BLS_OEWS_YEAR_TAGS)
 async def job_composition(
+    request: Request,
     year: int,
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobCompositionResponse:
     """Job distribution by SOC major group - SIMPLIFIED"""
-    cache_key = f"jobs_composition_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobCompositionResponse(**cached)
-    
-    repo = JobsRepo(db)
     rows = await repo.job_composition_by_group(year)
-    
+
     response = JobCompositionResponse(
         year=year,
         rows=rows
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/salary-distribution/{year}", response_model=JobSalaryDistribution)
+@cached("jobs_salary_distribution", tags=BLS_OEWS_YEAR_TAGS)
 async def salary_distribution(
+    request: Request,
     year: int,
     group: Optional[str] = Query(None),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobSalaryDistribution:
     """Salary quartiles for jobs - SIMPLIFIED"""
-    cache_key = f"jobs_salary_dist_{year}_{group}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobSalaryDistribution(**cached)
-    
-    repo = JobsRepo(db)
     data = await repo.salary_distribution(year, group)
-    
+
     response = JobSalaryDistribution(**data)
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/{occ_code}/metrics", response_model=JobDetailMetrics)
+@cached("jobs_metrics_occ", tags=BLS_OEWS_YEAR_TAGS)
 async def job_metrics(
+    request: Request,
     occ_code: str,
     year: int = Query(...),
     naics: Optional[str] = Query(None, description="Industry NAICS (default: cross-industry)"),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobDetailMetrics:
     """Get metrics for a specific job/occupation"""
-    cache_key = f"jobs_{occ_code}_metrics_{year}_{naics}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobDetailMetrics(**cached)
-    
-    repo = JobsRepo(db)
     data = await repo.job_metrics(occ_code, year, naics)
-    
+
     if data["total_employment"] == 0 and not naics:
         raise HTTPException(status_code=404, detail=f"No data for occ_code={occ_code} in {year}")
-    
+
     response = JobDetailMetrics(**data)
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/{occ_code}/summary", response_model=JobSummaryResponse)
+@cached("jobs_summary", tags=(BLS_OEWS_TAG,))
 async def job_summary(
+    request: Request,
     occ_code: str,
     year_from: int = Query(2011),
     year_to: int = Query(2024),
     naics: Optional[str] = Query(None, description="Industry NAICS (default: cross-industry)"),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobSummaryResponse:
     """Time series summary for a job"""
-    cache_key = f"jobs_{occ_code}_summary_{year_from}_{year_to}_{naics}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobSummaryResponse(**cached)
-    
-    repo = JobsRepo(db)
-    job_title, series = await repo.job_summary(occ_code, year_from, year_to, naics)
-    
-    # Get naics_title if naics provided
+    # Get naics_title alongside the series when naics is provided
     naics_title = None
     if naics:
-        doc = await db["bls_oews"].find_one(
-            {"naics": naics, "year": year_to},
-            {"naics_title": 1, "_id": 0}
+        (job_title, series), naics_title = await asyncio.gather(
+            repo.job_summary(occ_code, year_from, year_to, naics),
+            repo.naics_title(naics, year_to),
         )
-        naics_title = str(doc.get("naics_title", "")).strip() if doc else None
-    
+    else:
+        job_title, series = await repo.job_summary(occ_code, year_from, year_to, naics)
+
     response = JobSummaryResponse(
         occ_code=occ_code,
         occ_title=job_title,
@@ -419,28 +366,22 @@ async def job_summary(
         naics_title=naics_title,
         series=[JobYearPoint(**p) for p in series]
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/industry/{naics}/jobs", response_model=JobIndustryJobsResponse)
+@cached("jobs_in_industry", tags=BLS_OEWS_YEAR_TAGS)
 async def jobs_in_industry(
+    request: Request,
     naics: str,
     year: int = Query(...),
     limit: int = Query(200, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    db: "AgnosticDatabase" = Depends(get_db),
+    repo: JobsRepo = Depends(get_jobs_repo),
 ) -> JobIndustryJobsResponse:
     """Get jobs within a specific industry"""
-    cache_key = f"jobs_in_industry_{naics}_{year}_{limit}_{offset}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobIndustryJobsResponse(**cached)
-    
-    repo = JobsRepo(db)
     naics_title, rows = await repo.jobs_in_industry(naics, year, limit, offset)
-    
+
     response = JobIndustryJobsResponse(
         naics=naics,
         naics_title=naics_title,
@@ -448,6 +389,4 @@ async def jobs_in_industry(
         count=len(rows),
         jobs=[JobIndustryJob(**r) for r in rows]
     )
-    
-    cache.set(cache_key, response.dict())
     return response
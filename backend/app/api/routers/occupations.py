@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from typing import Optional, TYPE_CHECKING
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
 from app.api.dependencies import get_db
 from app.api.crud.occupations_repo import OccupationsRepo
@@ -11,83 +12,73 @@ from app.models.occupation_models import (
     OccupationSummaryResponse,
     OccupationYearPoint,
 )
-from app.services.cache import cache
+from app.services.http_cache import cached
+from app.services.invalidation import BLS_OEWS_TAG, BLS_OEWS_YEAR_TAGS
 
 if TYPE_CHECKING:
     from motor.core import AgnosticDatabase
 
-router = APIRouter(prefix="/occupations", tags=["occupations"])
+router = APIRouter(prefix="/occupations", tags=["occupations"], default_response_class=ORJSONResponse)
 
 
 # -----------------------------
 # Cross-industry (naics=000000)
 # -----------------------------
 @router.get("/metrics/{year}", response_model=OccupationMetricsYearResponse)
+@cached("occupations_metrics_cross", tags=BLS_OEWS_YEAR_TAGS)
 async def metrics_year_cross(
+    request: Request,
     year: int,
     group: Optional[str] = Query(None, description="detail | major | total (optional)"),
     limit: int = Query(500, ge=1, le=20000),
     offset: int = Query(0, ge=0),
     db: "AgnosticDatabase" = Depends(get_db),
 ) -> OccupationMetricsYearResponse:
-    cache_key = f"occupations_metrics_cross_{year}_{group}_{limit}_{offset}"
-    cached = cache.get(cache_key)
-    if cached:
-        return OccupationMetricsYearResponse(**cached)
-    
     repo = OccupationsRepo(db)
     rows = await repo.metrics_for_year_cross(year, group=group, limit=limit, offset=offset)
-    
+
     if not rows:
         raise HTTPException(status_code=404, detail=f"No occupations found for year={year}")
-    
+
     response = OccupationMetricsYearResponse(
         year=year,
         count=len(rows),
-        occupations=[OccupationMetric(**r) for r in rows],
+        occupations=[OccupationMetric.model_construct(**r) for r in rows],
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/{occ_code}/summary", response_model=OccupationSummaryResponse)
+@cached("occupations_summary_cross", tags=(BLS_OEWS_TAG,))
 async def occ_summary_cross(
+    request: Request,
     occ_code: str,
     year_from: int = Query(2011),
     year_to: int = Query(2024),
     group: Optional[str] = Query(None),
     db: "AgnosticDatabase" = Depends(get_db),
 ) -> OccupationSummaryResponse:
-    cache_key = f"occupations_summary_cross_{occ_code}_{year_from}_{year_to}_{group}"
-    cached = cache.get(cache_key)
-    if cached:
-        return OccupationSummaryResponse(**cached)
-    
     repo = OccupationsRepo(db)
     data = await repo.summary_for_occ_cross(occ_code, year_from=year_from, year_to=year_to, group=group)
-    
+
     if not data["series"]:
         raise HTTPException(status_code=404, detail=f"No data for occ_code={occ_code}")
-    
+
     response = OccupationSummaryResponse(
         occ_code=data["occ_code"],
         occ_title=data["occ_title"],
         year_from=data["year_from"],
         year_to=data["year_to"],
         group=data["group"],
-        series=[OccupationYearPoint(**p) for p in data["series"]],
+        series=[OccupationYearPoint.model_construct(**p) for p in data["series"]],
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
-# -----------------------------------------
-# ✅ Industry-specific (naics = specific)
-# -----------------------------------------
 @router.get("/industry/{naics}/metrics/{year}", response_model=OccupationMetricsYearResponse)
+@cached("occupations_metrics_industry", tags=BLS_OEWS_YEAR_TAGS)
 async def metrics_year_in_industry(
+    request: Request,
     naics: str,
     year: int,
     group: Optional[str] = Query(None, description="detail | major | total (optional)"),
@@ -95,29 +86,24 @@ async def metrics_year_in_industry(
     offset: int = Query(0, ge=0),
     db: "AgnosticDatabase" = Depends(get_db),
 ) -> OccupationMetricsYearResponse:
-    cache_key = f"occupations_metrics_industry_{naics}_{year}_{group}_{limit}_{offset}"
-    cached = cache.get(cache_key)
-    if cached:
-        return OccupationMetricsYearResponse(**cached)
-    
     repo = OccupationsRepo(db)
     rows = await repo.metrics_for_year_in_naics(naics=naics, year=year, group=group, limit=limit, offset=offset)
-    
+
     if not rows:
         raise HTTPException(status_code=404, detail=f"No occupations found for naics={naics} in year={year}")
-    
+
     response = OccupationMetricsYearResponse(
         year=year,
         count=len(rows),
-        occupations=[OccupationMetric(**r) for r in rows],
+        occupations=[OccupationMetric.model_construct(**r) for r in rows],
     )
-    
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/industry/{naics}/{occ_code}/summary", response_model=OccupationSummaryResponse)
+@cached("occupations_summary_industry", tags=(BLS_OEWS_TAG,))
 async def occ_summary_in_industry(
+    request: Request,
     naics: str,
     occ_code: str,
     year_from: int = Query(2011),
@@ -125,27 +111,20 @@ async def occ_summary_in_industry(
     group: Optional[str] = Query(None),
     db: "AgnosticDatabase" = Depends(get_db),
 ) -> OccupationSummaryResponse:
-    cache_key = f"occupations_summary_industry_{naics}_{occ_code}_{year_from}_{year_to}_{group}"
-    cached = cache.get(cache_key)
-    if cached:
-        return OccupationSummaryResponse(**cached)
-    
     repo = OccupationsRepo(db)
     data = await repo.summary_for_occ_in_naics(
         naics=naics, occ_code=occ_code, year_from=year_from, year_to=year_to, group=group
     )
-    
+
     if not data["series"]:
         raise HTTPException(status_code=404, detail=f"No data for occ_code={occ_code} in naics={naics}")
-    
+
     response = OccupationSummaryResponse(
         occ_code=data["occ_code"],
         occ_title=data["occ_title"],
         year_from=data["year_from"],
         year_to=data["year_to"],
         group=data["group"],
-        series=[OccupationYearPoint(**p) for p in data["series"]],
+        series=[OccupationYearPoint.model_construct(**p) for p in data["series"]],
     )
-    
-    cache.set(cache_key, response.dict())
-    return response
\ No newline at end of file
+    return response
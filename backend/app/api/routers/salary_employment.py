@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import math
 import re
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import ORJSONResponse
 from motor.core import AgnosticDatabase
 
 from app.api.dependencies import get_db
@@ -23,24 +24,26 @@ from app.models.salary_models import (
     TopCrossIndustryJobsResponse,
     JobEmploymentTimeSeriesResponse,
 )
-from app.services.cache import cache
-
-router = APIRouter(prefix="/salary-employment", tags=["Salary & Employment"])
+from app.services.cache import get_latest_year
+from app.services.http_cache import cached
+from app.services.invalidation import BLS_OEWS_TAG, BLS_OEWS_YEAR_TAGS
+
+router = APIRouter(
+    prefix="/salary-employment",
+    tags=["Salary & Employment"],
+    default_response_class=ORJSONResponse,
+)
 
 
 def _normalize_names(names: List[str]) -> List[str]:
     if not names:
         return []
     if len(names) == 1 and isinstance(names[0], str) and "," in names[0]:
-        parts = [p.strip() for p in names[0].split(",")]
-        return [p for p in parts if p]
-    out: List[str] = []
-    for n in names:
-        if isinstance(n, str):
-            s = n.strip()
-            if s:
-                out.append(s)
-    return out
+        return [p for p in map(str.strip, names[0].split(",")) if p]
+    return [s for s in (n.strip() for n in names if isinstance(n, str)) if s]
+
+
+_KEY_RE = re.compile(r"[^a-z0-9]+")
 
 
 def _make_key(value: object) -> str:
@@ -52,55 +55,54 @@ def _make_key(value: object) -> str:
         s = str(value)
 
     s = s.strip().lower()
-    s = re.sub(r"[^a-z0-9]+", "_", s).strip("_")
+    s = _KEY_RE.sub("_", s).strip("_")
     return s[:30] or "unknown"
 
 
+def _direction(v: float) -> str:
+    return "up" if v > 0 else ("down" if v < 0 else "flat")
+
+
+async def _latest_year(arguments: Dict[str, Any]) -> int:
+    """@cached resolver: an omitted ?year means the latest year in bls_oews."""
+    return await get_latest_year(SalaryRepo(arguments["db"]), tags=(BLS_OEWS_TAG,))
+
+
 @router.get("/metrics", response_model=MetricsResponse)
+@cached("salary_metrics", tags=BLS_OEWS_YEAR_TAGS, resolve={"year": _latest_year})
 async def get_metrics(
+    request: Request,
     year: Optional[int] = Query(None, description="If omitted, uses latest year"),
     db: AgnosticDatabase = Depends(get_db),
 ) -> MetricsResponse:
-    cache_key = f"salary_metrics_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return MetricsResponse(**cached)
-    
     repo = SalaryRepo(db)
-    y = year or await repo.latest_year()
+    y = year or await get_latest_year(repo, tags=(BLS_OEWS_TAG,))
     data = await repo.dashboard_metrics(y)
 
-    def direction(v: float) -> str:
-        if v > 0:
-            return "up"
-        if v < 0:
-            return "down"
-        return "flat"
-
     metrics = [
         MetricItem(
             title="Total Employment",
             value=data["totalEmployment"],
-            trend=Trend(value=abs(data["employmentTrendPct"]), direction=direction(data["employmentTrendPct"])),
+            trend=Trend(value=abs(data["employmentTrendPct"]), direction=_direction(data["employmentTrendPct"])),
             color="cyan",
         ),
         MetricItem(
             title="Median Salary",
             value=data["medianSalary"],
             prefix="$",
-            trend=Trend(value=abs(data["salaryTrendPct"]), direction=direction(data["salaryTrendPct"])),
+            trend=Trend(value=abs(data["salaryTrendPct"]), direction=_direction(data["salaryTrendPct"])),
             color="purple",
         ),
         MetricItem(
             title="Employment Trend",
             value=f'{data["employmentTrendPct"]:+.2f}%',
-            trend=Trend(value=abs(data["employmentTrendPct"]), direction=direction(data["employmentTrendPct"])),
+            trend=Trend(value=abs(data["employmentTrendPct"]), direction=_direction(data["employmentTrendPct"])),
             color="green",
         ),
         MetricItem(
             title="Salary Trend",
             value=f'{data["salaryTrendPct"]:+.2f}%',
-            trend=Trend(value=abs(data["salaryTrendPct"]), direction=direction(data["salaryTrendPct"])),
+            trend=Trend(value=abs(data["salaryTrendPct"]), direction=_direction(data["salaryTrendPct"])),
             color="coral",
         ),
         MetricItem(
@@ -109,35 +111,32 @@ async def get_metrics(
             color="amber",
         ),
     ]
-    
+
     response = MetricsResponse(year=y, metrics=metrics)
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/industries/bar", response_model=IndustryBarResponse)
+@cached("salary_industries_bar", tags=BLS_OEWS_YEAR_TAGS, resolve={"year": _latest_year})
 async def industries_bar(
+    request: Request,
     year: Optional[int] = Query(None),
     search: Optional[str] = Query(None),
     limit: int = Query(15, ge=1, le=50),
     db: AgnosticDatabase = Depends(get_db),
 ) -> IndustryBarResponse:
-    cache_key = f"salary_industries_bar_{year}_{search}_{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustryBarResponse(**cached)
-    
     repo = SalaryRepo(db)
-    y = year or await repo.latest_year()
+    y = year or await get_latest_year(repo, tags=(BLS_OEWS_TAG,))
     items = await repo.industry_bar(y, search, limit)
-    
+
     response = IndustryBarResponse(year=y, items=[BarPoint(**it) for it in items])
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/industries", response_model=PagedIndustries)
+@cached("salary_industries_table", tags=BLS_OEWS_YEAR_TAGS, resolve={"year": _latest_year})
 async def industries_table(
+    request: Request,
     year: Optional[int] = Query(None),
     search: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
@@ -146,22 +145,18 @@ async def industries_table(
     sort_dir: int = Query(-1, description="-1 desc, 1 asc"),
     db: AgnosticDatabase = Depends(get_db),
 ) -> PagedIndustries:
-    cache_key = f"salary_industries_table_{year}_{search}_{page}_{page_size}_{sort_by}_{sort_dir}"
-    cached = cache.get(cache_key)
-    if cached:
-        return PagedIndustries(**cached)
-    
     repo = SalaryRepo(db)
-    y = year or await repo.latest_year()
+    y = year or await get_latest_year(repo, tags=(BLS_OEWS_TAG,))
     total, items = await repo.industries_paged(y, search, page, page_size, sort_by, sort_dir)
-    
+
     response = PagedIndustries(year=y, page=page, page_size=page_size, total=total, items=items)
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/jobs", response_model=PagedJobs)
+@cached("salary_jobs_table", tags=BLS_OEWS_YEAR_TAGS, resolve={"year": _latest_year})
 async def jobs_table(
+    request: Request,
     year: Optional[int] = Query(None),
     search: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
@@ -170,89 +165,70 @@ async def jobs_table(
     sort_dir: int = Query(-1, description="-1 desc, 1 asc"),
     db: AgnosticDatabase = Depends(get_db),
 ) -> PagedJobs:
-    cache_key = f"salary_jobs_table_{year}_{search}_{page}_{page_size}_{sort_by}_{sort_dir}"
-    cached = cache.get(cache_key)
-    if cached:
-        return PagedJobs(**cached)
-    
     repo = SalaryRepo(db)
-    y = year or await repo.latest_year()
+    y = year or await get_latest_year(repo, tags=(BLS_OEWS_TAG,))
     total, items = await repo.jobs_paged(y, search, page, page_size, sort_by, sort_dir)
-    
+
     response = PagedJobs(year=y, page=page, page_size=page_size, total=total, items=items)
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/jobs/top-cross-industry", response_model=TopCrossIndustryJobsResponse)
+@cached("salary_top_cross_jobs", tags=BLS_OEWS_YEAR_TAGS, resolve={"year": _latest_year})
 async def top_cross_industry_jobs(
+    request: Request,
     year: Optional[int] = Query(None),
     limit: int = Query(10, ge=1, le=50),
     db: AgnosticDatabase = Depends(get_db),
 ) -> TopCrossIndustryJobsResponse:
-    cache_key = f"salary_top_cross_jobs_{year}_{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return TopCrossIndustryJobsResponse(**cached)
-    
     repo = SalaryRepo(db)
-    y = year or await repo.latest_year()
+    y = year or await get_latest_year(repo, tags=(BLS_OEWS_TAG,))
     items = await repo.top_cross_industry_jobs(y, limit)
-    
+
     response = TopCrossIndustryJobsResponse(year=y, items=[BarPoint(**it) for it in items])
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/industries/salary-timeseries", response_model=IndustrySalaryTimeSeriesResponse)
+@cached("salary_timeseries", tags=(BLS_OEWS_TAG,))
 async def industry_salary_timeseries(
+    request: Request,
     names: List[str] = Query(..., description="Repeat ?names=A&names=B OR comma-separated ?names=A,B"),
     start_year: Optional[int] = Query(None),
     end_year: Optional[int] = Query(None),
     db: AgnosticDatabase = Depends(get_db),
 ) -> IndustrySalaryTimeSeriesResponse:
-    # Sort names for consistent cache key
-    sorted_names = sorted(names) if names else []
-    cache_key = f"salary_timeseries_{sorted_names}_{start_year}_{end_year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return IndustrySalaryTimeSeriesResponse(**cached)
-    
     repo = SalaryRepo(db)
-    names = _normalize_names(names)
-    rows = await repo.industry_salary_timeseries(names, start_year, end_year)
+    rows = await repo.industry_salary_timeseries(_normalize_names(names), start_year, end_year)
 
     grouped: Dict[str, List[TimeSeriesPoint]] = {}
     for r in rows:
         nm = r.get("name")
         if not isinstance(nm, str) or not nm.strip():
             continue
-        grouped.setdefault(nm, []).append(TimeSeriesPoint(year=r["year"], value=r["value"]))
+        # repo already casts year/value to int; skip per-point validation
+        grouped.setdefault(nm, []).append(TimeSeriesPoint.model_construct(year=r["year"], value=r["value"]))
 
     series: List[MultiLineSeries] = []
     for name, pts in grouped.items():
         series.append(MultiLineSeries(key=_make_key(name), name=name, points=pts))
 
     response = IndustrySalaryTimeSeriesResponse(series=series)
-    cache.set(cache_key, response.dict())
     return response
 
 
 @router.get("/jobs/employment-timeseries", response_model=JobEmploymentTimeSeriesResponse)
+@cached("salary_job_timeseries", tags=BLS_OEWS_YEAR_TAGS, resolve={"year": _latest_year})
 async def job_employment_timeseries(
+    request: Request,
     year: Optional[int] = Query(None, description="Anchor year for selecting top jobs"),
     limit: int = Query(6, ge=1, le=20, description="Top N job titles"),
     start_year: Optional[int] = Query(None),
     end_year: Optional[int] = Query(None),
     db: AgnosticDatabase = Depends(get_db),
 ) -> JobEmploymentTimeSeriesResponse:
-    cache_key = f"salary_job_timeseries_v4_{year}_{limit}_{start_year}_{end_year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return JobEmploymentTimeSeriesResponse(**cached)
-    
     repo = SalaryRepo(db)
-    y = year or await repo.latest_year()
+    y = year or await get_latest_year(repo, tags=(BLS_OEWS_TAG,))
     rows = await repo.job_employment_timeseries(y, limit, start_year, end_year)
 
     series: List[MultiLineSeries] = []
@@ -264,7 +240,7 @@ async def job_employment_timeseries(
             continue
 
         ts_points = [
-            TimeSeriesPoint(year=int(p["year"]), value=int(p["value"]))
+            TimeSeriesPoint.model_construct(year=int(p["year"]), value=int(p["value"]))
             for p in points
             if "year" in p and "value" in p
         ]
@@ -280,5 +256,4 @@ async def job_employment_timeseries(
         )
 
     response = JobEmploymentTimeSeriesResponse(series=series)
-    cache.set(cache_key, response.dict())
     return response
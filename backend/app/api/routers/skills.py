@@ -1,287 +1,266 @@
 from __future__ import annotations
 
-from typing import Optional, TYPE_CHECKING, List, Any, Dict
+import heapq
+import logging
+from typing import Optional, List, Any, Dict
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 
-from app.api.dependencies import get_db, get_neo4j_driver
-from app.database.neo4j import get_neo4j_driver
-from app.api.crud.skill_repo import SkillRepo
+from app.api.dependencies import get_job_detail_repo, get_skill_repo
+from app.api.crud.skill_repo import SkillRepo, skill_name_for_id
 from app.models.skill_models import SkillDetailResponse
 from app.api.crud.job_detail_repo import JobDetailRepo
-from app.services.cache import cache
-
-if TYPE_CHECKING:
-    from motor.core import AgnosticDatabase
-    from neo4j import AsyncDriver
+from app.services.cache import cache, make_key
+from app.services.http_cache import cached, cached_json_response
+from app.services.invalidation import BLS_OEWS_TAG
 
 router = APIRouter(prefix="/skills", tags=["skills"])
 
+logger = logging.getLogger(__name__)
+
+# Unknown skill ids are remembered briefly (bots retry them); resolved names for longer
+SKILL_MISS_TTL_SECONDS = 300
+SKILL_CANON_TTL_SECONDS = 3600
+# Neo4j half of a skill detail (O*NET graph; the same for every year)
+SKILL_GRAPH_TTL_SECONDS = 3600
+
+# Skill ids use "_" (search) or "-" (slugs) between words
+_ID_TO_NAME = str.maketrans({"_": " ", "-": " "})
+
 
 @router.get("/search")
+@cached("skills_search", store=False)
 async def search_skills(
     q: str = Query(..., min_length=2),
     limit: int = Query(10, ge=1, le=50),
-    neo4j_driver: AsyncDriver = Depends(get_neo4j_driver),
+    repo: SkillRepo = Depends(get_skill_repo),
 ) -> List[dict]:
     """Search for skills by name - don't cache search results"""
-    repo = SkillRepo(neo4j_driver)
-    
-    async with neo4j_driver.session() as session:
-        result = await session.run(
-            """
-            MATCH (s:Skill)
-            WHERE toLower(s.name) CONTAINS toLower($search_term)
-            RETURN s.name AS name, 
-                   s.classification AS classification,
-                   COUNT { (j:Job)-[:REQUIRES]->(s) } AS job_count
-            ORDER BY job_count DESC
-            LIMIT $limit
-            """,
-            search_term=q,
-            limit=limit
-        )
-        
-        skills = []
-        async for record in result:
-            skills.append({
-                "id": record["name"].lower().replace(" ", "_").replace("/", "_").replace(",", ""),
-                "name": record["name"],
-                "type": "tech" if "TechnologySkill" in record.get("classification", []) else "skill",
-                "job_count": record.get("job_count", 0)
-            })
-        
-        return skills
+    return await repo.search_skills(q, limit)
 
 
 @router.get("/{skill_id}", response_model=SkillDetailResponse)
 async def get_skill_detail(
+    request: Request,
     skill_id: str,
     year: int = Query(..., description="Year for salary data (2011-2024)"),
-    neo4j_driver: AsyncDriver = Depends(get_neo4j_driver),
-    mongodb: "AgnosticDatabase" = Depends(get_db),
-) -> SkillDetailResponse:
+    repo: SkillRepo = Depends(get_skill_repo),
+    job_detail_repo: JobDetailRepo = Depends(get_job_detail_repo),
+) -> Response:
     """Get complete skill details from Neo4j with year-specific salary data.
     Jobs are sorted by total employment (number of people in that occupation)
     for the selected year, highest first."""
     
     # Check cache with year
     cache_key = f"skill_detail_{skill_id}_{year}"
-    cached = cache.get(cache_key)
-    if cached:
-        return SkillDetailResponse(**cached)
-    
-    repo = SkillRepo(neo4j_driver)
-    job_detail_repo = JobDetailRepo(mongodb)
-    
-    # Convert skill_id back to name (handle both formats)
-    skill_name = skill_id.replace("_", " ").replace("-", " ").strip()
-    
-    # If it's all lowercase, capitalize properly
-    if skill_name.islower():
-        skill_name = skill_name.title()
-    
-    print(f"🔍 Looking for skill: '{skill_name}' (from ID: {skill_id}) with year: {year}")
-    
-    # Try to find the skill
-    skill_detail = await repo.get_complete_skill_detail(skill_name)
-    
-    # If not found, try searching with original format
-    if not skill_detail:
-        print(f"⚠️ Skill not found with name '{skill_name}', trying to find by partial match...")
-        skill = await repo.get_skill_by_name(skill_name)
-        if skill:
-            print(f"✅ Found skill by partial match: {skill['name']}")
-            skill_detail = await repo.get_complete_skill_detail(skill["name"])
-    
-    # If still not found, try exact match with case-insensitive
-    if not skill_detail:
-        print(f"⚠️ Still not found, trying case-insensitive search...")
-        async with neo4j_driver.session() as session:
-            result = await session.run(
-                """
-                MATCH (s:Skill)
-                WHERE toLower(s.name) = toLower($skill_name)
-                RETURN s.name AS name
-                LIMIT 1
-                """,
-                skill_name=skill_name
+
+    async def build():
+        # Convert skill_id back to name (handle both formats)
+        skill_name = skill_id.translate(_ID_TO_NAME).strip()
+
+        # If it's all lowercase, capitalize properly
+        if skill_name.islower():
+            skill_name = skill_name.title()
+
+        # Ids of real skills map straight to their name (loaded at startup).
+        # Otherwise: known-bad ids 404 without touching Neo4j, and ids that
+        # fuzzy-resolved before reuse that result.
+        miss_key = make_key("skill_miss", skill_id=skill_id)
+        canon_key = make_key("skill_canon", skill_id=skill_id)
+        canonical = skill_name_for_id(skill_id)
+        if not canonical:
+            missed, canonical = await cache.mget([miss_key, canon_key])
+            if missed:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Skill not found: {skill_name}. Please try searching from the Jobs page."
+                )
+
+        logger.debug("Looking for skill %r (from ID: %s) with year: %s", canonical or skill_name, skill_id, year)
+
+        # Resolves exact (case-insensitive) then partial matches itself. The graph
+        # data is year-independent, so every year's detail key shares one fetch.
+        lookup_name = canonical or skill_name
+        skill_detail = await cache.get_or_set(
+            make_key("skill_graph", skill=lookup_name),
+            lambda: repo.get_complete_skill_detail(lookup_name),
+            ttl=SKILL_GRAPH_TTL_SECONDS,
+        )
+
+        if not skill_detail:
+            logger.debug("Skill not found: %s", skill_name)
+            await cache.put(miss_key, True, ttl=SKILL_MISS_TTL_SECONDS)
+            raise HTTPException(
+                status_code=404,
+                detail=f"Skill not found: {skill_name}. Please try searching from the Jobs page."
             )
-            record = await result.single()
-            if record:
-                exact_name = record["name"]
-                print(f"✅ Found skill with exact match: {exact_name}")
-                skill_detail = await repo.get_complete_skill_detail(exact_name)
-    
-    if not skill_detail:
-        print(f"❌ Skill not found: {skill_name}")
-        raise HTTPException(
-            status_code=404,
-            detail=f"Skill not found: {skill_name}. Please try searching from the Jobs page."
+        if not canonical:
+            await cache.put(canon_key, skill_detail["basic_info"]["skill_name"], ttl=SKILL_CANON_TTL_SECONDS)
+
+        # The cached graph dict is shared; copy what gets rewritten below
+        skill_detail = {**skill_detail, "metrics": [dict(m) for m in skill_detail["metrics"]]}
+
+        # Get ALL jobs that require this skill from Neo4j
+        jobs_from_neo4j = skill_detail.get("top_jobs", [])
+        logger.debug("Received %d jobs from Neo4j for %s", len(jobs_from_neo4j), skill_name)
+
+        # Enhance each job with BLS employment and salary data for the selected year
+        # (one batched lookup for all occupations)
+        bls_by_code = await job_detail_repo.get_jobs_by_occ_codes(
+            [j["soc_code"].replace(".00", "") for j in jobs_from_neo4j if j.get("soc_code")], year
         )
-    
-    # Get ALL jobs that require this skill from Neo4j
-    jobs_from_neo4j = skill_detail.get("top_jobs", [])
-    print(f"📊 Received {len(jobs_from_neo4j)} jobs from Neo4j for {skill_name}")
-    
-    # Enhance each job with BLS employment and salary data for the selected year
-    enhanced_jobs = []
-    jobs_without_data = 0
-    
-    for job in jobs_from_neo4j:
-        soc_code = job.get("soc_code")
-        if soc_code:
-            # Get BLS data for this occupation for the specific year
-            bls_data = await job_detail_repo.get_job_by_occ_code(soc_code.replace(".00", ""), year)
-            if bls_data:
-                # Get employment (tot_emp) - this is the actual number of people employed in this occupation
-                employment = bls_data.get("tot_emp")
-                # Only include jobs that have employment data and it's > 0
-                if employment and employment > 0:
-                    job_with_bls = job.copy()
-                    job_with_bls["median_salary"] = bls_data.get("a_median")
-                    job_with_bls["employment"] = employment
-                    enhanced_jobs.append(job_with_bls)
+        enhanced_jobs = []
+        jobs_without_data = 0
+
+        for job in jobs_from_neo4j:
+            soc_code = job.get("soc_code")
+            if soc_code:
+                bls_data = bls_by_code.get(soc_code.replace(".00", ""))
+                if bls_data:
+                    # Get employment (tot_emp) - this is the actual number of people employed in this occupation
+                    employment = bls_data.get("tot_emp")
+                    # Only include jobs that have employment data and it's > 0
+                    if employment and employment > 0:
+                        job_with_bls = job.copy()
+                        job_with_bls["median_salary"] = bls_data.get("a_median")
+                        job_with_bls["employment"] = employment
+                        enhanced_jobs.append(job_with_bls)
+                    else:
+                        jobs_without_data += 1
                 else:
                     jobs_without_data += 1
             else:
                 jobs_without_data += 1
-        else:
-            jobs_without_data += 1
-    
-    print(f"📊 After BLS enhancement: {len(enhanced_jobs)} jobs with employment data, {jobs_without_data} jobs skipped")
-    
-    # SORT BY EMPLOYMENT (number of people in the occupation) - HIGHEST FIRST
-    enhanced_jobs.sort(key=lambda x: x.get("employment", 0) or 0, reverse=True)
-    
-    # Log the top jobs and their employment numbers for debugging
-    print(f"📊 Top jobs for {skill_name} sorted by employment (year {year}):")
-    for i, job in enumerate(enhanced_jobs[:10]):  # Show top 10
-        print(f"  {i+1}. {job['title']}: {job.get('employment', 0):,} employed, ${job.get('median_salary', 0):,} median salary")
-    
-    # Update the skill detail with ALL enhanced and sorted jobs
-    skill_detail["top_jobs"] = enhanced_jobs  # Store ALL jobs
-    skill_detail["year"] = year  # Add year to response
-    
-    # Update the KPI to match the number of jobs we're actually displaying
-    # Find the "Jobs Requiring" metric and update its value
-    for metric in skill_detail["metrics"]:
-        if metric["title"] == "Jobs Requiring":
-            metric["value"] = len(enhanced_jobs)
-            break
-    
-    # Update the total_jobs_count to match
-    skill_detail["total_jobs_count"] = len(enhanced_jobs)
-    
-    response = SkillDetailResponse(**skill_detail)
-    cache.set(cache_key, response.dict())
-    return response
+
+        logger.debug("After BLS enhancement: %d jobs with employment data, %d jobs skipped", len(enhanced_jobs), jobs_without_data)
+
+        # SORT BY EMPLOYMENT (number of people in the occupation) - HIGHEST FIRST
+        enhanced_jobs.sort(key=lambda x: x.get("employment", 0) or 0, reverse=True)
+
+        # Log the top jobs and their employment numbers for debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Top jobs for %s sorted by employment (year %s): %s",
+                skill_name, year,
+                [(j["title"], j.get("employment"), j.get("median_salary")) for j in enhanced_jobs[:10]],
+            )
+
+        # Update the skill detail with ALL enhanced and sorted jobs
+        skill_detail["top_jobs"] = enhanced_jobs  # Store ALL jobs
+        skill_detail["year"] = year  # Add year to response
+
+        # Update the KPI to match the number of jobs we're actually displaying
+        # Find the "Jobs Requiring" metric and update its value
+        for metric in skill_detail["metrics"]:
+            if metric["title"] == "Jobs Requiring":
+                metric["value"] = len(enhanced_jobs)
+                break
+
+        # Update the total_jobs_count to match
+        skill_detail["total_jobs_count"] = len(enhanced_jobs)
+
+        response = SkillDetailResponse(**skill_detail)
+        return response.model_dump(mode="json")
+
+    return await cached_json_response(request, cache_key, build, tags=(BLS_OEWS_TAG,))
 
 
 @router.get("/{skill_id}/jobs")
 async def get_skill_jobs(
+    request: Request,
     skill_id: str,
     year: int = Query(..., description="Year for salary data (2011-2024)"),
     limit: int = Query(10, ge=1, le=50),
-    neo4j_driver: AsyncDriver = Depends(get_neo4j_driver),
-    mongodb: "AgnosticDatabase" = Depends(get_db),
-) -> List[dict]:
+    repo: SkillRepo = Depends(get_skill_repo),
+    job_detail_repo: JobDetailRepo = Depends(get_job_detail_repo),
+) -> Response:
     """Get top jobs for a specific skill with year-specific salary data.
     Jobs are sorted by total employment (number of people in that occupation)
     for the selected year, highest first."""
     cache_key = f"skill_jobs_{skill_id}_{year}_{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = SkillRepo(neo4j_driver)
-    job_detail_repo = JobDetailRepo(mongodb)
-    
-    skill_name = skill_id.replace("_", " ").replace("-", " ").title()
-    
-    # Get ALL jobs from Neo4j (the method now returns all jobs regardless of limit param)
-    jobs = await repo.get_top_jobs_for_skill(skill_name, limit=limit)  # limit param is ignored in the method
-    print(f"📊 Received {len(jobs)} jobs from Neo4j for {skill_name} in /jobs endpoint")
-    
-    # Enhance with BLS data for the selected year
-    enhanced_jobs = []
-    for job in jobs:
-        soc_code = job.get("soc_code")
-        if soc_code:
-            bls_data = await job_detail_repo.get_job_by_occ_code(soc_code.replace(".00", ""), year)
-            if bls_data:
-                employment = bls_data.get("tot_emp")
-                if employment and employment > 0:
-                    job_with_bls = job.copy()
-                    job_with_bls["median_salary"] = bls_data.get("a_median")
-                    job_with_bls["employment"] = employment
-                    enhanced_jobs.append(job_with_bls)
-    
-    # Sort by employment (number of people employed) - highest first
-    enhanced_jobs.sort(key=lambda x: x.get("employment", 0) or 0, reverse=True)
-    
-    # Log top jobs for debugging
-    print(f"📊 Sorted jobs for {skill_name}: got {len(enhanced_jobs)} jobs with employment data")
-    for i, job in enumerate(enhanced_jobs[:5]):
-        print(f"  {i+1}. {job['title']}: {job.get('employment', 0):,} employed")
-    
-    # Apply the requested limit AFTER sorting
-    result = enhanced_jobs[:limit]
-    print(f"📤 Returning {len(result)} jobs (limited to {limit})")
-    
-    cache.set(cache_key, result)
-    return result
+
+    async def build():
+        skill_name = skill_name_for_id(skill_id) or skill_id.translate(_ID_TO_NAME).title()
+
+        # Get ALL jobs from Neo4j (the method now returns all jobs regardless of limit param)
+        jobs = await repo.get_top_jobs_for_skill(skill_name, limit=limit)  # limit param is ignored in the method
+        logger.debug("Received %d jobs from Neo4j for %s in /jobs endpoint", len(jobs), skill_name)
+
+        # Enhance with BLS data for the selected year (one batched lookup)
+        bls_by_code = await job_detail_repo.get_jobs_by_occ_codes(
+            [j["soc_code"].replace(".00", "") for j in jobs if j.get("soc_code")], year
+        )
+        enhanced_jobs = []
+        for job in jobs:
+            soc_code = job.get("soc_code")
+            if soc_code:
+                bls_data = bls_by_code.get(soc_code.replace(".00", ""))
+                if bls_data:
+                    employment = bls_data.get("tot_emp")
+                    if employment and employment > 0:
+                        job_with_bls = job.copy()
+                        job_with_bls["median_salary"] = bls_data.get("a_median")
+                        job_with_bls["employment"] = employment
+                        enhanced_jobs.append(job_with_bls)
+
+        # Top `limit` by employment (number of people employed) - highest first;
+        # same order as a full sort + slice without sorting every job
+        result = heapq.nlargest(limit, enhanced_jobs, key=lambda x: x.get("employment", 0) or 0)
+
+        # Log top jobs for debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Sorted jobs for %s: %d with employment data, returning %d (limit %d), top=%s",
+                skill_name, len(enhanced_jobs), len(result), limit,
+                [(j["title"], j.get("employment")) for j in result[:5]],
+            )
+        return result
+
+    return await cached_json_response(request, cache_key, build, tags=(BLS_OEWS_TAG,))
 
 
 @router.get("/{skill_id}/co-occurring")
 async def get_co_occurring_skills(
+    request: Request,
     skill_id: str,
     limit: int = Query(None, ge=1, le=1000),  # Optional limit, can get all
-    neo4j_driver: AsyncDriver = Depends(get_neo4j_driver),
-) -> List[dict]:
+    repo: SkillRepo = Depends(get_skill_repo),
+) -> Response:
     """Get co-occurring skills for a specific skill.
     If no limit provided, returns all co-occurring skills."""
     cache_key = f"skill_cooccurring_{skill_id}_{limit}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = SkillRepo(neo4j_driver)
-    skill_name = skill_id.replace("_", " ").replace("-", " ").title()
-    
-    # Pass limit=None to get all skills
-    skills = await repo.get_co_occurring_skills(skill_name, limit=limit)
-    
-    # Log the breakdown by type for debugging
-    if skills:
-        type_counts: Dict[str, int] = {}
-        for skill in skills:
-            skill_type = skill.get("type", "unknown")
-            type_counts[skill_type] = type_counts.get(skill_type, 0) + 1
-        
-        print(f"📊 Co-occurring skills for {skill_name} - breakdown by type:")
-        for skill_type, count in type_counts.items():
-            print(f"  - {skill_type}: {count}")
-    
-    cache.set(cache_key, skills)
-    return skills
+
+    async def build():
+        skill_name = skill_name_for_id(skill_id) or skill_id.translate(_ID_TO_NAME).title()
+
+        # Pass limit=None to get all skills
+        skills = await repo.get_co_occurring_skills(skill_name, limit=limit)
+
+        # Log the breakdown by type for debugging
+        if skills and logger.isEnabledFor(logging.DEBUG):
+            type_counts: Dict[str, int] = {}
+            for skill in skills:
+                skill_type = skill.get("type", "unknown")
+                type_counts[skill_type] = type_counts.get(skill_type, 0) + 1
+            logger.debug("Co-occurring skills for %s - breakdown by type: %s", skill_name, type_counts)
+        return skills
+
+    return await cached_json_response(request, cache_key, build)
 
 
 @router.get("/{skill_id}/metrics")
 async def get_skill_metrics(
+    request: Request,
     skill_id: str,
-    neo4j_driver: AsyncDriver = Depends(get_neo4j_driver),
-) -> dict:
+    repo: SkillRepo = Depends(get_skill_repo),
+) -> Response:
     """Get metrics for a specific skill"""
     cache_key = f"skill_metrics_{skill_id}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    repo = SkillRepo(neo4j_driver)
-    skill_name = skill_id.replace("_", " ").replace("-", " ").title()
-    
-    metrics = await repo.get_skill_metrics(skill_name)
-    
-    cache.set(cache_key, metrics)
-    return metrics
\ No newline at end of file
+
+    async def build():
+        skill_name = skill_name_for_id(skill_id) or skill_id.translate(_ID_TO_NAME).title()
+
+        metrics = await repo.get_skill_metrics(skill_name)
+        return metrics
+
+    return await cached_json_response(request, cache_key, build)
@@ -1,4 +1,5 @@
 import os
+from typing import Any, Dict
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 
@@ -7,28 +8,141 @@ load_dotenv()
 MONGO_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 MONGO_DB_NAME = os.getenv("MONGODB_DB_NAME", "jobdb")
 
+# Pool sizing: dashboard handlers fan out several queries at once, so keep a
+# warm floor of connections and bound how long a request waits for one.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "200"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+# Connections the pool may be establishing at once; caps the burst of TCP/TLS
+# handshakes when a cold worker's first gather() fans out
+MONGO_MAX_CONNECTING = int(os.getenv("MONGODB_MAX_CONNECTING", "4"))
+
+# Wire compression for large aggregation results (trend series, compositions).
+# The driver negotiates the first one the server supports and skips (with a
+# warning) any whose Python package is missing (zstd needs `zstandard`).
+MONGO_COMPRESSORS = os.getenv("MONGODB_COMPRESSORS", "zstd,zlib")
+MONGO_ZLIB_LEVEL = int(os.getenv("MONGODB_ZLIB_LEVEL", "-1"))
+
 # Global connection objects
 mongo_client = None
 database = None
 
 async def connect_to_mongo():
     global mongo_client, database
-    try:
-        mongo_client = AsyncIOMotorClient(MONGO_URL)
-        database = mongo_client[MONGO_DB_NAME]
-        # Test connection
-        await database.command("ping")
-        print(f"✓ Connected to MongoDB at {MONGO_URL}")
+    # One client per process: every get_db() shares this pool
+    if mongo_client is not None:
         return True
+    client = None
+    try:
+        client = AsyncIOMotorClient(
+            MONGO_URL,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            maxConnecting=MONGO_MAX_CONNECTING,
+            retryWrites=True,
+            readPreference="primaryPreferred",
+            compressors=MONGO_COMPRESSORS,
+            zlibCompressionLevel=MONGO_ZLIB_LEVEL,
+        )
+        db = client[MONGO_DB_NAME]
+        # Test connection (also opens the first pooled connection)
+        await db.command("ping")
     except Exception as e:
         print(f"✗ Error connecting to MongoDB: {e}")
+        if client is not None:
+            client.close()
         return False
+    if mongo_client is not None:
+        # A concurrent call connected first; keep its pool
+        client.close()
+        return True
+    # Publish only a client that answered, so a later call retries a failed one
+    mongo_client, database = client, db
+    print(f"✓ Connected to MongoDB at {MONGO_URL}")
+    return True
 
 async def close_mongo_connection():
-    global mongo_client
+    global mongo_client, database
     if mongo_client:
         mongo_client.close()
+        mongo_client = None
+        database = None
         print("MongoDB connection closed")
 
 def get_mongo_db():
-    return database
\ No newline at end of file
+    return database
+
+# (collection, keys, options) for the indexes the API's hot queries rely on
+_INDEXES = (
+    # jobs-in-industry: equality on naics/year, then sort + limit by tot_emp
+    ("bls_oews", [("naics", 1), ("year", 1), ("tot_emp", -1)], {"name": "naics_year_tot_emp"}),
+    # naics_title lookup: equality on naics/year, title read from the index
+    ("bls_oews", [("naics", 1), ("year", 1), ("naics_title", 1)], {"name": "naics_year_title"}),
+    # industry search: equality on occ_code/year, title/code regexes checked on
+    # index keys. Default collation, so the search query must not set one.
+    (
+        "bls_oews",
+        [("occ_code", 1), ("year", 1), ("naics_title", 1), ("naics", 1)],
+        {"name": "occ_year_naics_title_code"},
+    ),
+    # BLS job lookups (skills, job detail): equality on occ_code/year, then the
+    # highest-tot_emp row per occupation. Not unique: one row per industry.
+    ("bls_oews", [("occ_code", 1), ("year", 1), ("tot_emp", -1)], {"name": "occ_year_tot_emp"}),
+    # salary-employment jobs table / YoY map: equality on year, occ_title range;
+    # the year prefix also serves latest_year()'s sort
+    ("bls_oews", [("year", 1), ("occ_title", 1), ("occ_code", 1)], {"name": "year_occ_title_code"}),
+    # salary-employment industries table / YoY map: "All Occupations" rows per year
+    (
+        "bls_oews",
+        [("occ_title", 1), ("year", 1), ("naics", 1), ("naics_title", 1)],
+        {"name": "occ_title_year_naics"},
+    ),
+    # mv_top_jobs_trends: one doc per (group, sort_by)
+    ("mv_top_jobs_trends", [("group", 1), ("sort_by", 1)], {"name": "group_sort_by", "unique": True}),
+)
+
+
+async def ensure_indexes():
+    """Create the indexes the API's hot queries rely on (no-op if they exist)."""
+    if database is None:
+        return
+    failed = 0
+    for collection, keys, options in _INDEXES:
+        # One at a time, so a conflicting index doesn't skip the rest
+        try:
+            await database[collection].create_index(keys, **options)
+        except Exception as e:
+            failed += 1
+            print(f"⚠️ Could not ensure index {collection}.{options['name']}: {e}")
+    print(f"✓ MongoDB indexes ensured ({len(_INDEXES) - failed}/{len(_INDEXES)})")
+
+def pool_status() -> Dict[str, Any]:
+    """Configured pool limits plus what the driver currently knows about each server."""
+    if mongo_client is None:
+        return {"connected": False}
+
+    pool = mongo_client.options.pool_options
+    topology = mongo_client.topology_description
+    return {
+        "connected": True,
+        "topology_type": topology.topology_type_name,
+        "max_pool_size": pool.max_pool_size,
+        "min_pool_size": pool.min_pool_size,
+        "max_idle_time_seconds": pool.max_idle_time_seconds,
+        "wait_queue_timeout": pool.wait_queue_timeout,
+        "max_connecting": pool.max_connecting,
+        "compressors": MONGO_COMPRESSORS.split(","),
+        "servers": [
+            {
+                "address": f"{host}:{port}",
+                "type": sd.server_type_name,
+                "round_trip_time_ms": round(sd.round_trip_time * 1000, 2) if sd.round_trip_time is not None else None,
+            }
+            for (host, port), sd in topology.server_descriptions().items()
+        ],
+    }
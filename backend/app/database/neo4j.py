@@ -1,34 +1,82 @@
 from neo4j import AsyncGraphDatabase
+import asyncio
 from typing import Optional
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Pool sizing: every skills/search request opens its own session, and skill
+# detail fans out several queries at once through asyncio.gather. The pool is
+# per worker process, so size it as roughly
+#   (peak concurrent requests / uvicorn workers) * queries per request + headroom
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "200"))
+NEO4J_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "30"))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+# Pooled connections idle longer than this are checked before reuse, so one
+# dropped by a load balancer/firewall fails there rather than mid-query
+NEO4J_LIVENESS_CHECK_TIMEOUT = float(os.getenv("NEO4J_LIVENESS_CHECK_TIMEOUT", "30"))
+# Named explicitly on every session so the driver skips the home-database lookup
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+# Bolt connections opened at startup so the first requests skip the handshake
+NEO4J_WARM_CONNECTIONS = int(os.getenv("NEO4J_WARM_CONNECTIONS", str(min(NEO4J_MAX_POOL_SIZE // 2, 20))))
+
 class Neo4jConnection:
     _instance = None
+    # Serializes first-time setup so concurrent cold requests share one driver
+    _init_lock = asyncio.Lock()
 
     @classmethod
     async def get_driver(cls):
-        if cls._instance is None:
+        if cls._instance is not None:
+            return cls._instance
+        async with cls._init_lock:
+            if cls._instance is not None:
+                return cls._instance
+
             uri = os.getenv("NEO4J_URI")
             user = os.getenv("NEO4J_USER")
             password = os.getenv("NEO4J_PASSWORD")
 
             print(f"🔌 Connecting to Neo4j at {uri} as {user}")
 
-            cls._instance = AsyncGraphDatabase.driver(
+            driver = AsyncGraphDatabase.driver(
                 uri,
-                auth=(user, password)
+                auth=(user, password),
+                max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+                connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT,
+                max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+                keep_alive=True,
+                liveness_check_timeout=NEO4J_LIVENESS_CHECK_TIMEOUT,
             )
 
-            # Better connectivity check
-            await cls._instance.verify_connectivity()
+            # Better connectivity check; only a verified driver is published
+            try:
+                await driver.verify_connectivity()
+            except Exception:
+                await driver.close()
+                raise
+            cls._instance = driver
 
             print("✅ Neo4j connection successful")
 
+            await cls._ensure_indexes()
+
         return cls._instance
 
+    @classmethod
+    async def _ensure_indexes(cls):
+        """Full-text index behind skill search (no-op if it exists)."""
+        try:
+            async with cls._instance.session(database=NEO4J_DATABASE) as session:
+                await session.run(
+                    "CREATE FULLTEXT INDEX skill_name_ft IF NOT EXISTS "
+                    "FOR (s:Skill) ON EACH [s.name]"
+                )
+            print("✓ Neo4j indexes ensured")
+        except Exception as e:
+            print(f"⚠️ Could not ensure Neo4j indexes: {e}")
+
     @classmethod
     async def close(cls):
         if cls._instance:
@@ -36,5 +84,30 @@ class Neo4jConnection:
             cls._instance = None
 
 
+# The one driver (and Bolt pool) per process lives on Neo4jConnection; these
+# mirror connect_to_mongo / close_mongo_connection for the app lifespan.
+async def connect_to_neo4j():
+    return await Neo4jConnection.get_driver()
+
+
+async def warm_neo4j_pool(connections: int = NEO4J_WARM_CONNECTIONS) -> int:
+    """Open `connections` pooled connections concurrently; returns how many succeeded."""
+    driver = await Neo4jConnection.get_driver()
+
+    async def _warm():
+        async with driver.session(database=NEO4J_DATABASE) as session:
+            result = await session.run("RETURN 1")
+            await result.consume()
+
+    results = await asyncio.gather(*(_warm() for _ in range(connections)), return_exceptions=True)
+    return sum(1 for r in results if not isinstance(r, Exception))
+
+
+async def close_neo4j_connection():
+    if Neo4jConnection._instance is not None:
+        await Neo4jConnection.close()
+        print("Neo4j connection closed")
+
+
 async def get_neo4j_driver():
-    return await Neo4jConnection.get_driver()
\ No newline at end of file
+    return Neo4jConnection._instance or await Neo4jConnection.get_driver()
\ No newline at end of file
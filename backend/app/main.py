@@ -1,63 +1,123 @@
 # app/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
-from app.database.mongodb import connect_to_mongo, close_mongo_connection
+from app.database.mongodb import connect_to_mongo, close_mongo_connection, get_mongo_db, pool_status, ensure_indexes
 from app.api.endpoints import router as api_router
+from app.api.routers.jobs import router as jobs_router
+from app.services.cache import cache
+from app.services.http_cache import check_cached_routes
+from app.services.invalidation import run_bls_oews_watcher
+from app.services.warmup import warm_hot_keys
+from app.services.route_warmup import warm_routes
+from app.services.materialized import run_materialize_schedule
+from app.database.neo4j import connect_to_neo4j, warm_neo4j_pool, close_neo4j_connection
+from app.api.crud.skill_repo import load_skill_ids
 import uvicorn
 import asyncio
-import subprocess
-import sys
-import os
+import httpx
+
+try:
+    import uvloop  # installed by uvicorn[standard] on Linux/macOS
+except ImportError:  # e.g. Windows: stay on the default asyncio loop
+    uvloop = None
+
+try:
+    import httptools  # C HTTP parser, also from uvicorn[standard]
+except ImportError:
+    httptools = None
 
 async def warmup_cache():
-    """Run warmup script in background without blocking startup"""
+    """Warm the page cache in the background without blocking startup"""
     try:
         # Wait a bit for the server to fully start
         await asyncio.sleep(2)
         
-        # Get the path to the warmup script
-        script_path = os.path.join(os.path.dirname(__file__), "..", "scripts", "warmup.py")
-        
-        # Run warmup in a subprocess so it doesn't block
-        subprocess.Popen([sys.executable, script_path])
-        print("🔥 Cache warmup started in background")
+        # Requests go straight into this app over ASGI: no second interpreter,
+        # and they reuse this worker's connection pools
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://warmup", timeout=30.0) as client:
+            print("🔥 Cache warmup started in background")
+            await warm_routes(client)
+        print("✅ Cache warmup finished")
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
-        print(f"⚠️ Failed to start cache warmup: {e}")
+        print(f"⚠️ Cache warmup failed: {e}")
+
+async def warm_neo4j():
+    """
+    Connect to Neo4j, pre-open part of the Bolt pool, then load the skill
+    id -> name map for the /skills routes (they fall back to fuzzy lookup
+    until it loads).
+    """
+    try:
+        driver = await connect_to_neo4j()
+        opened = await warm_neo4j_pool()
+        print(f"✅ Neo4j pool warmed ({opened} connections)")
+        count = await load_skill_ids(driver)
+        print(f"✅ Loaded {count} skill ids")
+    except Exception as e:
+        print(f"⚠️ Could not warm Neo4j: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
-    print("✅ Backend started successfully!")
+    await ensure_indexes()
+    await cache.connect()
+    print(f"✅ Backend started successfully! (event loop: {type(asyncio.get_running_loop()).__module__})")
     
     # Start cache warmup in background
-    asyncio.create_task(warmup_cache())
+    page_warmup = asyncio.create_task(warmup_cache())
+    neo4j_warmup = asyncio.create_task(warm_neo4j())
+
+    # Drop bls_oews-derived caches whenever the collection changes (one watcher per deployment)
+    watcher = None
+    hot_warmup = None
+    materialize = None
+    if get_mongo_db() is not None:
+        watcher = asyncio.create_task(run_bls_oews_watcher(get_mongo_db()))
+        # Latest-year jobs dashboards + top job details, in this worker
+        hot_warmup = asyncio.create_task(warm_hot_keys(get_mongo_db()))
+        # Nightly rebuild of the precomputed top-jobs trends
+        materialize = asyncio.create_task(run_materialize_schedule(get_mongo_db()))
     
     yield
+    for task in (page_warmup, neo4j_warmup, watcher, hot_warmup, materialize):
+        if task is not None:
+            task.cancel()
     # Shutdown
     await close_mongo_connection()
+    await close_neo4j_connection()
+    await cache.close()
     print("👋 Backend shut down")
 
 app = FastAPI(
     title="FullStack API", 
     version="1.0.0", 
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Frontend dev origins; a frozenset so CORSMiddleware's per-request
+# `origin in allow_origins` check is a hash lookup
+CORS_ORIGINS = frozenset({
+    "http://localhost:5173",
+    "http://localhost:3000",
+    "http://localhost:8080",
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:8080",
+    "http://localhost:8081",
+    "http://127.0.0.1:8081",
+})
+
 # ===== SINGLE CORS MIDDLEWARE - MUST BE FIRST =====
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",
-        "http://localhost:3000",
-        "http://localhost:8080",
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:8080",
-        "http://localhost:8081",
-        "http://127.0.0.1:8081",
-    ],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -67,6 +127,25 @@ app.add_middleware(
 # Include API router
 app.include_router(api_router, prefix="/api")
 
+
+def _check_unique_routes(app: FastAPI) -> None:
+    """A second router registering the same method + path would silently shadow the first."""
+    seen = set()
+    dupes = []
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ():
+            key = (method, route.path)
+            if key in seen:
+                dupes.append(f"{method} {route.path}")
+            seen.add(key)
+    if dupes:
+        raise RuntimeError(f"Duplicate routes registered: {dupes}")
+
+
+_check_unique_routes(app)
+# Every jobs route goes through @cached (or opts out with store=False)
+check_cached_routes(jobs_router)
+
 @app.get("/")
 async def root():
     return {"message": "FullStack API is running"}
@@ -75,5 +154,28 @@ async def root():
 async def health():
     return {"status": "healthy", "service": "fullstack-api"}
 
+@app.get("/health/pool")
+async def health_pool():
+    return pool_status()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Cache hit/miss counters per route, in Prometheus text format."""
+    lines = [
+        "# HELP cache_requests_total Cache lookups by route and outcome.",
+        "# TYPE cache_requests_total counter",
+    ]
+    for route, counts in sorted(cache.stats().items()):
+        for outcome, n in counts.items():
+            lines.append(f'cache_requests_total{{route="{route}",result="{outcome}"}} {n}')
+    return "\n".join(lines) + "\n"
+
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        loop="uvloop" if uvloop is not None else "asyncio",
+        http="httptools" if httptools is not None else "h11",
+    )
\ No newline at end of file
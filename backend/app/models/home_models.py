@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 
+from app.models.industry_models import (
+    IndustryDashboardMetrics,
+    IndustryListResponse,
+    IndustryTopResponse,
+    IndustryTopTrendsResponse,
+)
+from app.models.job_models import JobDashboardMetrics, JobTopResponse
+
 
 class Trend(BaseModel):
     value: float
-    direction: str  # "up" | "down"
+    direction: Literal["up", "down"]
 
 
 class OverviewMetric(BaseModel):
@@ -17,11 +25,6 @@ class OverviewMetric(BaseModel):
     color: str  # "cyan" | "purple" | "coral" | "green" | "amber"
 
 
-class HomeOverviewResponse(BaseModel):
-    year: int
-    metrics: List[OverviewMetric]
-
-
 class IndustryDistributionItem(BaseModel):
     name: str
     value: float
@@ -65,7 +68,7 @@ class EmploymentTrendsResponse(BaseModel):
 class MarketTickerItem(BaseModel):
     name: str
     value: str
-    trend: str  # "up" | "down" | "neutral"
+    trend: Literal["up", "down", "neutral"]
 
 
 class MarketTickerResponse(BaseModel):
@@ -79,3 +82,14 @@ class HomeOverviewResponse(BaseModel):
     unique_job_titles: int
     industry_trend_pct: float  # YoY % change in total employment
     median_annual_salary: float
+
+
+class HomeDashboardResponse(BaseModel):
+    """Everything the home page renders, in one round-trip."""
+    year: int
+    industry_metrics: IndustryDashboardMetrics
+    industries: IndustryListResponse
+    top_industries: IndustryTopResponse
+    industry_trends: IndustryTopTrendsResponse
+    top_jobs: JobTopResponse
+    job_metrics: JobDashboardMetrics
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import List, Optional
 from typing import Any, Dict, List
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 import math
 
 
@@ -25,6 +25,10 @@ class JobDetail(BaseModel):
     median_salary: Optional[float] = None
 
 
+def page_count(total: int, page_size: int) -> int:
+    return math.ceil(total / page_size) if total > 0 else 1
+
+
 class IndustryJobsResponse(BaseModel):
     naics: str
     naics_title: str
@@ -33,10 +37,11 @@ class IndustryJobsResponse(BaseModel):
     page_size: int
     total: int
     jobs: List[JobDetail]
-    
+
+    @computed_field
     @property
     def total_pages(self) -> int:
-        return math.ceil(self.total / self.page_size) if self.total > 0 else 1
+        return page_count(self.total, self.page_size)
 
 
 class IndustryTopJobsResponse(BaseModel):
@@ -90,6 +95,20 @@ class IndustryDashboardMetrics(BaseModel):
     top_growing_industry: Optional[TopGrowingIndustry] = None
     median_industry_salary: float
 
+
+def industry_dashboard_metrics(data: Dict[str, Any]) -> IndustryDashboardMetrics:
+    """IndustryRepo.dashboard_metrics() row -> response model (shared by /industries and /home)."""
+    top = data.get("top_growing_industry")
+    return IndustryDashboardMetrics(
+        year=data["year"],
+        total_industries=data["total_industries"],
+        total_employment=data["total_employment"],
+        avg_industry_growth_pct=data["avg_industry_growth_pct"],
+        top_growing_industry=TopGrowingIndustry(**top) if top else None,
+        median_industry_salary=data["median_industry_salary"],
+    )
+
+
 class IndustryCard(BaseModel):
     naics: str
     naics_title: str
@@ -135,23 +154,6 @@ class IndustryCompositionResponse(BaseModel):
     limit: int
     rows: List[IndustryCompositionRow]
 
-class IndustryTopOccRow(BaseModel):
-    industry: str
-    occ1_emp: float = 0
-    occ2_emp: float = 0
-    occ3_emp: float = 0
-
-class IndustryTopOccLegendItem(BaseModel):
-    key: str        # "occ1_emp" | "occ2_emp" | "occ3_emp"
-    name: str       # occupation title shown in legend
-
-class IndustryTopOccCompositionResponse(BaseModel):
-    year: int
-    industries_limit: int
-    top_n_occ: int
-    rows: List[IndustryTopOccRow]
-    legend: List[IndustryTopOccLegendItem]
-
 class IndustryTopOccLegendItem(BaseModel):
     key: str           # e.g. "occ1_emp"
     name: str          # e.g. "Registered Nurses"
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import List, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 class JobItem(BaseModel):
@@ -169,3 +169,9 @@ class JobIndustryJobsResponse(BaseModel):
     year: int
     count: int
     jobs: List[JobIndustryJob]
+
+
+# Whole-list validators/serializers, built once; one core call per list
+# instead of a Python loop of model constructions
+JobItemList = TypeAdapter(List[JobItem])
+JobCardList = TypeAdapter(List[JobCard])
@@ -1,54 +1,593 @@
 # backend/app/services/cache.py
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Iterable, Set, Tuple
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import asyncio
 import hashlib
-import json
+import os
+import re
+import time
+import uuid
+
+import orjson
+from dotenv import load_dotenv
+
+from app.services.singleflight import SingleFlight
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis is optional; without it we only cache in-process
+    aioredis = None
+
+load_dotenv()
+
+# Shared L2 cache. Leave REDIS_URL unset to run with the in-process cache only.
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+# How long past its TTL an entry may still be served while it is refreshed
+CACHE_STALE_SECONDS = int(os.getenv("CACHE_STALE_SECONDS", "3600"))
+# Cross-worker fill lock: other workers wait up to this long for the value
+CACHE_FILL_LOCK_MS = int(os.getenv("CACHE_FILL_LOCK_MS", "5000"))
+# In-process tier: bounded LRU. With Redis on, local copies also age out after
+# CACHE_L1_TTL_SECONDS so a missed invalidation message can't pin old data.
+CACHE_L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", "2048"))
+CACHE_L1_TTL_SECONDS = float(os.getenv("CACHE_L1_TTL_SECONDS", "30"))
+# Workers tell each other which local entries to drop over this channel
+INVALIDATION_CHANNEL = "cache:invalidate"
+# Extend a lock only while its value is still this process's origin id
+_RENEW_LOCK_LUA = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('expire', KEYS[1], ARGV[2]) else return 0 end"
+)
+# "Latest year" only moves when a new BLS release is ingested
+LATEST_YEAR_TTL_SECONDS = int(os.getenv("LATEST_YEAR_TTL_SECONDS", "300"))
+# A stale Redis hit is kept locally this long while its refresh runs
+CACHE_STALE_L1_SECONDS = int(os.getenv("CACHE_STALE_L1_SECONDS", "5"))
+
+
+# Cached values may carry numpy scalars (forecast models); encode them as plain numbers
+_DUMPS_OPTS = orjson.OPT_SERIALIZE_NUMPY
+
+# Bump to orphan every key built by make_key() at once (a global invalidation)
+CACHE_KEY_VERSION = os.getenv("CACHE_KEY_VERSION", "v1")
+
+# Leading word run of a legacy f-string key ("industries_list_2023" -> "industries_list")
+_LEGACY_ROUTE_RE = re.compile(r"[a-z]+(?:_[a-z]+)*(?=_|$)")
+
+
+def _route_of(key: str) -> str:
+    """Metrics label for a key: the make_key() route, or a legacy key's name part."""
+    parts = key.split(":")
+    if len(parts) == 3 and parts[0] == CACHE_KEY_VERSION:
+        return parts[1]
+    m = _LEGACY_ROUTE_RE.match(key)
+    return m.group(0) if m else "other"
+
+
+def make_key(route: str, **params: Any) -> str:
+    """
+    Stable cache key "<version>:<route>:<hash>" for a route and its params.
+    None params are dropped (so omitted == None) and the rest are hashed in
+    sorted order; the route stays readable for logs and invalidate_prefix().
+    """
+    norm = {k: v for k, v in params.items() if v is not None}
+    digest = hashlib.blake2b(orjson.dumps(norm, option=orjson.OPT_SORT_KEYS), digest_size=12).hexdigest()
+    return f"{CACHE_KEY_VERSION}:{route}:{digest}"
+
 
 class SimpleCache:
     def __init__(self):
-        self.cache: Dict[str, Any] = {}
+        self.cache: "OrderedDict[str, Any]" = OrderedDict()
         self.cache_times: Dict[str, datetime] = {}
-        self.ttl = timedelta(hours=3)  # Cache lasts 2 hours
-        
+        self.cache_ttls: Dict[str, timedelta] = {}
+        self.ttl = timedelta(hours=3)  # Cache lasts 3 hours
+        self.stale_ttl = timedelta(seconds=CACHE_STALE_SECONDS)
+
+        # L2 (Redis) client; connect() opens it at startup, else created lazily
+        self._redis = None
+        self._redis_disabled = False
+        # Single-flight: one in-flight fill per key in this process
+        self._flight = SingleFlight()
+        # tag -> keys cached under it, used for explicit invalidation
+        self._tags: Dict[str, Set[str]] = {}
+        # key -> its tags, so dropping a key only touches its own tag sets
+        self._key_tags: Dict[str, Set[str]] = {}
+        # key -> (value, serialized body, etag) so hits skip re-serialization
+        self._rendered: Dict[str, Tuple[Any, bytes, str]] = {}
+        # Background stale-while-revalidate refreshes, by key
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        # key -> monotonic deadline of the local copy (only while Redis is on)
+        self._l1_expires: Dict[str, float] = {}
+        # Identifies this process's own invalidation messages
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        # Called with each invalidated tag, here and (via pub/sub) in other workers
+        self._tag_hooks: List[Callable[[str], None]] = []
+        # route -> {"hit": n, "miss": n}, exported on /metrics
+        self._stats: Dict[str, Dict[str, int]] = {}
+
     def _generate_key(self, *args, **kwargs) -> str:
         """Generate a cache key from arguments"""
         key_parts = [str(arg) for arg in args]
         key_parts.extend([f"{k}:{v}" for k, v in sorted(kwargs.items())])
         key_string = "|".join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
-    
+
+    def _lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        """(value, is_stale). Entries past TTL + stale window are dropped."""
+        if key not in self.cache:
+            return None, False
+        l1_exp = self._l1_expires.get(key)
+        if l1_exp is not None and time.monotonic() > l1_exp:
+            # Local copy aged out; the caller falls through to Redis
+            self.delete(key)
+            return None, False
+        self.cache.move_to_end(key)
+        age = datetime.now() - self.cache_times[key]
+        ttl = self.cache_ttls.get(key, self.ttl)
+        if age < ttl:
+            return self.cache[key], False
+        if age < ttl + self.stale_ttl:
+            return self.cache[key], True
+        # Remove expired cache
+        print(f"⏰ Cache EXPIRED: {key[:20]}...")
+        self.delete(key)
+        return None, False
+
     def get(self, key: str) -> Optional[Any]:
-        if key in self.cache:
-            # Check if cache is still fresh
-            if datetime.now() - self.cache_times[key] < self.ttl:
-                print(f"✅ Cache HIT: {key[:20]}...")
-                return self.cache[key]
-            else:
-                # Remove expired cache
-                print(f"⏰ Cache EXPIRED: {key[:20]}...")
-                del self.cache[key]
-                del self.cache_times[key]
+        # Only fresh values; stale ones are served through get_or_set()
+        value, stale = self._lookup(key)
+        if value is not None and not stale:
+            print(f"✅ Cache HIT: {key[:20]}...")
+            return value
         return None
-    
-    def set(self, key: str, value: Any):
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
         self.cache[key] = value
+        self.cache.move_to_end(key)
         self.cache_times[key] = datetime.now()
+        if ttl is not None:
+            self.cache_ttls[key] = timedelta(seconds=ttl)
+        else:
+            self.cache_ttls.pop(key, None)
+        if self._redis is not None:
+            seconds = ttl if ttl is not None else self.ttl.total_seconds()
+            self._l1_expires[key] = time.monotonic() + min(seconds, CACHE_L1_TTL_SECONDS)
+        # Evict least recently used entries past the bound
+        while len(self.cache) > CACHE_L1_MAX_ENTRIES:
+            self.delete(next(iter(self.cache)))
         print(f"💾 Cache SET: {key[:20]}...")
-    
+
+    def delete(self, key: str):
+        self.cache.pop(key, None)
+        self.cache_times.pop(key, None)
+        self.cache_ttls.pop(key, None)
+        self._rendered.pop(key, None)
+        self._l1_expires.pop(key, None)
+        # Evicted/expired keys must not pile up in the tag index either
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _index_tags(self, key: str, tags: Iterable[str]):
+        """Record key under each tag (local index only)."""
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+            self._key_tags.setdefault(key, set()).add(tag)
+
+    def _record(self, key: str, outcome: str):
+        counts = self._stats.setdefault(_route_of(key), {"hit": 0, "miss": 0})
+        counts[outcome] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-route hit/miss counts for get_or_set lookups since startup."""
+        return {route: dict(counts) for route, counts in self._stats.items()}
+
     def clear(self):
         self.cache.clear()
         self.cache_times.clear()
+        self.cache_ttls.clear()
+        self._tags.clear()
+        self._key_tags.clear()
+        self._rendered.clear()
+        self._l1_expires.clear()
         print("🧹 Cache cleared")
-    
-    def get_or_set(self, key: str, func, *args, **kwargs):
-        """Get from cache or execute function and cache result"""
+
+    # -------------------------
+    # L2 (Redis)
+    # -------------------------
+    def _get_redis(self):
+        if self._redis is None and not self._redis_disabled and aioredis is not None and REDIS_URL:
+            self._redis = aioredis.from_url(REDIS_URL, max_connections=REDIS_MAX_CONNECTIONS)
+        return self._redis
+
+    async def connect(self):
+        """Open the Redis pool and ping it once so the first request doesn't pay for it."""
+        r = self._get_redis()
+        if r is None:
+            print("ℹ️ REDIS_URL not set (or redis not installed) - using in-process cache only")
+            return
+        try:
+            await r.ping()
+            print(f"✅ Connected to Redis (max_connections={REDIS_MAX_CONNECTIONS})")
+            self._listener = asyncio.create_task(self._listen_invalidations())
+        except Exception as e:
+            # Don't retry on every request; run with L1 only until restart
+            print(f"⚠️ Redis unavailable, using in-process cache only: {e}")
+            await r.aclose()
+            self._redis = None
+            self._redis_disabled = True
+
+    async def acquire_lock(self, name: str, ttl: int) -> bool:
+        """
+        Take lock:<name> for ttl seconds (SET NX EX) so one worker per
+        deployment does a job. Without Redis (or if it errors) each process
+        is on its own and the lock always succeeds.
+        """
+        r = self._get_redis()
+        if r is None:
+            return True
+        try:
+            return bool(await r.set(f"lock:{name}", self._origin, nx=True, ex=ttl))
+        except Exception as e:
+            print(f"⚠️ Redis lock failed for {name}, running locally: {e}")
+            return True
+
+    async def renew_lock(self, name: str, ttl: int) -> bool:
+        """Extend lock:<name> if this process still holds it (True without Redis)."""
+        r = self._get_redis()
+        if r is None:
+            return True
+        try:
+            return bool(await r.eval(_RENEW_LOCK_LUA, 1, f"lock:{name}", self._origin, ttl))
+        except Exception as e:
+            print(f"⚠️ Redis lock renewal failed for {name}: {e}")
+            return True
+
+    def add_tag_hook(self, hook: Callable[[str], None]):
+        """Run hook(tag) whenever a tag is invalidated, in every worker."""
+        self._tag_hooks.append(hook)
+
+    def _run_tag_hooks(self, tags: Iterable[str]):
+        for tag in tags:
+            for hook in self._tag_hooks:
+                hook(tag)
+
+    async def _publish_invalidation(self, keys: Iterable[str] = (), prefix: Optional[str] = None, tags: Iterable[str] = ()):
+        r = self._get_redis()
+        if r is None:
+            return
+        try:
+            msg = {"origin": self._origin, "keys": list(keys), "prefix": prefix, "tags": list(tags)}
+            await r.publish(INVALIDATION_CHANNEL, orjson.dumps(msg))
+        except Exception as e:
+            print(f"⚠️ Redis PUBLISH failed: {e}")
+
+    async def _listen_invalidations(self):
+        """Drop local copies that another worker replaced or invalidated."""
+        pubsub = self._redis.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                msg = orjson.loads(message["data"])
+                if msg.get("origin") == self._origin:
+                    continue
+                for key in msg.get("keys") or ():
+                    self.delete(key)
+                self._run_tag_hooks(msg.get("tags") or ())
+                prefix = msg.get("prefix")
+                if prefix:
+                    for key in [k for k in self.cache if k.startswith(prefix)]:
+                        self.delete(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Cache invalidation listener stopped: {e}")
+        finally:
+            await pubsub.aclose()
+
+    # L2 entries are {"v": value, "exp": fresh-until epoch} and live in Redis
+    # for TTL + stale window, so other workers can serve them stale too.
+    @staticmethod
+    def _l2_decode(raw: bytes) -> Tuple[Any, float]:
+        entry = orjson.loads(raw)
+        return entry["v"], float(entry["exp"])
+
+    async def _l2_get(self, key: str) -> Optional[Tuple[Any, float]]:
+        r = self._get_redis()
+        if r is None:
+            return None
+        try:
+            raw = await r.get(key)
+            return self._l2_decode(raw) if raw is not None else None
+        except Exception as e:
+            print(f"⚠️ Redis GET failed for {key[:20]}...: {e}")
+            return None
+
+    async def _l2_set(self, key: str, value: Any, ttl: int):
+        r = self._get_redis()
+        if r is None:
+            return
+        try:
+            raw = orjson.dumps({"v": value, "exp": time.time() + ttl}, option=_DUMPS_OPTS)
+            await r.set(key, raw, ex=ttl + int(self.stale_ttl.total_seconds()))
+        except Exception as e:
+            print(f"⚠️ Redis SET failed for {key[:20]}...: {e}")
+
+    async def _tag(self, key: str, tags: Iterable[str]):
+        tags = tuple(tags)
+        self._index_tags(key, tags)
+        for tag in tags:
+            r = self._get_redis()
+            if r is None:
+                continue
+            try:
+                await r.sadd(f"tag:{tag}", key)
+            except Exception as e:
+                print(f"⚠️ Redis SADD failed for tag {tag}: {e}")
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """Drop every key cached under `tag` (locally and in Redis)."""
+        self._run_tag_hooks((tag,))
+        keys = self._tags.pop(tag, set())
+        for key in keys:
+            self.delete(key)
+
+        r = self._get_redis()
+        if r is not None:
+            try:
+                members = await r.smembers(f"tag:{tag}")
+                async with r.pipeline(transaction=False) as pipe:
+                    if members:
+                        pipe.delete(*members)
+                    pipe.delete(f"tag:{tag}")
+                    await pipe.execute()
+                keys |= {m.decode() if isinstance(m, bytes) else m for m in members}
+            except Exception as e:
+                print(f"⚠️ Redis invalidate failed for tag {tag}: {e}")
+            await self._publish_invalidation(keys=keys, tags=(tag,))
+
+        print(f"🧹 Cache invalidated tag {tag} ({len(keys)} keys)")
+        return len(keys)
+
+    async def invalidate_prefix(self, prefix: str) -> int:
+        """Drop every key starting with `prefix` (SCAN + DEL in Redis)."""
+        keys = [k for k in self.cache if k.startswith(prefix)]
+        for key in keys:
+            self.delete(key)
+        count = len(keys)
+
+        r = self._get_redis()
+        if r is not None:
+            try:
+                batch = []
+                async for k in r.scan_iter(match=f"{prefix}*", count=500):
+                    batch.append(k)
+                    if len(batch) >= 500:
+                        count += await r.delete(*batch)
+                        batch = []
+                if batch:
+                    count += await r.delete(*batch)
+            except Exception as e:
+                print(f"⚠️ Redis invalidate failed for prefix {prefix}: {e}")
+            await self._publish_invalidation(prefix=prefix)
+
+        print(f"🧹 Cache invalidated prefix {prefix} ({count} keys)")
+        return count
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """L1 lookup per key, then a single Redis MGET for whatever is still missing."""
+        values = [self.get(k) for k in keys]
+        missing = [i for i, v in enumerate(values) if v is None]
+
+        r = self._get_redis()
+        if missing and r is not None:
+            try:
+                raws = await r.mget([keys[i] for i in missing])
+            except Exception as e:
+                print(f"⚠️ Redis MGET failed for {len(missing)} keys: {e}")
+                raws = []
+            now = time.time()
+            for i, raw in zip(missing, raws):
+                if raw is None:
+                    continue
+                value, exp = self._l2_decode(raw)
+                if exp > now:
+                    values[i] = value
+                    self.set(keys[i], value, max(1, int(exp - now)))
+
+        return values
+
+    async def put(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()):
+        """Store a JSON-able value in L1 and L2 and register its tags."""
+        self.set(key, value, ttl)
+        seconds = ttl if ttl is not None else int(self.ttl.total_seconds())
+        await self._l2_set(key, value, seconds)
+        await self._tag(key, tags)
+        # Other workers drop their previous copy and re-read this one
+        await self._publish_invalidation(keys=(key,))
+
+    async def put_many(self, items: Dict[str, Any], ttl: Optional[int] = None, tags: Iterable[str] = ()):
+        """
+        Store a batch of fresh fills: one Redis pipeline (SET EX per key plus
+        one SADD per tag) and no invalidation message, since no worker can
+        hold an older copy of a key that was just missed.
+        """
+        if not items:
+            return
+        tags = tuple(tags)
+        for key, value in items.items():
+            self.set(key, value, ttl)
+        for key in items:
+            self._index_tags(key, tags)
+
+        r = self._get_redis()
+        if r is None:
+            return
+        seconds = ttl if ttl is not None else int(self.ttl.total_seconds())
+        exp = time.time() + seconds
+        ex = seconds + int(self.stale_ttl.total_seconds())
+        try:
+            async with r.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(key, orjson.dumps({"v": value, "exp": exp}, option=_DUMPS_OPTS), ex=ex)
+                for tag in tags:
+                    pipe.sadd(f"tag:{tag}", *items)
+                await pipe.execute()
+        except Exception as e:
+            print(f"⚠️ Redis batch SET failed for {len(items)} keys: {e}")
+
+    async def _compute(self, key: str, factory: Callable[[], Awaitable[Any]], ttl: Optional[int], tags: Iterable[str]) -> Any:
+        """
+        Run factory() and store the result. With Redis, a SET NX lock makes
+        other workers wait for this one's value instead of computing it too.
+        """
+        r = self._get_redis()
+        lock_key = f"lock:{key}"
+        have_lock = False
+        if r is not None:
+            try:
+                have_lock = bool(await r.set(lock_key, "1", nx=True, px=CACHE_FILL_LOCK_MS))
+            except Exception as e:
+                print(f"⚠️ Redis lock failed for {key[:20]}...: {e}")
+                r = None
+
+        if r is not None and not have_lock:
+            # Another worker is filling this key; poll L2 for its result
+            deadline = time.monotonic() + CACHE_FILL_LOCK_MS / 1000
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                hit = await self._l2_get(key)
+                if hit is not None and hit[1] > time.time():
+                    value, exp = hit
+                    self.set(key, value, max(1, int(exp - time.time())))
+                    self._index_tags(key, tags)
+                    return value
+            print(f"⏳ Gave up waiting for {key[:20]}..., computing locally")
+
+        try:
+            value = await factory()
+            await self.put(key, value, ttl, tags)
+            return value
+        finally:
+            if have_lock:
+                try:
+                    await r.delete(lock_key)
+                except Exception:
+                    pass
+
+    def _schedule_refresh(self, key: str, factory: Callable[[], Awaitable[Any]], ttl: Optional[int], tags: Iterable[str]):
+        """Recompute a stale key in the background, at most once at a time."""
+        # Deduped on _refreshing alone: callers may be inside this key's own
+        # flight (_fill), so the refresh must not join it
+        if key in self._refreshing:
+            return
+
+        async def _refresh():
+            try:
+                await self._compute(key, factory, ttl, tags)
+                print(f"🔄 Cache REFRESHED: {key[:20]}...")
+            except Exception as e:
+                print(f"⚠️ Cache refresh failed for {key[:20]}...: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(_refresh())
+
+    async def _fill(self, key: str, factory: Callable[[], Awaitable[Any]], ttl: Optional[int], tags: Iterable[str]) -> Any:
+        # A previous flight may have filled it since our lookup
         cached = self.get(key)
-        if cached:
+        if cached is not None:
+            self._record(key, "hit")
             return cached
-        
-        result = func(*args, **kwargs)
-        self.set(key, result)
-        return result
+
+        hit = await self._l2_get(key)
+        if hit is not None:
+            self._record(key, "hit")
+            value, exp = hit
+            remaining = int(exp - time.time())
+            self._index_tags(key, tags)
+            if remaining > 0:
+                self.set(key, value, remaining)
+            else:
+                # Serve stale locally for a moment instead of re-reading Redis
+                self.set(key, value, CACHE_STALE_L1_SECONDS)
+                self._schedule_refresh(key, factory, ttl, tags)
+            return value
+
+        self._record(key, "miss")
+        return await self._compute(key, factory, ttl, tags)
+
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Get from L1, then L2, else await factory() and cache its JSON-able result.
+        Concurrent misses on the same key share one factory call (single-flight,
+        plus a Redis fill lock across workers).
+        A stale hit (past TTL, within the stale window) is returned immediately
+        while a background task recomputes it.
+        """
+        tags = tuple(tags)
+        cached, stale = self._lookup(key)
+        if cached is not None:
+            if stale:
+                print(f"♻️ Cache STALE: {key[:20]}...")
+                self._schedule_refresh(key, factory, ttl, tags)
+            else:
+                print(f"✅ Cache HIT: {key[:20]}...")
+            self._record(key, "hit")
+            return cached
+
+        if self._flight.in_flight(key):
+            # Served by the fill already in progress
+            self._record(key, "hit")
+        return await self._flight.do(key, lambda: self._fill(key, factory, ttl, tags))
+
+    async def get_or_set_rendered(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> Tuple[bytes, str]:
+        """
+        Like get_or_set(), but returns (orjson body, etag). The body and its
+        blake2b etag are computed once per cached value and reused on every hit.
+        """
+        value = await self.get_or_set(key, factory, ttl=ttl, tags=tags)
+
+        rendered = self._rendered.get(key)
+        if rendered is not None and rendered[0] is value:
+            return rendered[1], rendered[2]
+
+        body = orjson.dumps(value, option=_DUMPS_OPTS)
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        self._rendered[key] = (value, body, etag)
+        return body, etag
 
 # Create a single instance to share across the app
-cache = SimpleCache()
\ No newline at end of file
+cache = SimpleCache()
+
+
+async def get_latest_year(repo: Any, tags: Iterable[str] = ()) -> int:
+    """repo.latest_year(), cached per repo class for LATEST_YEAR_TTL_SECONDS."""
+    key = make_key("latest_year", repo=type(repo).__name__)
+    return await cache.get_or_set(key, repo.latest_year, ttl=LATEST_YEAR_TTL_SECONDS, tags=tags)
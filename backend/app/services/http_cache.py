@@ -0,0 +1,186 @@
+# backend/app/services/http_cache.py
+import functools
+import inspect
+import string
+import types
+import typing
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.params import Depends
+from pydantic import BaseModel
+
+from app.services.cache import cache, make_key
+from app.services.singleflight import SingleFlight
+
+# Safe to keep short-but-aggressive: re-ingesting bls_oews invalidates the
+# server-side entries, so a revalidation after max-age picks up the new etag.
+CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+# store=False routes: identical concurrent requests still share one call
+_uncached_flight = SingleFlight()
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+async def cached_json_response(
+    request: Request,
+    key: str,
+    factory: Callable[[], Awaitable[Any]],
+    ttl: Optional[int] = None,
+    tags: Iterable[str] = (),
+) -> Response:
+    """
+    Serve a cached JSON payload with ETag / Cache-Control headers, answering
+    304 with no body when the client already holds the current version.
+    """
+    body, etag = await cache.get_or_set_rendered(key, factory, ttl=ttl, tags=tags)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _resolved_signature(fn: Callable) -> inspect.Signature:
+    """
+    fn's signature with string annotations evaluated in fn's own module.
+    FastAPI resolves annotations against the callable's __globals__, which for
+    the wrapper would be this module instead of the router's.
+    """
+    sig = inspect.signature(fn)
+    try:
+        hints = typing.get_type_hints(fn, include_extras=True)
+    except NameError:
+        # A TYPE_CHECKING-only name: resolve the rest one parameter at a time
+        hints = {}
+        for name, p in sig.parameters.items():
+            holder = types.SimpleNamespace(__annotations__={name: p.annotation}, __globals__=fn.__globals__)
+            try:
+                hints.update(typing.get_type_hints(holder, include_extras=True))
+            except NameError:
+                pass  # stays a forward ref
+    params = [p.replace(annotation=hints.get(name, p.annotation)) for name, p in sig.parameters.items()]
+    return sig.replace(parameters=params)
+
+
+def _key_params(sig: inspect.Signature) -> List[str]:
+    """Params that make up the cache key: everything but request and Depends(...)."""
+    return [
+        name for name, p in sig.parameters.items()
+        if name != "request" and not isinstance(p.default, Depends)
+    ]
+
+
+def _format_tags(tags: Iterable[str], params: Dict[str, Any]) -> Tuple[str, ...]:
+    """Fill "{param}" placeholders; a tag whose placeholder is None is skipped."""
+    out = []
+    for tag in tags:
+        fields = [name for _, name, _, _ in string.Formatter().parse(tag) if name]
+        if any(params.get(name) is None for name in fields):
+            continue
+        out.append(tag.format(**params))
+    return tuple(out)
+
+
+def cached(
+    route: str,
+    ttl: Optional[int] = None,
+    tags: Iterable[str] = (),
+    store: bool = True,
+    resolve: Optional[Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]]] = None,
+):
+    """
+    Cache a route handler's JSON response under make_key(route, **query params).
+
+    The handler must take `request: Request`; it and any Depends(...) arguments
+    are left out of the key. Tags may reference params, e.g. "bls_oews:{year}".
+    The handler returns a pydantic model (or plain JSON data) and only runs on a
+    miss, with the same SWR / single-flight behaviour as cached_json_response.
+    The model is dumped once on the miss and hits are served as the rendered
+    bytes; since a Response is returned, response_model only shapes the OpenAPI
+    schema and never re-validates the payload.
+
+    resolve fills a param that arrived as None before the key is built, e.g.
+    {"year": resolver} so ?year omitted and ?year=<latest> share one entry. The
+    resolver gets the bound arguments (Depends values included).
+
+    store=False stores nothing, for routes with too little reuse to be worth
+    the memory (check the hit rate on /metrics before enabling); identical
+    requests arriving together are still coalesced into one handler call.
+    """
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        sig = inspect.signature(fn)
+        if not store:
+            return _coalesced(fn, sig, route)
+        if "request" not in sig.parameters:
+            raise TypeError(f"@cached handler {fn.__name__} needs a `request: Request` parameter")
+        key_params = _key_params(sig)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            for name, resolver in (resolve or {}).items():
+                if bound.arguments.get(name) is None:
+                    bound.arguments[name] = await resolver(bound.arguments)
+            params = {name: bound.arguments[name] for name in key_params}
+
+            async def build():
+                result = await fn(*bound.args, **bound.kwargs)
+                if isinstance(result, BaseModel):
+                    return result.model_dump(mode="json")
+                return result
+
+            return await cached_json_response(
+                bound.arguments["request"],
+                make_key(route, **params),
+                build,
+                ttl=ttl,
+                tags=_format_tags(tags, params),
+            )
+
+        wrapper.__signature__ = _resolved_signature(fn)
+        wrapper.cache_route = route
+        return wrapper
+
+    return decorator
+
+
+def _coalesced(fn: Callable[..., Awaitable[Any]], sig: inspect.Signature, route: str):
+    """store=False: single-flight the handler on its query params, store nothing."""
+    key_params = _key_params(sig)
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = make_key(route, **{name: bound.arguments[name] for name in key_params})
+        return await _uncached_flight.do(key, lambda: fn(*args, **kwargs))
+
+    wrapper.__signature__ = _resolved_signature(fn)
+    wrapper.cache_route = None  # explicitly uncached, see check_cached_routes()
+    return wrapper
+
+
+def check_cached_routes(router) -> None:
+    """Fail fast if a route on a @cached-only router was added without the decorator."""
+    missing = [
+        route.path for route in router.routes
+        if not hasattr(getattr(route, "endpoint", None), "cache_route")
+    ]
+    if missing:
+        raise RuntimeError(f"Routes missing @cached (use store=False to opt out): {missing}")
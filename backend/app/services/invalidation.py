@@ -0,0 +1,118 @@
+# backend/app/services/invalidation.py
+"""
+Explicit cache invalidation for data derived from bls_oews.
+
+Every home/industries response is cached under the BLS_OEWS_TAG tag. A change
+stream on bls_oews drops that tag after an ingestion run, so cached YoY/trend
+numbers never outlive the data they were computed from. Change streams need a
+replica set; on a standalone mongod the watcher logs once and exits, and the
+normal TTL still applies. Only one worker per deployment watches (it holds a
+Redis lease); the tag invalidation it triggers reaches the other workers over
+the cache's pub/sub channel.
+
+Single-year responses are additionally tagged bls_oews:<year>, and job detail
+responses onet:<occ_code>, so an ETL run can drop just what it reloaded via
+POST /api/admin/cache/invalidate?tag=...
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Optional, Tuple, TYPE_CHECKING
+
+from app.api.crud.home_repo import HomeRepo
+from app.api.crud.jobs_repo import MV_TOP_JOBS_TRENDS
+from app.services.cache import cache
+
+if TYPE_CHECKING:
+    from motor.core import AgnosticDatabase
+
+BLS_OEWS_TAG = "bls_oews"
+ONET_TAG = "onet"
+# For @cached routes: "{year}" is filled from the request, dropped when None
+BLS_OEWS_YEAR_TAGS = (BLS_OEWS_TAG, f"{BLS_OEWS_TAG}:{{year}}")
+
+# Ingestion writes in 5k-doc batches; coalesce the burst into one invalidation
+_DEBOUNCE_SECONDS = 2.0
+# Watcher lease: renewed every third of this while the holder is alive
+_WATCHER_LOCK = "watcher:bls_oews"
+_WATCHER_LEASE_SECONDS = 30
+
+
+def bls_oews_tags(year: Optional[int] = None) -> Tuple[str, ...]:
+    """Tags for a response built from bls_oews; single-year responses also get bls_oews:<year>."""
+    if year is None:
+        return (BLS_OEWS_TAG,)
+    return (BLS_OEWS_TAG, f"{BLS_OEWS_TAG}:{int(year)}")
+
+
+def onet_tags(occ_code: str) -> Tuple[str, ...]:
+    """Tags for a response built from the O*NET collections for one occupation."""
+    return (ONET_TAG, f"{ONET_TAG}:{occ_code}")
+
+
+def _on_tag_invalidated(tag: str):
+    if tag == BLS_OEWS_TAG or tag.startswith(f"{BLS_OEWS_TAG}:"):
+        # HomeRepo keeps its own per-year aggregates in each worker
+        HomeRepo.clear_caches()
+
+
+cache.add_tag_hook(_on_tag_invalidated)
+
+
+async def invalidate_tag(tag: str) -> int:
+    """Drop one tag (e.g. "bls_oews:2024" after reloading that year)."""
+    return await cache.invalidate_tag(tag)
+
+
+async def invalidate_bls_oews() -> int:
+    """Drop every cached response derived from bls_oews."""
+    return await cache.invalidate_tag(BLS_OEWS_TAG)
+
+
+async def _debounced_invalidate(db: "AgnosticDatabase"):
+    await asyncio.sleep(_DEBOUNCE_SECONDS)
+    # Materialized trends were built from the old rows; read live until the
+    # next scheduled refresh rebuilds them
+    await db[MV_TOP_JOBS_TRENDS].delete_many({})
+    await invalidate_bls_oews()
+
+
+async def watch_bls_oews(db: "AgnosticDatabase"):
+    """Invalidate bls_oews-derived caches whenever the collection is written."""
+    pending: Optional[asyncio.Task] = None
+    pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+    try:
+        async with db["bls_oews"].watch(pipeline) as stream:
+            print("👀 Watching bls_oews for cache invalidation")
+            async for _ in stream:
+                if pending is None or pending.done():
+                    pending = asyncio.create_task(_debounced_invalidate(db))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"⚠️ bls_oews change stream unavailable, relying on TTL: {e}")
+
+
+async def run_bls_oews_watcher(db: "AgnosticDatabase"):
+    """
+    Run watch_bls_oews in one worker per deployment: each worker tries to
+    take the watcher lease, the holder watches and keeps renewing it, and the
+    others retry so one of them takes over if the holder goes away.
+    """
+    while True:
+        if not await cache.acquire_lock(_WATCHER_LOCK, _WATCHER_LEASE_SECONDS):
+            await asyncio.sleep(_WATCHER_LEASE_SECONDS)
+            continue
+        watcher = asyncio.create_task(watch_bls_oews(db))
+        try:
+            while True:
+                done, _ = await asyncio.wait({watcher}, timeout=_WATCHER_LEASE_SECONDS / 3)
+                if done:
+                    # Watcher exited (e.g. no change streams on a standalone
+                    # mongod); the lease lapses and another worker may retry once
+                    return
+                if not await cache.renew_lock(_WATCHER_LOCK, _WATCHER_LEASE_SECONDS):
+                    print("ℹ️ Lost the bls_oews watcher lease")
+                    break
+        finally:
+            watcher.cancel()
@@ -0,0 +1,49 @@
+# backend/app/services/materialized.py
+"""
+Scheduled refresh of the materialized top-jobs trends collection.
+
+/top-trends and /top-salary-trends walk 14 years of bls_oews per cold miss;
+JobsRepo reads mv_top_jobs_trends first and only aggregates live when no doc
+covers the request. This loop rebuilds the collection at startup and then
+every MV_REFRESH_SECONDS (nightly by default). Every worker runs the loop,
+but a Redis lock held for the interval lets only one of them rebuild.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING
+
+from app.api.crud.jobs_repo import JobsRepo
+from app.services.cache import cache
+
+if TYPE_CHECKING:
+    from motor.core import AgnosticDatabase
+
+MV_REFRESH_SECONDS = int(os.getenv("MV_REFRESH_SECONDS", str(24 * 3600)))
+_MV_LOCK = "materialize:mv_top_jobs_trends"
+
+
+async def refresh_materialized_views(db: "AgnosticDatabase"):
+    """Rebuild mv_top_jobs_trends once; failures are logged, not raised."""
+    try:
+        start = time.perf_counter()
+        groups = await JobsRepo(db).refresh_materialized_trends()
+        print(f"🧱 Materialized top jobs trends for {groups} groups in {time.perf_counter() - start:.1f}s")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"⚠️ Materialized trends refresh failed: {e}")
+
+
+async def run_materialize_schedule(db: "AgnosticDatabase"):
+    """Refresh now, then on a fixed interval until cancelled; one worker per interval."""
+    # Expires a little before the next tick so the holder can take it again
+    lock_ttl = max(1, MV_REFRESH_SECONDS - 60)
+    while True:
+        if await cache.acquire_lock(_MV_LOCK, lock_ttl):
+            await refresh_materialized_views(db)
+        else:
+            print("ℹ️ Materialized trends refresh running in another worker")
+        await asyncio.sleep(MV_REFRESH_SECONDS)
@@ -0,0 +1,69 @@
+# backend/app/services/warmup.py
+"""
+In-process warmup for the hottest jobs keys.
+
+route_warmup sweeps every page in the background; this fills the hottest
+jobs keys first, calling the route functions directly so keys always match
+the routers.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from fastapi import Request
+
+from app.api.dependencies import get_jobs_repo, get_job_detail_repo
+from app.api.routers import jobs as jobs_routes
+from app.api.routers.job_detail import _job_detail_payload
+
+if TYPE_CHECKING:
+    from motor.core import AgnosticDatabase
+
+# How many of the latest year's top occupations get their detail page warmed
+TOP_DETAIL_COUNT = 50
+_DETAIL_CONCURRENCY = 5
+
+# Routes that answer with ETags read If-None-Match; warmup sends none
+_WARM_REQUEST = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+
+
+async def _warm_year(db: "AgnosticDatabase", year: int):
+    repo = get_jobs_repo(db)
+    await asyncio.gather(
+        jobs_routes.dashboard_metrics(_WARM_REQUEST, year=year, repo=repo),
+        jobs_routes.job_composition(_WARM_REQUEST, year=year, repo=repo),
+        jobs_routes.job_groups(_WARM_REQUEST, year=year, repo=repo),
+        jobs_routes.top_jobs(_WARM_REQUEST, year=year, limit=10, by="employment", group=None, repo=repo),
+    )
+
+
+async def _warm_job_details(db: "AgnosticDatabase", year: int):
+    rows = await get_jobs_repo(db).top_jobs(year=year, limit=TOP_DETAIL_COUNT, by="employment")
+    detail_repo = get_job_detail_repo(db)
+    sem = asyncio.Semaphore(_DETAIL_CONCURRENCY)
+
+    async def _one(occ_code: str):
+        async with sem:
+            try:
+                await _job_detail_payload(occ_code, detail_repo)
+            except Exception:
+                pass  # unknown/malformed codes just aren't warmed
+
+    await asyncio.gather(*[_one(str(r["occ_code"])) for r in rows if r.get("occ_code")])
+
+
+async def warm_hot_keys(db: "AgnosticDatabase"):
+    """Warm jobs metrics/composition/groups/top for the latest two years, then top job details."""
+    try:
+        latest = await get_jobs_repo(db)._latest_year()
+        if latest is None:
+            return
+        for year in (latest, latest - 1):
+            await _warm_year(db, year)
+        await _warm_job_details(db, latest)
+        print(f"🔥 Warmed hot jobs keys for {latest - 1}-{latest}")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"⚠️ Hot key warmup failed: {e}")
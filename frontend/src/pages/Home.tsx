@@ -182,31 +182,17 @@ export default function Home() {
         // Always start from 2011 for complete historical data
         const yearFrom = 2011;
 
-        // Fetch all data in parallel
-        const [mRes, listRes, topRes, trendsRes, topJobsRes, jobsMetricsRes] = await Promise.all([
-          fetch(`${API_BASE}/industries/metrics/${year}`),
-          fetch(`${API_BASE}/industries/?year=${year}&limit=1000`),
-          fetch(`${API_BASE}/industries/top?year=${year}&limit=20&by=employment`),
-          // Request trends from 2011 to current year
-          fetch(`${API_BASE}/industries/top-trends?year_from=${yearFrom}&year_to=${year}&limit=10`),
-          fetch(`${API_BASE}/jobs/top?year=${year}&limit=10&by=employment`),
-          fetch(`${API_BASE}/jobs/metrics/${year}`),
-        ]);
-
-        // If any response isn't ok, throw so we don't silently build empty charts
-        if (!mRes.ok) throw new Error(`metrics failed: ${mRes.status}`);
-        if (!listRes.ok) throw new Error(`industries list failed: ${listRes.status}`);
-        if (!topRes.ok) throw new Error(`top industries failed: ${topRes.status}`);
-        if (!trendsRes.ok) throw new Error(`top trends failed: ${trendsRes.status}`);
-        if (!topJobsRes.ok) throw new Error(`top jobs failed: ${topJobsRes.status}`);
-        if (!jobsMetricsRes.ok) throw new Error(`jobs metrics failed: ${jobsMetricsRes.status}`);
-
-        const mJson = await mRes.json();
-        const listJson = await listRes.json();
-        const topJson = await topRes.json();
-        const trendsJson = await trendsRes.json();
-        const topJobsJson = await topJobsRes.json();
-        const jobsMetricsJson = await jobsMetricsRes.json();
+        // One aggregate request; each part has the shape of its standalone endpoint
+        const dashRes = await fetch(`${API_BASE}/home/dashboard?year=${year}&trends_from=${yearFrom}`);
+        if (!dashRes.ok) throw new Error(`home dashboard failed: ${dashRes.status}`);
+        const dash = await dashRes.json();
+
+        const mJson = dash.industry_metrics;
+        const listJson = dash.industries;
+        const topJson = dash.top_industries;
+        const trendsJson = dash.industry_trends;
+        const topJobsJson = dash.top_jobs;
+        const jobsMetricsJson = dash.job_metrics;
 
         if (cancelled) return;
 